@@ -3,14 +3,8 @@ set -Eeuo pipefail
 trap 'echo "[ERR] ${BASH_SOURCE[0]}:${LINENO}: ${BASH_COMMAND} (exit=$?)" >&2' ERR
 cd "$(dirname "$0")/.."
 
-# 1) 검증
-python -u tools/verify_outputs.py \
-  --sanitized output/sanitized_keywords.csv \
-  --expanded output/expanded_keywords.csv \
-  --competition output/competition_counts.csv \
-  --scores-csv output/keyword_scores_free.csv \
-  --scores-xlsx output/keyword_scores_free.xlsx \
-  --html output/report.html || VERIFY_RC=$? || true
+# 1) 검증 (skipped when artifacts/scores are unchanged since the last clean verify)
+python -u tools/dag.py --out-dir output --stages verify || VERIFY_RC=$? || true
 
 VERIFY_RC=${VERIFY_RC:-0}
 echo "[INFO] verify rc=${VERIFY_RC}"
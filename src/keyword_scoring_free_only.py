@@ -20,19 +20,34 @@ import argparse
 import json
 import math
 import os
+import queue
 import re
 import sys
-import time
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Tuple, Dict, Any, Optional, List
 
+import numpy as np
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone,timezone
 import datetime as _dt
 
 BASE_DIR = os.environ.get("BASE_DIR", "/workspaces/KWORD")
 
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from tools.common.artifacts import FORMATS, require_parquet, with_format, write_table  # noqa: E402
+from tools.common.cache import ResponseCache, parse_max_age  # noqa: E402
+from tools.common.memo import SingleFlight, fetch_once  # noqa: E402
+from tools.common.ratelimit import configure_host, rate_from_delay, throttle  # noqa: E402
+from tools.common.sessions import configure_pool, session_for  # noqa: E402
+from tools.common.workbook import load_workbook  # noqa: E402
+
 DEFAULT_WEIGHTS = {"W_intent": 0.55, "W_competition": 0.45}
 
 DEFAULT_TOKENS = [
@@ -164,8 +179,10 @@ def _collapse_spaces(s: str) -> str:
 
 
 def _sorted_desc_by_len(terms: List[str]) -> List[str]:
-    # longest first to avoid partial-overlap issues (e.g., "무료 배송" vs "무료")
-    return sorted({t for t in (terms or []) if t}, key=lambda x: len(x), reverse=True)
+    # longest first to avoid partial-overlap issues (e.g., "무료 배송" vs "무료");
+    # ties keep list order so logs are stable across runs
+    uniq = list(dict.fromkeys(t for t in (terms or []) if t))
+    return sorted(uniq, key=lambda x: len(x), reverse=True)
 
 
 # -------------------------
@@ -178,7 +195,7 @@ def load_seeds_excel(path: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Input Excel not found: {path}")
     try:
-        df = pd.read_excel(path, sheet_name="seeds", dtype=str)
+        df = load_workbook(path).parse("seeds", dtype=str)
     except ValueError as e:
         raise ValueError(f"Failed to read sheet 'seeds' from {path}: {e}")
     if df.empty:
@@ -212,6 +229,47 @@ def load_seeds_excel(path: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
 # -------------------------
 # Stage 1-2 helper: locate header blocks in config
 # -------------------------
+class _ConfigGrid:
+    """
+    Headerless config sheet as one normalized cell matrix (`cells`: _cell_str
+    of every cell, built column-wise) plus a lower-cased copy. Header lookup
+    probes only the cells equal to the first label, found once per label.
+    """
+
+    def __init__(self, conf_df: pd.DataFrame):
+        vals = conf_df.where(conf_df.notna(), "").astype(str)
+        self.cells = vals.apply(lambda col: col.str.strip()).to_numpy(dtype=object).reshape(conf_df.shape)
+        self.lower = vals.apply(lambda col: col.str.strip().str.lower()).to_numpy(dtype=object).reshape(conf_df.shape)
+        self._pos: Dict[str, np.ndarray] = {}
+
+    def positions(self, label: str) -> np.ndarray:
+        """Row-major (row, col) positions of cells equal to `label` (case-insensitive)."""
+        key = str(label).strip().lower()
+        if key not in self._pos:
+            self._pos[key] = np.argwhere(self.lower == key)
+        return self._pos[key]
+
+    def find(self, header_seq: List[str]) -> Optional[Tuple[int, int]]:
+        seq = [str(h).strip().lower() for h in header_seq]
+        W = self.lower.shape[1]
+        n = len(seq)
+        for r, c in self.positions(seq[0]):
+            if c + n <= W and all(self.lower[r, c + k] == seq[k] for k in range(1, n)):
+                return int(r), int(c)
+        return None
+
+
+_GRID_CACHE: List[Any] = [None, None]  # [weakref to conf_df, grid]
+
+
+def _config_grid(conf_df: pd.DataFrame) -> _ConfigGrid:
+    ref, grid = _GRID_CACHE
+    if ref is None or ref() is not conf_df:
+        grid = _ConfigGrid(conf_df)
+        _GRID_CACHE[:] = [weakref.ref(conf_df), grid]
+    return grid
+
+
 def _find_header_position(
     conf_df: pd.DataFrame, header_seq: List[str]
 ) -> Optional[Tuple[int, int]]:
@@ -220,18 +278,7 @@ def _find_header_position(
     matching the sequence in header_seq (e.g., ["key","value"] or ["token","weight","enabled"]).
     Returns (row_idx, col_idx) of the first header cell or None.
     """
-    H, W = conf_df.shape
-    n = len(header_seq)
-    for r in range(H):
-        for c in range(W - n + 1):
-            ok = True
-            for k in range(n):
-                if not _ieq(_cell_str(conf_df.iat[r, c + k]), header_seq[k]):
-                    ok = False
-                    break
-            if ok:
-                return r, c
-    return None
+    return _config_grid(conf_df).find(header_seq)
 
 
 # -------------------------
@@ -241,7 +288,8 @@ def _parse_weights_block(conf_df: pd.DataFrame) -> Dict[str, float]:
     if conf_df is None or conf_df.empty:
         return DEFAULT_WEIGHTS.copy()
 
-    pos = _find_header_position(conf_df, ["key", "value"])
+    g = _config_grid(conf_df)
+    pos = g.find(["key", "value"])
     if not pos:
         return DEFAULT_WEIGHTS.copy()
 
@@ -250,8 +298,8 @@ def _parse_weights_block(conf_df: pd.DataFrame) -> Dict[str, float]:
     r = r0 + 1
     H, W = conf_df.shape
     while r < H:
-        key = _cell_str(conf_df.iat[r, c0]) if c0 < W else ""
-        val = _cell_str(conf_df.iat[r, c0 + 1]) if (c0 + 1) < W else ""
+        key = g.cells[r, c0] if c0 < W else ""
+        val = g.cells[r, c0 + 1] if (c0 + 1) < W else ""
         if key == "" and val == "":
             break
         if key != "":
@@ -282,7 +330,7 @@ def parse_weights_from_config(xls_path: str) -> Dict[str, float]:
     if not os.path.exists(xls_path):
         return DEFAULT_WEIGHTS.copy()
     try:
-        conf_df = pd.read_excel(xls_path, sheet_name="config", header=None, dtype=str)
+        conf_df = load_workbook(xls_path).parse("config", header=None, dtype=str)
     except Exception:
         return DEFAULT_WEIGHTS.copy()
     return _parse_weights_block(conf_df)
@@ -297,7 +345,8 @@ def _parse_tokens_block(conf_df: pd.DataFrame) -> Dict[str, float]:
             t["token"]: t["weight"] for t in DEFAULT_TOKENS if t.get("enabled", True)
         }
 
-    pos = _find_header_position(conf_df, ["token", "weight", "enabled"])
+    g = _config_grid(conf_df)
+    pos = g.find(["token", "weight", "enabled"])
     if not pos:
         return {
             t["token"]: t["weight"] for t in DEFAULT_TOKENS if t.get("enabled", True)
@@ -308,9 +357,9 @@ def _parse_tokens_block(conf_df: pd.DataFrame) -> Dict[str, float]:
     r = r0 + 1
     H, W = conf_df.shape
     while r < H:
-        tok = _cell_str(conf_df.iat[r, c0]) if c0 < W else ""
-        w_s = _cell_str(conf_df.iat[r, c0 + 1]) if (c0 + 1) < W else ""
-        en_s = _cell_str(conf_df.iat[r, c0 + 2]) if (c0 + 2) < W else ""
+        tok = g.cells[r, c0] if c0 < W else ""
+        w_s = g.cells[r, c0 + 1] if (c0 + 1) < W else ""
+        en_s = g.cells[r, c0 + 2] if (c0 + 2) < W else ""
 
         if tok == "" and w_s == "" and en_s == "":
             break
@@ -335,7 +384,7 @@ def parse_tokens_from_config(xls_path: str) -> Dict[str, float]:
             t["token"]: t["weight"] for t in DEFAULT_TOKENS if t.get("enabled", True)
         }
     try:
-        conf_df = pd.read_excel(xls_path, sheet_name="config", header=None, dtype=str)
+        conf_df = load_workbook(xls_path).parse("config", header=None, dtype=str)
     except Exception:
         return {
             t["token"]: t["weight"] for t in DEFAULT_TOKENS if t.get("enabled", True)
@@ -349,7 +398,8 @@ def parse_tokens_from_config(xls_path: str) -> Dict[str, float]:
 def _parse_prohibited_words_block(conf_df: pd.DataFrame) -> List[str]:
     if conf_df is None or conf_df.empty:
         return []
-    pos = _find_header_position(conf_df, ["word", "enabled"])
+    g = _config_grid(conf_df)
+    pos = g.find(["word", "enabled"])
     if not pos:
         return []
     r0, c0 = pos
@@ -357,8 +407,8 @@ def _parse_prohibited_words_block(conf_df: pd.DataFrame) -> List[str]:
     r = r0 + 1
     H, W = conf_df.shape
     while r < H:
-        w = _clean_term(conf_df.iat[r, c0]) if c0 < W else ""
-        en_s = _cell_str(conf_df.iat[r, c0 + 1]) if (c0 + 1) < W else ""
+        w = _clean_term(g.cells[r, c0]) if c0 < W else ""
+        en_s = g.cells[r, c0 + 1] if (c0 + 1) < W else ""
         if w == "" and en_s == "":
             break
         if w != "":
@@ -371,7 +421,8 @@ def _parse_prohibited_words_block(conf_df: pd.DataFrame) -> List[str]:
 def _parse_prohibited_symbols_block(conf_df: pd.DataFrame) -> List[str]:
     if conf_df is None or conf_df.empty:
         return []
-    pos = _find_header_position(conf_df, ["symbol", "enabled"])
+    g = _config_grid(conf_df)
+    pos = g.find(["symbol", "enabled"])
     if not pos:
         return []
     r0, c0 = pos
@@ -379,8 +430,8 @@ def _parse_prohibited_symbols_block(conf_df: pd.DataFrame) -> List[str]:
     r = r0 + 1
     H, W = conf_df.shape
     while r < H:
-        s = _cell_str(conf_df.iat[r, c0]) if c0 < W else ""
-        en_s = _cell_str(conf_df.iat[r, c0 + 1]) if (c0 + 1) < W else ""
+        s = g.cells[r, c0] if c0 < W else ""
+        en_s = g.cells[r, c0 + 1] if (c0 + 1) < W else ""
         if s == "" and en_s == "":
             break
         if s != "":
@@ -414,7 +465,7 @@ def parse_prohibited_from_config(xls_path: str) -> Dict[str, List[str]]:
     if not os.path.exists(xls_path):
         return {"words": [], "symbols": []}
     try:
-        conf_df = pd.read_excel(xls_path, sheet_name="config", header=None, dtype=str)
+        conf_df = load_workbook(xls_path).parse("config", header=None, dtype=str)
     except Exception:
         return {"words": [], "symbols": []}
     extra_words = _parse_prohibited_words_block(conf_df)
@@ -510,6 +561,114 @@ def apply_precedence(
 # -------------------------
 # Stage 2-1: Sanitizer — partial-match removal (KR), normalization, logging
 # -------------------------
+def _trie_pattern(terms: List[str]) -> str:
+    """
+    Build one regex from a prefix trie of `terms`. Optional suffixes are
+    greedy, so at each start position the longest term wins; re.sub then
+    gives leftmost-longest removal in a single pass, however long the list.
+    """
+    trie: Dict[str, Any] = {}
+    for t in terms:
+        node = trie
+        for ch in t:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + _build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return _build(trie)
+
+
+class ProhibitedMatcher:
+    """
+    Prohibited words/symbols compiled once from the merged list.
+    Words: a single trie-shaped alternation, case-insensitive, removing the
+    leftmost-longest match in one pass. Symbols: a single character class.
+    """
+
+    def __init__(self, words: List[str], symbols: List[str]):
+        self.words = _sorted_desc_by_len(words)
+        self.symbols = [s for s in (symbols or []) if s]
+        # lower-cased form -> reported term (first in longest-first order)
+        self._canon: Dict[str, str] = {}
+        for w in self.words:
+            self._canon.setdefault(w.lower(), w)
+        self._word_rx = (
+            re.compile(_trie_pattern(list(self._canon)), flags=re.IGNORECASE)
+            if self._canon
+            else None
+        )
+        # multi-character symbols keep the legacy per-text class build
+        self._single_char_symbols = all(len(s) == 1 for s in self.symbols)
+        self._sym_rx = (
+            re.compile("[" + "".join(re.escape(s) for s in self.symbols) + "]")
+            if self.symbols and self._single_char_symbols
+            else None
+        )
+
+    def _term_for(self, matched: str) -> str:
+        w = self._canon.get(matched.lower())
+        if w is None:
+            w = next(
+                (t for t in self.words if re.fullmatch(re.escape(t), matched, re.I)),
+                matched,
+            )
+        return w
+
+    def sanitize(self, text: str) -> Tuple[str, Dict[str, Any]]:
+        original = _cell_str(text)
+        cur = original
+        removed_words: List[str] = []
+        removed_symbols: List[str] = []
+
+        if self._word_rx is not None:
+            hit: set = set()
+
+            def _drop(m: "re.Match") -> str:
+                hit.add(self._term_for(m.group(0)))
+                return ""
+
+            cur = self._word_rx.sub(_drop, cur)
+            if hit:
+                removed_words = [w for w in self.words if w in hit]
+
+        if self._sym_rx is not None:
+            found = set(self._sym_rx.findall(cur))
+            if found:
+                cur = self._sym_rx.sub("", cur)
+                removed_symbols = [s for s in self.symbols if s in found]
+        elif self.symbols:
+            present_syms = [s for s in self.symbols if s in cur]
+            if present_syms:
+                sym_class = "[" + "".join(re.escape(s) for s in present_syms) + "]"
+                cur = re.sub(sym_class, "", cur)
+                removed_symbols = present_syms
+
+        # Normalize spaces / simple punctuation spacing
+        cur = _collapse_spaces(cur)
+
+        detail = {
+            "original": original,
+            "sanitized": cur,
+            "removed_words": removed_words,
+            "removed_symbols": removed_symbols,
+            "changed": original != cur,
+        }
+        return cur, detail
+
+
+@lru_cache(maxsize=8)
+def _matcher_for(words: Tuple[str, ...], symbols: Tuple[str, ...]) -> ProhibitedMatcher:
+    return ProhibitedMatcher(list(words), list(symbols))
+
+
 def sanitize_text(
     text: str, words: List[str], symbols: List[str]
 ) -> Tuple[str, Dict[str, Any]]:
@@ -518,69 +677,55 @@ def sanitize_text(
     Only the matched substring is removed; surrounding content stays.
     Returns (sanitized_text, detail_log).
     """
-    original = _cell_str(text)
-    cur = original
-    removed_words: List[str] = []
-    removed_symbols: List[str] = []
-
-    # Remove words (longest match first), case-insensitive for safety
-    for w in _sorted_desc_by_len(words):
-        pat = re.compile(re.escape(w), flags=re.IGNORECASE)
-        cur, n = pat.subn("", cur)
-        if n > 0:
-            removed_words.append(w)
-
-    # Remove symbols literally (log which were present)
-    if symbols:
-        before_scan = cur
-        present_syms = [s for s in symbols if s and s in before_scan]
-        if present_syms:
-            sym_class = "[" + "".join(re.escape(s) for s in present_syms) + "]"
-            cur, n = re.subn(sym_class, "", cur)
-            if n > 0:
-                removed_symbols = present_syms
+    return _matcher_for(tuple(words or ()), tuple(symbols or ())).sanitize(text)
 
-    # Normalize spaces / simple punctuation spacing
-    cur = _collapse_spaces(cur)
 
-    detail = {
-        "original": original,
-        "sanitized": cur,
-        "removed_words": removed_words,
-        "removed_symbols": removed_symbols,
-        "changed": original != cur,
-    }
-    return cur, detail
+def sanitize_series(
+    values, words: List[str], symbols: List[str]
+) -> Dict[str, List[Any]]:
+    """
+    Batch form of sanitize_text for a whole column (Series or list).
+    Each distinct input is sanitized once. Returns columnar lists aligned
+    with `values`: original, sanitized, removed_words, removed_symbols
+    (", "-joined) and changed.
+    """
+    matcher = _matcher_for(tuple(words or ()), tuple(symbols or ()))
+    keys = [_cell_str(v) for v in values]
+    done: Dict[str, Tuple[str, str, str, str, bool]] = {}
+    for k in dict.fromkeys(keys):
+        _, info = matcher.sanitize(k)
+        done[k] = (
+            info["original"],
+            info["sanitized"],
+            ", ".join(info["removed_words"]),
+            ", ".join(info["removed_symbols"]),
+            info["changed"],
+        )
+    names = ("original", "sanitized", "removed_words", "removed_symbols", "changed")
+    cols = zip(*(done[k] for k in keys)) if keys else [()] * len(names)
+    return {n: list(c) for n, c in zip(names, cols)}
 
 
 def sanitize_df(
     df: pd.DataFrame, words: List[str], symbols: List[str]
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    logs = []
     out = df.copy()
-    out["keyword_sanitized"] = df["keyword"].astype(str)
-    out["sanitized_changed"] = False
-
-    for idx, row in out.iterrows():
-        sanitized, info = sanitize_text(row["keyword"], words, symbols)
-        out.at[idx, "keyword_sanitized"] = sanitized
-        out.at[idx, "sanitized_changed"] = info["changed"]
-        logs.append(
-            {
-                "row_index": idx,
-                "keyword_original": info["original"],
-                "keyword_sanitized": info["sanitized"],
-                "removed_words": ", ".join(info["removed_words"])
-                if info["removed_words"]
-                else "",
-                "removed_symbols": ", ".join(info["removed_symbols"])
-                if info["removed_symbols"]
-                else "",
-                "changed": info["changed"],
-            }
-        )
-
-    log_df = pd.DataFrame(logs)
+    res = sanitize_series(df["keyword"], words, symbols)
+    out["keyword_sanitized"] = pd.Series(res["sanitized"], index=out.index, dtype=object).astype(str)
+    out["sanitized_changed"] = pd.Series(res["changed"], index=out.index, dtype=bool)
+
+    if out.empty:
+        return out, pd.DataFrame()
+    log_df = pd.DataFrame(
+        {
+            "row_index": list(out.index),
+            "keyword_original": res["original"],
+            "keyword_sanitized": res["sanitized"],
+            "removed_words": res["removed_words"],
+            "removed_symbols": res["removed_symbols"],
+            "changed": res["changed"],
+        }
+    )
     return out, log_df
 
 
@@ -621,8 +766,9 @@ def fetch_naver_suggest(
     headers = {"User-Agent": ua, "Accept": "application/json,*/*"}
     last_err = None
     for attempt in range(max(1, retries)):
+        throttle(NAVER_SUGGEST_URL, rate=rate_from_delay(sleep_sec))
         try:
-            r = requests.get(
+            r = session_for(NAVER_SUGGEST_URL).get(
                 NAVER_SUGGEST_URL, params=params, headers=headers, timeout=timeout
             )
             if r.ok:
@@ -641,7 +787,6 @@ def fetch_naver_suggest(
             last_err = f"HTTP {r.status_code}"
         except Exception as e:
             last_err = str(e)
-        time.sleep(sleep_sec)
     # On failure, return empty list (pipeline continues)
     if last_err:
         print(
@@ -662,6 +807,8 @@ def expand_for_seed(
     sleep_sec: float,
     proh_words: List[str],
     proh_symbols: List[str],
+    cache: Optional[ResponseCache] = None,
+    memo: Optional[SingleFlight] = None,
 ) -> List[Dict[str, Any]]:
     """
     Expand one seed via Naver Suggest; also sanitize the suggestions.
@@ -669,9 +816,15 @@ def expand_for_seed(
     """
     if not seed_sanitized:
         return []
-    # fetch
-    suggestions = fetch_naver_suggest(
-        seed_sanitized, ua=ua, timeout=timeout, retries=retries, sleep_sec=sleep_sec
+    # fetch (once per run via memo; from the on-disk cache when fresh)
+    suggestions = fetch_once(
+        memo,
+        cache,
+        "naver_suggest",
+        seed_sanitized,
+        lambda: fetch_naver_suggest(
+            seed_sanitized, ua=ua, timeout=timeout, retries=retries, sleep_sec=sleep_sec
+        ),
     )
     out_rows: List[Dict[str, Any]] = []
     seen_rel = set()
@@ -713,39 +866,65 @@ def expand_all(
     sleep_sec: float,
     proh_words: List[str],
     proh_symbols: List[str],
+    cache: Optional[ResponseCache] = None,
+    memo: Optional[SingleFlight] = None,
+    workers: int = 1,
 ) -> pd.DataFrame:
-    rows: List[Dict[str, Any]] = []
-    for idx, row in df_sanitized.iterrows():
-        rows.extend(
-            expand_for_seed(
-                seed_idx=int(idx),
-                seed_orig=row["keyword"],
-                seed_sanitized=row["keyword_sanitized"],
-                max_each=max_each,
-                ua=ua,
-                timeout=timeout,
-                retries=retries,
-                sleep_sec=sleep_sec,
-                proh_words=proh_words,
-                proh_symbols=proh_symbols,
-            )
+    """
+    Expand every seed. With workers > 1 seeds are fetched on a bounded
+    thread pool (the per-host token bucket still paces requests); results
+    are reassembled in seed order, so the output matches a serial run.
+    """
+    # duplicate seeds share one suggest request; rows stay per seed
+    memo = memo if memo is not None else SingleFlight()
+
+    def _one(item) -> List[Dict[str, Any]]:
+        idx, row = item
+        return expand_for_seed(
+            seed_idx=int(idx),
+            seed_orig=row["keyword"],
+            seed_sanitized=row["keyword_sanitized"],
+            max_each=max_each,
+            ua=ua,
+            timeout=timeout,
+            retries=retries,
+            sleep_sec=sleep_sec,
+            proh_words=proh_words,
+            proh_symbols=proh_symbols,
+            cache=cache,
+            memo=memo,
         )
-        time.sleep(sleep_sec)
+
+    rows: List[Dict[str, Any]] = []
+    if workers <= 1:
+        for item in df_sanitized.iterrows():
+            rows.extend(_one(item))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for seed_rows in pool.map(_one, df_sanitized.iterrows()):
+                rows.extend(seed_rows)
     return pd.DataFrame(rows)
 
 
 # -------------------------
 # Stage 3-1: Competition — Coupang / Naver search result counts
 # -------------------------
+COUPANG_SEARCH_URL = "https://www.coupang.com/np/search"
+NAVER_SHOPPING_SEARCH_URL = "https://search.shopping.naver.com/search/all"
+
+
 def get_search_count_coupang(
     query: str, ua: str, timeout: float, retries: int, sleep_sec: float
 ) -> Optional[int]:
-    url = "https://www.coupang.com/np/search"
+    url = COUPANG_SEARCH_URL
     headers = {"User-Agent": ua, "Accept": "text/html,application/xhtml+xml"}
     params = {"q": query}
     for _ in range(max(1, retries)):
+        throttle(url, rate=rate_from_delay(sleep_sec))
         try:
-            r = requests.get(url, params=params, headers=headers, timeout=timeout)
+            r = session_for(url).get(
+                url, params=params, headers=headers, timeout=timeout
+            )
             if r.ok and r.text:
                 m = re.search(r"검색\s*결과\s*([\d,]+)\s*개", r.text)
                 if m:
@@ -756,19 +935,21 @@ def get_search_count_coupang(
                     return len(cards)
         except Exception:
             pass
-        time.sleep(sleep_sec)
     return None
 
 
 def get_search_count_naver(
     query: str, ua: str, timeout: float, retries: int, sleep_sec: float
 ) -> Optional[int]:
-    url = "https://search.shopping.naver.com/search/all"
+    url = NAVER_SHOPPING_SEARCH_URL
     headers = {"User-Agent": ua, "Accept": "text/html,application/xhtml+xml"}
     params = {"query": query}
     for _ in range(max(1, retries)):
+        throttle(url, rate=rate_from_delay(sleep_sec))
         try:
-            r = requests.get(url, params=params, headers=headers, timeout=timeout)
+            r = session_for(url).get(
+                url, params=params, headers=headers, timeout=timeout
+            )
             if r.ok and r.text:
                 t = r.text
                 m = (
@@ -781,10 +962,20 @@ def get_search_count_naver(
                     return int(m.group(1).replace(",", ""))
         except Exception:
             pass
-        time.sleep(sleep_sec)
     return None
 
 
+COMPETITION_COLUMNS = [
+    "seed_index",
+    "seed_sanitized",
+    "related_sanitized",
+    "comp_coupang",
+    "comp_naver",
+    "comp_combined",
+    "ts",
+]
+
+
 def collect_competition(
     expanded_df: pd.DataFrame,
     site_mode: str,
@@ -792,36 +983,60 @@ def collect_competition(
     timeout: float,
     retries: int,
     sleep_sec: float,
+    cache: Optional[ResponseCache] = None,
+    memo: Optional[SingleFlight] = None,
 ) -> pd.DataFrame:
     """
     For each related_sanitized, fetch Coupang/Naver result counts and compute comp_combined.
     comp_combined = log1p(coupang) + log1p(naver), missing -> 0.0
+    A keyword shared by several seeds is fetched once and fanned out to each row.
     """
     if expanded_df is None or expanded_df.empty:
-        return pd.DataFrame(
-            columns=[
-                "seed_index",
-                "seed_sanitized",
-                "related_sanitized",
-                "comp_coupang",
-                "comp_naver",
-                "comp_combined",
-                "ts",
-            ]
-        )
+        return pd.DataFrame(columns=COMPETITION_COLUMNS)
+    memo = memo if memo is not None else SingleFlight()
+    rows = _competition_rows(
+        (r for _, r in expanded_df.iterrows()),
+        site_mode, ua, timeout, retries, sleep_sec, cache, memo,
+    )
+    return pd.DataFrame(rows)
+
+
+def _competition_rows(
+    expanded_rows,
+    site_mode: str,
+    ua: str,
+    timeout: float,
+    retries: int,
+    sleep_sec: float,
+    cache: Optional[ResponseCache],
+    memo: SingleFlight,
+) -> List[Dict[str, Any]]:
+    """Competition rows for expanded rows (Series or dicts), in order."""
     rows: List[Dict[str, Any]] = []
-    for _, r in expanded_df.iterrows():
+    for r in expanded_rows:
         kw = str(r.get("related_sanitized", "")).strip()
         if not kw:
             continue
         cpn = nav = None
         if site_mode in ("both", "coupang"):
-            cpn = get_search_count_coupang(
-                kw, ua=ua, timeout=timeout, retries=retries, sleep_sec=sleep_sec
+            cpn = fetch_once(
+                memo,
+                cache,
+                "coupang",
+                kw,
+                lambda: get_search_count_coupang(
+                    kw, ua=ua, timeout=timeout, retries=retries, sleep_sec=sleep_sec
+                ),
             )
         if site_mode in ("both", "naver"):
-            nav = get_search_count_naver(
-                kw, ua=ua, timeout=timeout, retries=retries, sleep_sec=sleep_sec
+            nav = fetch_once(
+                memo,
+                cache,
+                "naver",
+                kw,
+                lambda: get_search_count_naver(
+                    kw, ua=ua, timeout=timeout, retries=retries, sleep_sec=sleep_sec
+                ),
             )
         comp_combined = (math.log1p(cpn) if cpn is not None else 0.0) + (
             math.log1p(nav) if nav is not None else 0.0
@@ -837,14 +1052,106 @@ def collect_competition(
                 "ts": datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
             }
         )
-        time.sleep(sleep_sec)
-    return pd.DataFrame(rows)
+    return rows
+
+
+def expand_and_collect(
+    df_sanitized: pd.DataFrame,
+    max_each: int,
+    site_mode: str,
+    ua: str,
+    timeout: float,
+    retries: int,
+    sleep_sec: float,
+    proh_words: List[str],
+    proh_symbols: List[str],
+    cache: Optional[ResponseCache] = None,
+    memo: Optional[SingleFlight] = None,
+    workers: int = 1,
+    comp_workers: int = 1,
+    queue_size: int = 8,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    expand_all + collect_competition with the two stages overlapped: each
+    seed's expansion is put on a bounded queue as soon as it is done and
+    competition workers fetch its counts while later seeds still expand.
+    Both frames come back in seed order, as from the staged run.
+    """
+    memo = memo if memo is not None else SingleFlight()
+    work: "queue.Queue" = queue.Queue(maxsize=max(1, int(queue_size)))
+    done = object()
+    comp_parts: Dict[int, List[Dict[str, Any]]] = {}
+    errors: List[BaseException] = []
+
+    def _consume():
+        while True:
+            item = work.get()
+            if item is done:
+                return
+            seq, seed_rows = item
+            if errors:
+                continue  # keep draining so the producer never blocks
+            try:
+                comp_parts[seq] = _competition_rows(
+                    seed_rows, site_mode, ua, timeout, retries, sleep_sec, cache, memo
+                )
+            except BaseException as e:
+                errors.append(e)
+
+    def _expand(item) -> List[Dict[str, Any]]:
+        idx, row = item
+        return expand_for_seed(
+            seed_idx=int(idx),
+            seed_orig=row["keyword"],
+            seed_sanitized=row["keyword_sanitized"],
+            max_each=max_each,
+            ua=ua,
+            timeout=timeout,
+            retries=retries,
+            sleep_sec=sleep_sec,
+            proh_words=proh_words,
+            proh_symbols=proh_symbols,
+            cache=cache,
+            memo=memo,
+        )
+
+    consumers = [
+        threading.Thread(target=_consume, name=f"competition-{i}", daemon=True)
+        for i in range(max(1, int(comp_workers)))
+    ]
+    for t in consumers:
+        t.start()
+    rows: List[Dict[str, Any]] = []
+    try:
+        if workers <= 1:
+            produced = map(_expand, df_sanitized.iterrows())
+            for seq, seed_rows in enumerate(produced):
+                rows.extend(seed_rows)
+                work.put((seq, seed_rows))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for seq, seed_rows in enumerate(pool.map(_expand, df_sanitized.iterrows())):
+                    rows.extend(seed_rows)
+                    work.put((seq, seed_rows))
+    finally:
+        for _ in consumers:
+            work.put(done)
+        for t in consumers:
+            t.join()
+    if errors:
+        raise errors[0]
+
+    expanded_df = pd.DataFrame(rows)
+    if expanded_df.empty:
+        return expanded_df, pd.DataFrame(columns=COMPETITION_COLUMNS)
+    comp_rows = [r for seq in sorted(comp_parts) for r in comp_parts[seq]]
+    return expanded_df, pd.DataFrame(comp_rows)
 
 
 # -------------------------
 # CLI & main
 # -------------------------
-def parse_args(argv=None):
+def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="Keyword Scoring (Free Edition) — Stages 1-1..2-2 (config + precedence + sanitizer + expansion)",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -902,6 +1209,12 @@ def parse_args(argv=None):
         default=os.path.join(BASE_DIR, "output/expanded_keywords.csv"),
         help="Path to write expanded related keywords CSV",
     )
+    p.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Artifact format; parquet (needs pyarrow) keeps dtypes and swaps the *-out suffixes to .parquet",
+    )
 
     # Expansion controls
     p.add_argument(
@@ -911,7 +1224,39 @@ def parse_args(argv=None):
         help="Related keywords per seed (after sanitization)",
     )
     p.add_argument(
-        "--sleep", type=float, default=0.7, help="Delay between HTTP requests (seconds)"
+        "--sleep",
+        type=float,
+        default=0.7,
+        help="Min delay between HTTP requests to the same host (seconds)",
+    )
+    p.add_argument(
+        "--burst",
+        type=float,
+        default=1.0,
+        help="Requests a host may receive back-to-back before --sleep pacing applies",
+    )
+    p.add_argument(
+        "--expand-workers",
+        type=int,
+        default=1,
+        help="Seeds expanded concurrently (bounded thread pool; 1 = serial)",
+    )
+    p.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Overlap expansion and competition: each expanded seed is queued for competition right away",
+    )
+    p.add_argument(
+        "--competition-workers",
+        type=int,
+        default=1,
+        help="Competition consumers in --pipelined mode",
+    )
+    p.add_argument(
+        "--pipeline-queue",
+        type=int,
+        default=8,
+        help="Expanded seeds buffered between the stages in --pipelined mode",
     )
     p.add_argument("--retries", type=int, default=2, help="Max retries per request")
     p.add_argument(
@@ -924,15 +1269,84 @@ def parse_args(argv=None):
         help="(reserved for later stages)",
     )
     p.add_argument("--ua", default="Mozilla/5.0 (Codespaces Expansion Stage)")
+    p.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="Keep-alive connections per host (default: --expand-workers, min 2)",
+    )
+    p.add_argument(
+        "--connect-retries",
+        type=int,
+        default=2,
+        help="Transport-level retries on connection errors (pooled sessions)",
+    )
+
+    # Response cache
+    p.add_argument(
+        "--cache",
+        default=os.path.join(BASE_DIR, "output/.cache/responses.sqlite"),
+        help="SQLite file caching suggestions and search counts across runs",
+    )
+    p.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    p.add_argument(
+        "--max-age",
+        default=None,
+        help="Cache TTL in seconds, for all sites ('3600') or per site ('coupang=3600,naver_suggest=604800')",
+    )
+    p.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached entries (still stores fresh responses)",
+    )
 
     p.add_argument("--topN-report", type=int, default=0)
     p.add_argument("--no-html", action="store_true")
-    return p.parse_args(argv)
+    return p
+
+
+def parse_args(argv=None):
+    return build_parser().parse_args(argv)
+
+
+def setup_network(
+    args: argparse.Namespace,
+) -> Tuple[SingleFlight, Optional[ResponseCache]]:
+    """Per-host pacing and pools from the CLI options; returns (memo, cache)."""
+    for url in (NAVER_SUGGEST_URL, COUPANG_SEARCH_URL, NAVER_SHOPPING_SEARCH_URL):
+        configure_host(url, rate_from_delay(float(args.sleep)), float(args.burst))
+    configure_pool(
+        pool_size=args.pool_size or max(2, int(args.expand_workers)),
+        connect_retries=args.connect_retries,
+    )
+    cache = (
+        None
+        if args.no_cache
+        else ResponseCache(
+            args.cache, max_age=parse_max_age(args.max_age), refresh=args.refresh
+        )
+    )
+    return SingleFlight(), cache
+
+
+def sanitized_preview(df_sanitized: pd.DataFrame, log_df: pd.DataFrame) -> pd.DataFrame:
+    """Sanitized rows joined with their removal log (the sanitized artifact)."""
+    merged_preview = df_sanitized.copy()
+    if not log_df.empty:
+        merged_preview = merged_preview.join(
+            log_df.set_index("row_index"), how="left", lsuffix="", rsuffix="_log"
+        )
+    return merged_preview
 
 
 def main(argv=None):
     args = parse_args(argv)
     in_path = args.in_path
+    if args.format == "parquet":
+        require_parquet()
+        for attr in ("sanitized_out", "expanded_out", "competition_out"):
+            setattr(args, attr, with_format(getattr(args, attr), args.format))
+    memo, cache = setup_network(args)
 
     print("=== Stage 1-1: Excel Loader (preserve duplicates) ===")
     print(f"[INFO] Base dir     : {BASE_DIR}")
@@ -1020,27 +1434,45 @@ def main(argv=None):
     else:
         print(" - sample changes: (none)")
 
-    merged_preview = df_sanitized.copy()
-    if not log_df.empty:
-        merged_preview = merged_preview.join(
-            log_df.set_index("row_index"), how="left", lsuffix="", rsuffix="_log"
-        )
-    merged_preview.to_csv(args.sanitized_out, index=False, encoding="utf-8-sig")
+    write_table(sanitized_preview(df_sanitized, log_df), args.sanitized_out, args.format)
     print(f" - saved sanitized preview    : {args.sanitized_out}")
 
     # 2-2: Expansion — Naver Suggest
-    print("\n=== Stage 2-2: Expansion (Naver Suggest) ===")
     os.makedirs(os.path.dirname(args.expanded_out), exist_ok=True)
-    expanded_df = expand_all(
-        df_sanitized=df_sanitized,
-        max_each=int(args.expand),
-        ua=args.ua,
-        timeout=float(args.timeout),
-        retries=int(args.retries),
-        sleep_sec=float(args.sleep),
-        proh_words=merged_proh["words"],
-        proh_symbols=merged_proh["symbols"],
-    )
+    if args.pipelined:
+        # 2-2 + 3-1 overlapped: competition starts as soon as each seed is expanded
+        print("\n=== Stage 2-2 + 3-1: Expansion → Competition (pipelined) ===")
+        expanded_df, comp_df = expand_and_collect(
+            df_sanitized=df_sanitized,
+            max_each=int(args.expand),
+            site_mode=args.site_mode,
+            ua=args.ua,
+            timeout=float(args.timeout),
+            retries=int(args.retries),
+            sleep_sec=float(args.sleep),
+            proh_words=merged_proh["words"],
+            proh_symbols=merged_proh["symbols"],
+            cache=cache,
+            memo=memo,
+            workers=int(args.expand_workers),
+            comp_workers=int(args.competition_workers),
+            queue_size=int(args.pipeline_queue),
+        )
+    else:
+        print("\n=== Stage 2-2: Expansion (Naver Suggest) ===")
+        expanded_df = expand_all(
+            df_sanitized=df_sanitized,
+            max_each=int(args.expand),
+            ua=args.ua,
+            timeout=float(args.timeout),
+            retries=int(args.retries),
+            sleep_sec=float(args.sleep),
+            proh_words=merged_proh["words"],
+            proh_symbols=merged_proh["symbols"],
+            cache=cache,
+            memo=memo,
+            workers=int(args.expand_workers),
+        )
     print(f" - seeds processed            : {len(df_sanitized)}")
     print(f" - expanded rows              : {len(expanded_df)}")
     if not expanded_df.empty:
@@ -1050,19 +1482,22 @@ def main(argv=None):
                 f"   • [{r['seed_sanitized']}] -> ({r['rank']:02d}) {r['related_sanitized']}"
             )
 
-    expanded_df.to_csv(args.expanded_out, index=False, encoding="utf-8-sig")
+    write_table(expanded_df, args.expanded_out, args.format)
     print(f" - saved expanded keywords    : {args.expanded_out}")
 
     # 3-1: Competition — Coupang/Naver result counts
-    print("\n=== Stage 3-1: Competition (Coupang / Naver) ===")
-    comp_df = collect_competition(
-        expanded_df=expanded_df,
-        site_mode=args.site_mode,
-        ua=args.ua,
-        timeout=float(args.timeout),
-        retries=int(args.retries),
-        sleep_sec=float(args.sleep),
-    )
+    if not args.pipelined:
+        print("\n=== Stage 3-1: Competition (Coupang / Naver) ===")
+        comp_df = collect_competition(
+            expanded_df=expanded_df,
+            site_mode=args.site_mode,
+            ua=args.ua,
+            timeout=float(args.timeout),
+            retries=int(args.retries),
+            sleep_sec=float(args.sleep),
+            cache=cache,
+            memo=memo,
+        )
     print(f" - competition rows           : {len(comp_df)}")
     if not comp_df.empty:
         print(" - sample competition (top 10):")
@@ -1072,8 +1507,12 @@ def main(argv=None):
             )
     comp_out = args.competition_out
     os.makedirs(os.path.dirname(comp_out), exist_ok=True)
-    comp_df.to_csv(comp_out, index=False, encoding="utf-8-sig")
+    write_table(comp_df, comp_out, args.format)
     print(f" - saved competition counts   : {comp_out}")
+    print(f" - distinct queries fetched   : {memo.fetched} (of {memo.calls} lookups)")
+    if cache is not None:
+        print(f" - response cache             : hits={cache.hits}, misses={cache.misses} ({cache.path})")
+        cache.close()
 
     print("\nNext steps:")
     print(" - Scoring (normalize intent/competition with weights) → Reports")
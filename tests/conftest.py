@@ -0,0 +1,137 @@
+import csv
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+TOKENS = [("니트", 1.0), ("원피스", 0.8), ("빅사이즈", 0.5), ("기모", 0.3), ("하객룩", 0.6)]
+WORDS = ["니트", "원피스", "빅사이즈", "기모", "하객룩", "롱", "특가", "여름", "셔츠", "코트"]
+
+
+def write_config(path: Path, w_intent=0.55, w_competition=0.45, tokens=TOKENS) -> Path:
+    rows = max(2, len(tokens))
+    cfg = pd.DataFrame({
+        "key": (["W_intent", "W_competition"] + [None] * rows)[:rows],
+        "value": ([w_intent, w_competition] + [None] * rows)[:rows],
+        "token": [t for t, _ in tokens] + [None] * (rows - len(tokens)),
+        "weight": [w for _, w in tokens] + [None] * (rows - len(tokens)),
+        "enabled": [True] * len(tokens) + [None] * (rows - len(tokens)),
+    })
+    with pd.ExcelWriter(path, engine="xlsxwriter") as xw:
+        cfg.to_excel(xw, index=False, sheet_name="config")
+    return path
+
+
+@pytest.fixture
+def scoring_inputs(tmp_path):
+    """Config workbook, expanded keywords (with duplicates) and competition counts."""
+    rows, comp = [], []
+    for i in range(120):
+        seed = str(i % 4)
+        kw = f"{WORDS[i % 10]} {WORDS[(i * 7) % 10]} {i}"
+        rows.append((seed, kw))
+        if i % 5:
+            comp.append((seed, kw, (i * 37) % 1000, (i * 91) % 5000 if i % 3 else ""))
+    rows += rows[:10]  # duplicate (seed, keyword) pairs are deduped by scoring
+    expanded = tmp_path / "expanded.csv"
+    pd.DataFrame(rows, columns=["seed", "keyword"]).to_csv(expanded, index=False, encoding="utf-8-sig")
+    competition = tmp_path / "competition.csv"
+    pd.DataFrame(comp, columns=["seed", "keyword", "comp_coupang", "comp_naver"]).to_csv(
+        competition, index=False, encoding="utf-8-sig")
+    return {
+        "dir": tmp_path,
+        "excel": write_config(tmp_path / "config.xlsx"),
+        "expanded": expanded,
+        "competition": competition,
+    }
+
+
+def write_seeds(path: Path, keywords) -> Path:
+    """Input workbook: 'seeds' sheet plus a headerless key/value + token block 'config' sheet."""
+    config = [["key", "value", "token", "weight", "enabled"]]
+    config += [[k, v, t, w, "true"] for (k, v), (t, w) in zip(
+        [("W_intent", 0.6), ("W_competition", 0.4)] + [(None, None)] * len(TOKENS), TOKENS)]
+    with pd.ExcelWriter(path, engine="xlsxwriter") as xw:
+        pd.DataFrame({"keyword": keywords, "category": ["여성"] * len(keywords)}).to_excel(
+            xw, index=False, sheet_name="seeds")
+        pd.DataFrame(config).to_excel(xw, index=False, header=False, sheet_name="config")
+    return path
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    """Deterministic suggest/count fetchers with jittered latency; returns per-(kind, query) call counts."""
+    from src import keyword_scoring_free_only as k
+
+    calls, lock, rnd = Counter(), threading.Lock(), random.Random(5)
+
+    def _hit(kind, q):
+        with lock:
+            calls[kind, q] += 1
+            delay = rnd.uniform(0, 0.004)
+        time.sleep(delay)
+
+    def suggest(q, **_kw):
+        _hit("suggest", q)
+        return [f"{q} {w}" for w in WORDS if sum(map(ord, w + q)) % 3 and w not in q][:4] + [f"{q} 특가"]
+
+    def coupang(q, **_kw):
+        _hit("coupang", q)
+        return None if len(q) % 4 == 0 else sum(map(ord, q)) % 5000
+
+    def naver(q, **_kw):
+        _hit("naver", q)
+        return sum(map(ord, q)) * 7 % 90000
+
+    monkeypatch.setattr(k, "fetch_naver_suggest", suggest)
+    monkeypatch.setattr(k, "get_search_count_coupang", coupang)
+    monkeypatch.setattr(k, "get_search_count_naver", naver)
+    return calls
+
+
+def read_journal(path):
+    """(seed, keyword, comp_coupang, comp_naver, comp_combined) rows of a fetcher CSV journal."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [(r["seed"], r["keyword"], r["comp_coupang"], r["comp_naver"], r["comp_combined"])
+                for r in csv.DictReader(f)]
+
+
+@pytest.fixture
+def fake_fetch(tmp_path, monkeypatch):
+    """Fake per-site fetches for 60 input rows ("kw 13" raises); returns (input csv, concurrency state)."""
+    from tools import fetch_competition_counts as fcc
+
+    monkeypatch.chdir(tmp_path)  # logs/errors.csv
+    lock = threading.Lock()
+    state = {"now": {}, "peak": {}}
+
+    def fake(site, session, kw, *a):
+        with lock:
+            state["now"][site] = state["now"].get(site, 0) + 1
+            state["peak"][site] = max(state["peak"].get(site, 0), state["now"][site])
+        try:
+            time.sleep(random.Random(kw + site).random() * 0.01)  # finish out of order
+            if kw == "kw 13":
+                raise RuntimeError("boom")
+            return None if (site == "naver" and kw.endswith("7")) else len(kw) * (3 if site == "coupang" else 5)
+        finally:
+            with lock:
+                state["now"][site] -= 1
+
+    monkeypatch.setattr(fcc, "_fetch_site", fake)
+    inp = tmp_path / "in.csv"
+    with open(inp, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["seed", "keyword"])
+        for i in range(60):
+            w.writerow([f"s{i % 4}", f"kw {i}"])
+    return inp, state
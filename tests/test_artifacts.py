@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tools import compute_scores as cs
+from tools.common.artifacts import _arrow_safe, is_parquet, read_table, with_format, write_table
+
+pytest.importorskip("pyarrow")
+
+
+def test_with_format():
+    assert with_format("out/scores.csv", "csv") == "out/scores.csv"
+    assert with_format("out/scores.csv", "parquet") == "out/scores.parquet"
+    assert with_format(Path("out/scores.csv"), "parquet") == Path("out/scores.parquet")
+    assert with_format("out/scores.pq", "parquet") == "out/scores.pq"
+    assert with_format(None, "parquet") is None
+    assert is_parquet("a.PARQUET") and is_parquet(Path("a.pq")) and not is_parquet("a.csv")
+
+
+def test_arrow_safe_stringifies_only_mixed_columns():
+    df = pd.DataFrame({"seed": [1, "니트", None], "kw": ["a", "b", None], "n": [1, 2, 3]})
+    safe = _arrow_safe(df)
+    assert safe["seed"].tolist() == ["1", "니트", None]
+    pd.testing.assert_series_equal(safe["kw"], df["kw"])
+    pd.testing.assert_series_equal(safe["n"], df["n"])
+    uniform = df[["kw", "n"]]
+    assert _arrow_safe(uniform) is uniform
+    assert df["seed"].tolist() == [1, "니트", None]  # input untouched
+
+
+@pytest.mark.parametrize("name", ["t.csv", "t.parquet"])
+def test_roundtrip(tmp_path, name):
+    df = pd.DataFrame({"seed": ["0", "1"], "keyword": ["니트 원피스", "코트"], "count": [3, 10]})
+    write_table(df, tmp_path / name)
+    got = read_table(tmp_path / name, dtype={"seed": str}) if name.endswith(".csv") else read_table(tmp_path / name)
+    pd.testing.assert_frame_equal(got, df)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_parquet_mixed_seed_column(tmp_path):
+    df = pd.DataFrame({"seed": [7, "니트"], "keyword": ["a", "b"]})
+    write_table(df, tmp_path / "mixed.parquet")
+    assert read_table(tmp_path / "mixed.parquet")["seed"].tolist() == ["7", "니트"]
+
+
+def test_parquet_inputs_and_output_match_csv(scoring_inputs):
+    inp, d = scoring_inputs, scoring_inputs["dir"]
+    pq = {}
+    for key in ("expanded", "competition"):
+        pq[key] = with_format(inp[key], "parquet")
+        write_table(read_table(inp[key]), pq[key])
+    cs.compute_scores(inp["excel"], None, inp["expanded"], inp["competition"], d / "csv_run.csv", None, None, 10)
+    cs.compute_scores(inp["excel"], None, pq["expanded"], pq["competition"], d / "pq_run.csv", None, None, 10,
+                      fmt="parquet")
+    assert not (d / "pq_run.csv").exists()
+    got = read_table(d / "pq_run.parquet")
+    want = read_table(d / "csv_run.csv", dtype={"seed": str})
+    pd.testing.assert_frame_equal(got, want, check_dtype=False)
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from tools.common.cache import ResponseCache, parse_max_age
+from tools.common.memo import SingleFlight, fetch_once
+
+
+def test_memo_fetches_each_query_once_and_keeps_variants_apart():
+    memo, calls = SingleFlight(), []
+
+    def fetch(q):
+        calls.append(q)
+        return len(calls)
+
+    for q in ["Nike", "nike", "Nike", "ＮＩＫＥ", "nike"]:
+        fetch_once(memo, None, "coupang", q, lambda q=q: fetch(q))
+    assert calls == ["Nike", "nike", "ＮＩＫＥ"]
+    assert fetch_once(memo, None, "naver", "Nike", lambda: "other site") == "other site"
+
+
+def test_single_flight_shares_one_in_flight_fetch():
+    memo, calls = SingleFlight(), []
+    gate = threading.Event()
+
+    def slow():
+        calls.append(1)
+        gate.wait(2)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(memo.do("k", slow))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == [42] * 8 and len(calls) == 1
+
+
+def test_single_flight_does_not_remember_exceptions():
+    memo, n = SingleFlight(), []
+
+    def flaky():
+        n.append(1)
+        if len(n) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        memo.do("k", flaky)
+    assert memo.do("k", flaky) == "ok" and memo.do("k", flaky) == "ok" and len(n) == 2
+
+
+def test_cache_keys_on_exact_query(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    assert cache.get_or_fetch("coupang", "Nike", lambda: 10) == 10
+    assert cache.get_or_fetch("coupang", "nike", lambda: 20) == 20
+    assert cache.get_or_fetch("coupang", "Nike", lambda: 99) == 10
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_skips_failures_and_honors_ttl_and_refresh(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    cache = ResponseCache(path, max_age={"coupang": 0.05})
+    assert cache.get_or_fetch("coupang", "q", lambda: None) is None
+    assert cache.get("coupang", "q") == (False, None)  # None is not cached
+    cache.put("coupang", "q", 5)
+    assert cache.get("coupang", "q") == (True, 5)
+    time.sleep(0.06)
+    assert cache.get("coupang", "q") == (False, None)
+    cache.put("naver", "q", [1, 2])
+    assert ResponseCache(path, refresh=True).get("naver", "q") == (False, None)
+    assert ResponseCache(path).get("naver", "q") == (True, [1, 2])
+
+
+def test_parse_max_age():
+    assert parse_max_age("3600") == {"*": 3600.0}
+    assert parse_max_age("coupang=60, naver_suggest=600") == {"coupang": 60.0, "naver_suggest": 600.0}
+    assert parse_max_age("") == {}
+
+
+def test_second_fetcher_run_is_served_from_the_cache(tmp_path, monkeypatch):
+    from tools import fetch_competition_counts as fcc
+    from conftest import read_journal
+
+    monkeypatch.chdir(tmp_path)  # logs/errors.csv
+    calls = []
+
+    def fake(site):
+        def fetch(session, kw, *a):
+            calls.append((site, kw))
+            return None if kw.endswith("3") else len(kw)
+        return fetch
+
+    monkeypatch.setattr(fcc, "_coupang_comp", fake("coupang"))
+    monkeypatch.setattr(fcc, "_naver_comp", fake("naver"))
+    inp = tmp_path / "in.csv"
+    inp.write_text("seed,keyword\n" + "".join(f"s{i % 2},kw {i % 7}\n" for i in range(20)), encoding="utf-8-sig")
+
+    def run(out):
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+        fcc.fetch_and_append(inp, None, tmp_path / out, "both", 0.0, 5, 0, None, cache=cache)
+        cache.close()
+        return read_journal(tmp_path / out)
+
+    first = run("first.csv")
+    assert sorted(calls) == sorted({(s, f"kw {i}") for s in ("coupang", "naver") for i in range(7)})
+    calls.clear()
+    second = run("second.csv")
+    assert second == first
+    assert sorted(calls) == [("coupang", "kw 3"), ("naver", "kw 3")]  # empty counts are not cached
@@ -0,0 +1,57 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import compute_scores as cs
+from conftest import TOKENS, WORDS, write_config
+
+
+def test_intent_matcher_matches_per_row_proxy():
+    rnd = random.Random(3)
+    tokens = TOKENS + [("NIKE", 0.25), ("니트", 0.1), ("여름 셔츠", 0.7)]  # duplicate token counts twice
+    texts = [" ".join(rnd.choice(WORDS + ["Nike", "nike", "여름 셔츠"]) for _ in range(rnd.randint(0, 4)))
+             for _ in range(500)] + ["", None, float("nan"), 123]
+    got = cs.IntentMatcher(tokens).score(texts)
+    want = np.array([cs._compute_intent_proxy(t, tokens) for t in texts])
+    assert np.array_equal(got, want)  # same accumulation order, so bit for bit
+
+
+def test_intent_matcher_hits_are_sorted_rows_per_token():
+    hits = cs.IntentMatcher([("니트", 1.0), ("코트", 1.0)]).hits(["니트 코트", "코트", "니트", "셔츠", "니트"])
+    assert [h.tolist() for h in hits] == [[0, 2, 4], [0, 1]]
+
+
+def _full(inp, excel, out, **kw):
+    cs.compute_scores(excel, None, inp["expanded"], inp["competition"], out, None, None, 10, **kw)
+    return pd.read_csv(out, encoding="utf-8-sig")
+
+
+def test_rescore_matches_full_run_after_config_edits(scoring_inputs):
+    inp, d = scoring_inputs, scoring_inputs["dir"]
+    cache = d / "scores.rescore.npz"
+    _full(inp, inp["excel"], d / "first.csv", rescore_cache=cache)
+
+    edited = write_config(d / "edited.xlsx", w_intent=0.8, w_competition=0.3,
+                          tokens=TOKENS[:3] + [("여름", 2.0), ("코트", 0.4)])
+    want = _full(inp, edited, d / "full.csv")
+    cs.rescore(edited, cache, d / "rescored.csv", None, None, 10)
+    pd.testing.assert_frame_equal(pd.read_csv(d / "rescored.csv", encoding="utf-8-sig"), want)
+
+    _, tokens, _, _ = cs.load_rescore_cache(cache)
+    assert {"여름", "코트"} <= set(tokens)  # new tokens were matched once and stored
+    cs.rescore(edited, cache, d / "again.csv", None, None, 10)
+    pd.testing.assert_frame_equal(pd.read_csv(d / "again.csv", encoding="utf-8-sig"), want)
+
+
+@pytest.mark.parametrize("chunksize", [3, 7, 1000])
+@pytest.mark.parametrize("with_comp", [True, False])
+def test_streaming_matches_in_memory_outputs(scoring_inputs, chunksize, with_comp):
+    inp, d = scoring_inputs, scoring_inputs["dir"]
+    comp = inp["competition"] if with_comp else None
+    cs.compute_scores(inp["excel"], None, inp["expanded"], comp, d / "mem.csv", None, d / "mem.html", 15)
+    cs.compute_scores_streaming(inp["excel"], None, inp["expanded"], comp, d / "stream.csv", None,
+                                d / "stream.html", 15, chunksize)
+    assert (d / "stream.csv").read_bytes() == (d / "mem.csv").read_bytes()
+    assert (d / "stream.html").read_text(encoding="utf-8") == (d / "mem.html").read_text(encoding="utf-8")
@@ -0,0 +1,129 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src import keyword_scoring_free_only as k
+from tools import compute_scores as cs
+
+LABELS = ["key", "value", "token", "weight", "enabled", "word", "symbol", " KEY ", "Value", "w_intent", "W_Competition"]
+FILLER = ["니트", "0.3", "1", "true", "", None, 0.7, 2, "abc"]
+
+
+def legacy_find_header(conf_df, header_seq):
+    """The cell-by-cell scan _find_header_position used before the grid."""
+    H, W = conf_df.shape
+    n = len(header_seq)
+    for r in range(H):
+        for c in range(W - n + 1):
+            if all(k._ieq(k._cell_str(conf_df.iat[r, c + j]), header_seq[j]) for j in range(n)):
+                return r, c
+    return None
+
+
+def legacy_literal_scan(cfg):
+    """The iloc scan _read_excel_config used for loose w_intent / w_competition labels."""
+    w_int = w_cmp = None
+    for r in range(len(cfg)):
+        for c in range(len(cfg.columns)):
+            val = str(cfg.iloc[r, c]).strip().lower()
+            if val not in {"w_intent", "w_competition"}:
+                continue
+            if c + 1 < len(cfg.columns):
+                v = cs._coerce_num(cfg.iloc[r, c + 1])
+                if v is not None:
+                    if val == "w_intent" and w_int is None:
+                        w_int = v
+                    elif val == "w_competition" and w_cmp is None:
+                        w_cmp = v
+                    continue
+            if r + 1 < len(cfg):
+                v = cs._coerce_num(cfg.iloc[r + 1, c])
+                if v is not None:
+                    if val == "w_intent" and w_int is None:
+                        w_int = v
+                    elif val == "w_competition" and w_cmp is None:
+                        w_cmp = v
+    if w_int is None or w_cmp is None:
+        return 0.55, 0.45
+    s = w_int + w_cmp
+    return (0.55, 0.45) if s <= 0 else (w_int / s, w_cmp / s)
+
+
+def _random_grid(rng, h, w):
+    return pd.DataFrame([[rng.choice(LABELS) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(w)]
+                         for _ in range(h)])
+
+
+class _Book:
+    def __init__(self, df):
+        self.df = df
+
+    def parse(self, sheet_name, **_kw):
+        return self.df
+
+
+def test_find_header_matches_legacy_scan():
+    rng = random.Random(7)
+    seqs = [["key", "value"], ["token", "weight", "enabled"], ["word", "enabled"], ["symbol", "enabled"]]
+    for _ in range(300):
+        df = _random_grid(rng, rng.randint(1, 12), rng.randint(1, 6))
+        for seq in seqs:
+            assert k._find_header_position(df, seq) == legacy_find_header(df, seq)
+
+
+def test_config_blocks():
+    df = pd.DataFrame([
+        ["memo", None, None, None, None],
+        [None, "key", "value", None, None],
+        [None, "W_intent", "3", None, None],
+        [None, "W_competition", "1", None, None],
+        [None, None, None, None, None],
+        [" Token ", "WEIGHT", "enabled", "word", "Enabled"],
+        ["니트", "1.5", "", " 무료   배송 ", "true"],
+        ["기모", "0.4", "no", "광고", "0"],
+        ["롱", "0", "yes", "", ""],
+        ["", "", "", "symbol", "enabled"],
+        [None, None, None, "★", ""],
+    ], dtype=object)
+    assert k._parse_weights_block(df) == {"W_intent": 0.75, "W_competition": 0.25}
+    assert k._parse_tokens_block(df) == {"니트": 1.5}
+    assert k._parse_prohibited_words_block(df) == ["무료 배송"]
+    assert k._parse_prohibited_symbols_block(df) == ["★"]
+
+
+def test_literal_scan_matches_legacy(monkeypatch):
+    rng = random.Random(11)
+    for _ in range(300):
+        df = _random_grid(rng, rng.randint(1, 10), rng.randint(1, 5))
+        df.columns = [f"c{i}" for i in range(df.shape[1])]  # no column / key-value layout
+        monkeypatch.setattr(cs, "load_workbook", lambda p, df=df: _Book(df))
+        w_int, w_cmp, tokens = cs._read_excel_config("config.xlsx")
+        assert (w_int, w_cmp) == pytest.approx(legacy_literal_scan(df))
+        assert tokens == []
+
+
+@pytest.mark.parametrize("cfg,expected", [
+    # column layout
+    (pd.DataFrame({"W_intent": [None, 3], "W_competition": [1, 5]}), (0.75, 0.25)),
+    # key/value table
+    (pd.DataFrame({"Key": ["w_intent", "W_COMPETITION", "other"], "Value": [1, "x", 9]}), (0.55, 0.45)),
+    (pd.DataFrame({"name": ["w_intent", "w_competition"], "val": ["2", "2"]}), (0.5, 0.5)),
+    # literal labels: right neighbour first, then the cell below
+    (pd.DataFrame({"a": ["w_intent", "", "w_competition"], "b": [4, None, None], "c": [None, None, None]}), (0.55, 0.45)),
+    (pd.DataFrame({"a": ["w_intent", "w_competition", 1], "b": [4, None, None]}), (0.8, 0.2)),
+])
+def test_weight_layouts(monkeypatch, cfg, expected):
+    monkeypatch.setattr(cs, "load_workbook", lambda p: _Book(cfg))
+    w_int, w_cmp, _ = cs._read_excel_config("config.xlsx")
+    assert (w_int, w_cmp) == pytest.approx(expected)
+
+
+def test_token_table(monkeypatch):
+    cfg = pd.DataFrame({
+        "token": ["니트", "기모", None, " 롱 ", "셔츠"],
+        "weight": [1, 0.5, 2, "x", 0.7],
+        "enabled": ["TRUE", "no", "yes", "1", 1],
+    })
+    monkeypatch.setattr(cs, "load_workbook", lambda p: _Book(cfg))
+    assert cs._read_excel_config("config.xlsx")[2] == [("니트", 1.0), ("셔츠", 0.7)]
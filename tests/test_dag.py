@@ -0,0 +1,164 @@
+import argparse
+import sys
+
+import pytest
+
+from tools import dag
+
+
+def _args(tmp_path, fmt="csv", collect_args="", score_args=""):
+    return argparse.Namespace(
+        in_path=tmp_path / "seeds.xlsx", prohibited_json=tmp_path / "p.json", out_dir=tmp_path / "out",
+        expand=2, sleep=0.0, site_mode="naver", topn=10, format=fmt,
+        collect_args=collect_args, score_args=score_args,
+    )
+
+
+def _flag(cmd, name):
+    return cmd[cmd.index(name) + 1]
+
+
+def test_build_stages_csv_keeps_original_command_lines(tmp_path):
+    collect, score, verify = dag.build_stages(_args(tmp_path))
+    assert "--format" not in collect.cmd + score.cmd + verify.cmd
+    assert _flag(score.cmd, "--sanitized-in").endswith("sanitized_keywords.csv")
+
+
+def test_build_stages_parquet_threads_format_through_every_stage(tmp_path):
+    collect, score, verify = dag.build_stages(_args(tmp_path, fmt="parquet"))
+    for st in (collect, score, verify):
+        assert _flag(st.cmd, "--format") == "parquet"
+    assert _flag(collect.cmd, "--competition-out") == _flag(score.cmd, "--competition-in") == _flag(
+        verify.cmd, "--competition")
+    assert _flag(score.cmd, "--out-csv").endswith("keyword_scores_free.parquet")
+    assert all(str(p).endswith(".parquet") for p in collect.outputs)
+    assert _flag(verify.cmd, "--scores-csv") == str(score.outputs[0])
+
+
+@pytest.mark.parametrize("extra", ["--format parquet", "--pipelined --format=parquet"])
+def test_main_rejects_format_inside_stage_args(monkeypatch, extra):
+    monkeypatch.setattr(sys, "argv", ["dag.py", "--collect-args", extra, "--dry-run"])
+    with pytest.raises(SystemExit) as e:
+        dag.main()
+    assert e.value.code == 2
+
+
+def _stage(tmp_path, name, out, src, deps=()):
+    script = tmp_path / f"{name}.py"
+    script.write_text(
+        "import sys\n"
+        f"open({str(tmp_path / 'calls')!r}, 'a').write({name!r} + '\\n')\n"
+        f"open({str(out)!r}, 'w').write(open({str(src)!r}).read().upper())\n"
+    )
+    return dag.Stage(name, [str(script)], {"src": lambda: dag.file_hash(src)}, [out], deps)
+
+
+def test_run_skips_up_to_date_stages_and_reruns_on_change(tmp_path):
+    src, mid, end = tmp_path / "src.txt", tmp_path / "mid.txt", tmp_path / "end.txt"
+    src.write_text("a")
+    state = tmp_path / "state.json"
+
+    def stages():
+        return [_stage(tmp_path, "one", mid, src), _stage(tmp_path, "two", end, mid, deps=["one"])]
+
+    def calls():
+        return (tmp_path / "calls").read_text().split()
+
+    assert dag.run(stages(), state) == 0
+    assert calls() == ["one", "two"]
+    assert dag.run(stages(), state) == 0
+    assert calls() == ["one", "two"]  # both up to date
+
+    end.write_text("edited")  # output modified -> only that stage re-runs
+    dag.run(stages(), state)
+    assert calls() == ["one", "two", "two"]
+
+    src.write_text("b")
+    dag.run(stages(), state)
+    assert calls()[-2:] == ["one", "two"] and end.read_text() == "B"
+
+
+def test_failed_stage_is_not_recorded(tmp_path):
+    bad = tmp_path / "bad.py"
+    bad.write_text("raise SystemExit(3)\n")
+    state = tmp_path / "state.json"
+    st = dag.Stage("bad", [str(bad)], {}, [tmp_path / "never.txt"])
+    assert dag.run([st], state) == 3
+    assert "bad" not in dag.load_state(state)
+
+
+def _fused_stages(tmp_path):
+    src, mid, end = tmp_path / "src.txt", tmp_path / "mid.txt", tmp_path / "end.txt"
+    src.write_text("a")
+    stages = [_stage(tmp_path, "one", mid, src), _stage(tmp_path, "two", end, mid, deps=["one"])]
+
+    def both():
+        with open(tmp_path / "calls", "a") as f:
+            f.write("both\n")
+        mid.write_text(src.read_text().upper())
+        end.write_text(mid.read_text().upper())
+    return stages, {("one", "two"): both}, (src, mid, end)
+
+
+def test_run_fuses_stages_that_rerun_together(tmp_path):
+    stages, fused, (src, mid, end) = _fused_stages(tmp_path)
+    state = tmp_path / "state.json"
+
+    def calls():
+        return (tmp_path / "calls").read_text().split()
+
+    assert dag.run(stages, state, fused=fused) == 0
+    assert calls() == ["both"]
+    assert set(dag.load_state(state)) == {"one", "two"}
+    assert dag.run(stages, state, fused=fused) == 0
+    assert calls() == ["both"]  # recorded hashes match: both up to date
+
+    end.write_text("edited")  # only the second stage is dirty: it runs on its own
+    dag.run(stages, state, fused=fused)
+    assert calls() == ["both", "two"]
+
+    dag.run(stages, state, selected=["one"], fused=fused)  # group not selected as a whole
+    src.write_text("b")
+    dag.run(stages, state, selected=["one"], fused=fused)
+    assert calls()[-1] == "one"
+
+
+def test_failed_fused_group_is_not_recorded(tmp_path):
+    stages, _, _ = _fused_stages(tmp_path)
+    state = tmp_path / "state.json"
+
+    def boom():
+        raise RuntimeError("scrape failed")
+
+    assert dag.run(stages, state, fused={("one", "two"): boom}) == 1
+    assert dag.load_state(state) == {}
+
+
+def test_build_fused_only_without_score_args(tmp_path):
+    stages = dag.build_stages(_args(tmp_path, score_args="--chunksize 1000"))
+    assert dag.build_fused(_args(tmp_path, score_args="--chunksize 1000"), stages) == {}
+    assert list(dag.build_fused(_args(tmp_path), dag.build_stages(_args(tmp_path)))) == [("collect", "score")]
+
+
+def test_collect_and_score_run_in_process(tmp_path, fake_network, monkeypatch):
+    from conftest import write_seeds
+    from tools import compute_scores as cs
+
+    monkeypatch.setattr(dag.subprocess, "call", lambda cmd: pytest.fail(f"subprocess: {cmd}"))
+    args = _args(tmp_path, collect_args="--no-cache --pipelined")
+    write_seeds(args.in_path, ["니트 원피스", "기모 코트", "니트 원피스", "하객룩"])
+    args.prohibited_json.write_text('{"words": ["무료배송"], "symbols": ["★"]}', encoding="utf-8")
+    stages = dag.build_stages(args)
+    state = tmp_path / "state.json"
+    assert dag.run(stages, state, ["collect", "score"], fused=dag.build_fused(args, stages)) == 0
+    assert set(dag.load_state(state)) == {"collect", "score"}
+
+    out = args.out_dir
+    # the score stage run on the written artifacts gives the same scores
+    cs.compute_scores(args.in_path, out / "sanitized_keywords.csv", out / "expanded_keywords.csv",
+                      out / "competition_counts.csv", tmp_path / "again.csv", None, None, args.topn)
+    assert (tmp_path / "again.csv").read_bytes() == (out / "keyword_scores_free.csv").read_bytes()
+    assert (out / "report.html").exists() and (out / "keyword_scores_free.xlsx").exists()
+    recorded = dag.load_state(state)
+    assert dag.run(stages, state, ["collect", "score"], fused=dag.build_fused(args, stages)) == 0
+    assert dag.load_state(state) == recorded  # both up to date: nothing re-ran
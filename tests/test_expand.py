@@ -0,0 +1,46 @@
+import random
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from src import keyword_scoring_free_only as k
+
+SEEDS = ["니트 원피스", "가을 코트", "니트 원피스", "", "롱 코트", "abc", "가을 코트", "여성 니트"]
+
+
+def _seeds():
+    return pd.DataFrame({"keyword": SEEDS, "keyword_sanitized": SEEDS})
+
+
+def _fake_suggest(calls, lock):
+    def fake(q, **_kw):
+        with lock:
+            calls[q] += 1
+        time.sleep(random.uniform(0, 0.01))
+        return [q, f"{q} 추천", f"{q} 세일", f"{q} 추천", f"{q} 무료배송", f"{q} 2024"]
+    return fake
+
+
+def _expand(workers):
+    return k.expand_all(_seeds(), 3, "ua", 1.0, 0, 0.0, ["무료배송"], [], workers=workers)
+
+
+def test_threaded_expand_matches_serial(monkeypatch):
+    calls, lock = Counter(), threading.Lock()
+    monkeypatch.setattr(k, "fetch_naver_suggest", _fake_suggest(calls, lock))
+    serial = _expand(1)
+    for workers in (2, 4, 8):
+        pd.testing.assert_frame_equal(_expand(workers), serial)
+    assert list(serial["seed_index"].drop_duplicates()) == [0, 1, 2, 4, 5, 6, 7]
+    assert serial.groupby("seed_index")["rank"].max().eq(3).all()
+
+
+def test_duplicate_seeds_fetch_once(monkeypatch):
+    calls, lock = Counter(), threading.Lock()
+    monkeypatch.setattr(k, "fetch_naver_suggest", _fake_suggest(calls, lock))
+    out = _expand(4)
+    assert calls == Counter({s: 1 for s in SEEDS if s})
+    # rows stay per seed even when the request is shared
+    assert (out["seed_index"] == 2).sum() == (out["seed_index"] == 0).sum()
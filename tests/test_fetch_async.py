@@ -0,0 +1,30 @@
+import csv
+
+from tools import fetch_competition_counts as fcc
+from conftest import read_journal
+
+
+def _run(inp, out, **kw):
+    fcc.fetch_and_append(inp, None, out, "both", 0.0, 5, 0, None, **kw)
+    return read_journal(out)
+
+
+def test_async_writes_the_same_rows_in_input_order(fake_fetch, tmp_path):
+    inp, state = fake_fetch
+    seq = _run(inp, tmp_path / "seq.csv")
+    asy = _run(inp, tmp_path / "async.csv", async_mode=True, max_per_host=3)
+    assert asy == seq
+    assert [r[1] for r in asy] == [f"kw {i}" for i in range(60) if i != 13]
+    assert 1 < state["peak"]["coupang"] <= 3 and state["peak"]["naver"] <= 3
+
+
+def test_async_resume_skips_rows_already_written(fake_fetch, tmp_path):
+    inp, _ = fake_fetch
+    out = tmp_path / "resume.csv"
+    full = _run(inp, tmp_path / "full.csv", async_mode=True)
+    with open(out, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined", "scraped_at"])
+        for row in full[:20]:
+            w.writerow(list(row) + [""])
+    assert _run(inp, out, async_mode=True) == full
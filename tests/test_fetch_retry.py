@@ -0,0 +1,67 @@
+import csv
+
+import pytest
+
+from tools import fetch_competition_counts as fcc
+from tools.common.shard import shard_of
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+def _log_errors(rows):
+    fcc.ERRORS_CSV.parent.mkdir(parents=True, exist_ok=True)
+    _write_csv(fcc.ERRORS_CSV, fcc.ERROR_FIELDS,
+               [["2024-01-01T00:00:00+00:00", site, seed, kw, "-", "boom"] for site, seed, kw in rows])
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # ERRORS_CSV is relative (logs/errors.csv)
+    return tmp_path
+
+
+def test_logged_errors_are_scoped_to_input_and_site(workdir):
+    out = workdir / "out.csv"
+    _write_csv(out, ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined", "scraped_at"],
+               [["s", "done", "1", "2", "1.5", ""], ["s", "half", "1", "", "1", ""]])
+    _log_errors([("both", "s", "mine"), ("both", "s", "other run"), ("coupang", "s", "coupang only"),
+                 ("naver", "s", "naver run"), ("both", "s", "done")])
+    pairs = [("s", "done"), ("s", "half"), ("s", "mine"), ("s", "coupang only"), ("s", "naver run")]
+    got = {t[1] for t in fcc._retry_targets(out, None, "naver", pairs)}
+    assert got == {"half", "mine", "naver run"}
+
+
+def test_logged_errors_need_an_input(workdir):
+    _log_errors([("both", "s", "anything")])
+    assert fcc._retry_targets(workdir / "out.csv", None, "both") == []
+
+
+def test_retry_targets_keep_own_shard_only(workdir):
+    kws = [f"kw {i}" for i in range(40)]
+    _log_errors([("both", "s", kw) for kw in kws])
+    got = [t[1] for t in fcc._retry_targets(workdir / "out.csv", None, "both", [("s", k) for k in kws], (1, 3))]
+    assert got and got == [k for k in kws if shard_of(k, 3) == 1]
+
+
+def test_retry_failed_does_not_append_foreign_errors(workdir, monkeypatch):
+    inp, out = workdir / "in.csv", workdir / "out.csv"
+    _write_csv(inp, ["seed", "keyword"], [["s", "a"], ["s", "b"]])
+    _write_csv(out, ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined", "scraped_at"],
+               [["s", "a", "5", "", "5", ""]])
+    _log_errors([("both", "s", "b"), ("both", "s", "someone else's")])
+    calls = []
+
+    def fake(site, session, kw, *a):
+        calls.append((site, kw))
+        return 7
+
+    monkeypatch.setattr(fcc, "_fetch_site", fake)
+    fcc.retry_failed(out, "both", 0.0, 5, 0, None, rounds=1, expanded_in=inp)
+    assert sorted(calls) == [("coupang", "b"), ("naver", "a"), ("naver", "b")]
+    rows = list(csv.DictReader(open(out, encoding="utf-8-sig")))
+    assert [(r["keyword"], r["comp_coupang"], r["comp_naver"]) for r in rows] == [("a", "5", "7"), ("b", "7", "7")]
@@ -0,0 +1,68 @@
+import pytest
+
+from tools import fetch_competition_counts as fcc
+
+
+class FakeResponse:
+    def __init__(self, body: str, chunk: int):
+        self.status_code = 200
+        self.headers = {}
+        self.encoding = "utf-8"
+        self._raw = body.encode("utf-8")
+        self._chunk = chunk
+        self.text = body
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self._raw), self._chunk):
+            yield self._raw[i:i + self._chunk]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, body: str, chunk: int = 7):
+        self.body, self.chunk = body, chunk
+
+    def get(self, url, timeout=None, stream=False):
+        return FakeResponse(self.body, self.chunk)
+
+
+def _both(body, patterns, chunk=7):
+    session = FakeSession(body, chunk)
+    full = fcc._fetch_count(session, "https://stream.test/a", patterns, 5, 0, 0, stream=False)
+    streamed = fcc._fetch_count(session, "https://stream.test/b", patterns, 5, 0, 0, stream=True)
+    return full[0], streamed[0]
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 7, 64, 10_000])
+def test_stream_respects_pattern_priority(chunk):
+    # a loose "N건" appears before the preferred "약 N건"
+    body = "<html><span>리뷰 12건</span>" + "x" * 500 + "<div>약 4,560건</div></html>"
+    assert _both(body, fcc.NAVER_GENERAL_COUNT_PATTERNS, chunk) == (4560, 4560)
+
+
+@pytest.mark.parametrize("chunk", [1, 5, 10_000])
+def test_stream_falls_back_to_lower_priority_at_eof(chunk):
+    body = "<html><span>리뷰 1,234건</span>" + "x" * 300 + "</html>"
+    assert _both(body, fcc.NAVER_GENERAL_COUNT_PATTERNS, chunk) == (1234, 1234)
+
+
+def test_stream_shopping_json_total_after_text_count():
+    body = '<script>{"total":999}</script>' + "y" * 100 + "<p>검색결과 8,765개</p>"
+    assert _both(body, fcc.NAVER_SHOPPING_COUNT_PATTERNS, 4) == (8765, 8765)
+
+
+def test_stream_stops_early_on_top_priority_match():
+    resp = FakeResponse("<p>검색 결과 42개</p>" + "z" * 100_000, chunk=16)
+    n, text = fcc._scan_stream(resp, fcc.COUPANG_COUNT_PATTERNS)
+    assert n == 42 and len(text) < 100
+
+
+def test_stream_no_match_returns_text_for_fallback():
+    session = FakeSession("<ul><li class='search-product'>a</li></ul>", 5)
+    n, html = fcc._fetch_count(session, "https://stream.test/c", fcc.COUPANG_COUNT_PATTERNS, 5, 0, 0, stream=True)
+    assert n is None and "search-product" in html
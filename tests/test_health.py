@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from tools.common import health as H
+from tools.common.ratelimit import configure_host, get_limiter
+
+
+def _site(host, rate=10.0, **options):
+    configure_host(host, rate)
+    return H.SiteHealth(host, **options)
+
+
+def test_parse_retry_after():
+    assert H.parse_retry_after("3") == 3.0
+    assert H.parse_retry_after("") is None and H.parse_retry_after(None) is None
+    assert H.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # in the past
+    assert H.parse_retry_after("soon") is None
+
+
+def test_throttle_opens_for_retry_after_then_probe_closes():
+    h = _site("t1.test")
+    assert h.allow()
+    assert h.record(False, 0.1, 429, "0.05") is True
+    assert h.state == H.OPEN and not h.allow()
+    assert 0 < h.paused_for() <= 0.05
+    time.sleep(0.06)
+    assert h.allow()  # the probe
+    assert h.state == H.HALF_OPEN and not h.allow()
+    assert h.record(True, 0.1, 200) is False
+    assert h.state == H.CLOSED and h.allow()
+
+
+def test_failed_probe_reopens_with_doubled_cooldown():
+    h = _site("t2.test", cooldown=0.05)
+    for _ in range(h.min_calls):
+        h.record(False)
+    assert h.state == H.OPEN and h.opens == 1
+    time.sleep(0.06)
+    assert h.allow()
+    h.record(False)
+    assert h.state == H.OPEN and h.opens == 2
+    assert 0.05 < h.paused_for() <= 0.1
+
+
+def test_error_rate_needs_min_calls_and_threshold():
+    h = _site("t3.test")
+    for _ in range(h.min_calls - 1):
+        h.record(False)
+    assert h.state == H.CLOSED
+    for _ in range(20):
+        h.record(True)
+    for _ in range(5):
+        h.record(False)  # 5 of the last 20: below 0.5
+    assert h.state == H.CLOSED
+
+
+def test_rate_is_cut_on_open_and_ramps_back():
+    h = _site("t4.test", rate=10.0)
+    h.record(False, status=403)
+    assert get_limiter("t4.test").rate == pytest.approx(5.0)
+    h._open_until = 0  # skip the pause
+    assert h.allow()
+    for _ in range(10):
+        h.record(True)
+    assert h.factor == 1.0 and get_limiter("t4.test").rate == pytest.approx(10.0)
+
+
+def test_reconfigured_limiter_is_scaled_not_overridden():
+    h = _site("t5.test", rate=10.0)
+    h.record(False, status=429)
+    configure_host("t5.test", 2.0)  # e.g. a later --sleep for the same host
+    h._open_until = 0
+    h.allow()
+    h.record(True)
+    assert get_limiter("t5.test").rate == pytest.approx(2.0 * h.factor)
+    for _ in range(20):
+        h.record(True)
+    assert get_limiter("t5.test").rate == pytest.approx(2.0)
+
+
+def test_unlimited_host_stays_unlimited():
+    h = _site("t6.test", rate=0.0)
+    h.record(False, status=429)
+    assert get_limiter("t6.test").rate == 0.0
+
+
+def test_second_throttle_while_open_only_extends():
+    h = _site("t7.test")
+    h.record(False, status=429, retry_after="0.05")
+    h.record(False, status=429, retry_after="0.2")
+    assert h.opens == 1 and h.throttled == 2 and h.paused_for() > 0.1
+
+
+def test_configure_health_resizes_existing_windows(monkeypatch):
+    monkeypatch.setattr(H, "_DEFAULTS", dict(H._DEFAULTS))
+    monkeypatch.setattr(H, "_HEALTH", {})
+    h = H.health_for("t8.test")
+    for _ in range(30):
+        h.record(True)
+    H.configure_health(window=5, min_calls=3)
+    assert h._outcomes.maxlen == 5 and len(h._outcomes) == 5
+    for _ in range(3):
+        h.record(False)
+    assert h.state == H.OPEN  # 3 of the last 5 failed
+    assert H.health_for("t9.test")._outcomes.maxlen == 5
+    with pytest.raises(TypeError):
+        H.configure_health(windw=3)
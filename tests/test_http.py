@@ -0,0 +1,76 @@
+import pytest
+
+from tools.common import http
+from tools.common.ratelimit import configure_host
+
+
+class FakeResponse:
+    def __init__(self, status, retry_after=None):
+        self.status_code = status
+        self.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = []
+
+    def _next(self, method, url):
+        self.calls.append(method)
+        return FakeResponse(*self.statuses.pop(0))
+
+    def get(self, url, **kw):
+        return self._next("GET", url)
+
+    def post(self, url, **kw):
+        return self._next("POST", url)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    def _install(host, statuses):
+        configure_host(host, 0.0)
+        session = FakeSession(statuses)
+        monkeypatch.setattr(http, "session_for", lambda url: session)
+        monkeypatch.setattr(http.time, "sleep", lambda s: None)
+        return session
+    return _install
+
+
+def test_get_waits_out_429_and_retries(fake):
+    session = fake("h1.test", [(429, "0"), (200,)])
+    r = http.HttpClient(throttle_ms=0).get("https://h1.test/x")
+    assert r.status_code == 200 and session.calls == ["GET", "GET"]
+
+
+def test_post_is_not_resent_after_429(fake):
+    session = fake("h2.test", [(429, "0"), (200,)])
+    r = http.HttpClient(throttle_ms=0).post("https://h2.test/x", json={})
+    assert r.status_code == 429 and session.calls == ["POST"]
+
+
+def test_post_opt_in_retries_429(fake):
+    session = fake("h3.test", [(429, "0"), (200,)])
+    r = http.HttpClient(throttle_ms=0).post("https://h3.test/x", retry_throttled=True, json={})
+    assert r.status_code == 200 and session.calls == ["POST", "POST"]
+
+
+def test_5xx_retries_then_raises(fake):
+    session = fake("h4.test", [(502,), (503,), (500,)])
+    with pytest.raises(RuntimeError, match="5xx"):
+        http.HttpClient(throttle_ms=0, retry_attempts=3).get("https://h4.test/x")
+    assert len(session.calls) == 3
+
+
+def test_last_attempt_returns_the_429(fake):
+    session = fake("h5.test", [(429, "0"), (429, "0")])
+    r = http.HttpClient(throttle_ms=0, retry_attempts=2).get("https://h5.test/x")
+    assert r.status_code == 429 and len(session.calls) == 2
+
+
+def test_403_is_returned_without_opening_the_circuit(fake):
+    session = fake("h6.test", [(403,), (200,)])
+    client = http.HttpClient(throttle_ms=0)
+    assert client.get("https://h6.test/x").status_code == 403
+    assert http.health_for("https://h6.test/x").allow()
+    assert client.get("https://h6.test/x").status_code == 200 and session.calls == ["GET", "GET"]
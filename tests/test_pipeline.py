@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from src import keyword_scoring_free_only as k
+from tools import compute_scores as cs
+from tools.pipeline import Pipeline
+from conftest import write_seeds
+
+SEEDS = ["니트 원피스", "기모 코트", "니트 원피스", "빅사이즈 셔츠", "무료배송 여름", "하객룩"]
+
+
+def _outs(d, tag):
+    return {name: str(d / f"{tag}_{name}.csv") for name in ("sanitized", "expanded", "competition")}
+
+
+def _cli_args(excel, outs):
+    return ["--in", str(excel), "--expand", "3", "--sleep", "0", "--no-cache",
+            "--sanitized-out", outs["sanitized"], "--expanded-out", outs["expanded"],
+            "--competition-out", outs["competition"]]
+
+
+def test_pipeline_matches_cli_and_compute_scores(tmp_path, fake_network):
+    excel = write_seeds(tmp_path / "seeds.xlsx", SEEDS)
+    staged = _outs(tmp_path, "cli")
+    k.main(_cli_args(excel, staged))
+    cs.compute_scores(excel, tmp_path / "cli_sanitized.csv", tmp_path / "cli_expanded.csv",
+                      tmp_path / "cli_competition.csv", tmp_path / "cli_scores.csv", None, tmp_path / "cli.html", 20)
+
+    pipe_outs = _outs(tmp_path, "pipe")
+    pipe = Pipeline(excel, expand=3, sleep=0.0, no_cache=True, sanitized_out=pipe_outs["sanitized"],
+                    expanded_out=pipe_outs["expanded"], competition_out=pipe_outs["competition"])
+    scores = pipe.run(out_csv=tmp_path / "pipe_scores.csv", html_out=tmp_path / "pipe.html", topn=20,
+                      write_artifacts=True)
+
+    assert (tmp_path / "pipe_scores.csv").read_bytes() == (tmp_path / "cli_scores.csv").read_bytes()
+    assert (tmp_path / "pipe.html").read_text(encoding="utf-8") == (tmp_path / "cli.html").read_text(encoding="utf-8")
+    for name in ("sanitized", "expanded"):
+        assert open(pipe_outs[name], "rb").read() == open(staged[name], "rb").read()
+    comp = [pd.read_csv(p, encoding="utf-8-sig").drop(columns="ts") for p in (pipe_outs["competition"], staged["competition"])]
+    pd.testing.assert_frame_equal(*comp)
+    assert len(scores) == len(pd.read_csv(tmp_path / "cli_scores.csv", encoding="utf-8-sig"))
+    assert pipe.expanded is not None and pipe.competition is not None
+
+
+def test_pipeline_writes_artifacts_only_when_asked(tmp_path, fake_network):
+    excel = write_seeds(tmp_path / "seeds.xlsx", SEEDS)
+    outs = _outs(tmp_path, "pipe")
+    Pipeline(excel, expand=2, sleep=0.0, no_cache=True, sanitized_out=outs["sanitized"],
+             expanded_out=outs["expanded"], competition_out=outs["competition"]).run()
+    assert not list(tmp_path.glob("pipe_*.csv"))
+
+
+def test_pipeline_rejects_unknown_options(tmp_path):
+    with pytest.raises(TypeError, match="expnad"):
+        Pipeline(tmp_path / "seeds.xlsx", expnad=2)
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from src import keyword_scoring_free_only as k
+
+SEEDS = ["니트 원피스", "기모 코트", "니트 원피스", "", "빅사이즈 셔츠", "여름", "하객룩", "기모 코트", "롱 코트"]
+
+
+def _sanitized():
+    return pd.DataFrame({"keyword": SEEDS, "keyword_sanitized": SEEDS})
+
+
+def _staged(site_mode):
+    expanded = k.expand_all(_sanitized(), 3, "ua", 1.0, 1, 0.0, [], [])
+    return expanded, k.collect_competition(expanded, site_mode, "ua", 1.0, 1, 0.0)
+
+
+@pytest.mark.parametrize("site_mode", ["both", "naver"])
+@pytest.mark.parametrize("workers,comp_workers,queue_size", [(1, 1, 1), (1, 3, 8), (4, 1, 2), (4, 4, 1)])
+def test_pipelined_matches_staged(fake_network, site_mode, workers, comp_workers, queue_size):
+    want_exp, want_comp = _staged(site_mode)
+    got_exp, got_comp = k.expand_and_collect(_sanitized(), 3, site_mode, "ua", 1.0, 1, 0.0, [], [],
+                                             workers=workers, comp_workers=comp_workers, queue_size=queue_size)
+    pd.testing.assert_frame_equal(got_exp, want_exp)
+    pd.testing.assert_frame_equal(got_comp.drop(columns="ts"), want_comp.drop(columns="ts"))
+    assert len(got_comp) == len(got_exp)
+
+
+def test_pipelined_fetches_each_keyword_once(fake_network):
+    k.expand_and_collect(_sanitized(), 3, "both", "ua", 1.0, 1, 0.0, [], [], workers=3, comp_workers=3)
+    assert set(fake_network.values()) == {1}
+
+
+def test_pipelined_empty_input(fake_network):
+    exp, comp = k.expand_and_collect(_sanitized().iloc[3:4], 3, "both", "ua", 1.0, 1, 0.0, [], [])
+    assert exp.empty and list(comp.columns) == k.COMPETITION_COLUMNS
+
+
+def test_pipelined_consumer_error_is_raised(fake_network, monkeypatch):
+    def broken(q, **_kw):
+        raise RuntimeError(f"boom {q}")
+
+    monkeypatch.setattr(k, "get_search_count_naver", broken)
+    with pytest.raises(RuntimeError, match="boom"):
+        # queue_size=1 with more seeds than slots: the producer must not block after the error
+        k.expand_and_collect(_sanitized(), 3, "both", "ua", 1.0, 1, 0.0, [], [], workers=2, queue_size=1)
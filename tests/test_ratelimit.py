@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from tools.common import ratelimit as rl
+
+
+def test_host_of():
+    assert rl.host_of("https://WWW.Coupang.com/np/search?q=1") == "www.coupang.com"
+    assert rl.host_of("Search.Naver.com") == "search.naver.com"
+    assert rl.host_of(None) == ""
+
+
+def test_rate_from_delay():
+    assert rl.rate_from_delay(0.5) == 2.0
+    assert rl.rate_from_delay(0) == 0.0 and rl.rate_from_delay(None) == 0.0
+
+
+def test_bucket_paces_after_burst():
+    b = rl.TokenBucket(rate=10.0, burst=2)
+    assert b.reserve() == 0.0 and b.reserve() == 0.0
+    assert b.reserve() == pytest.approx(0.1, abs=0.02)
+    assert b.reserve() == pytest.approx(0.2, abs=0.02)  # reservations queue up
+
+
+def test_bucket_refills_while_idle():
+    b = rl.TokenBucket(rate=50.0)
+    b.reserve()
+    time.sleep(0.03)
+    assert b.reserve() == 0.0
+
+
+def test_zero_rate_is_unlimited():
+    b = rl.TokenBucket(rate=0)
+    assert all(b.reserve() == 0.0 for _ in range(100))
+
+
+def test_limiters_are_shared_per_host_and_replaced_by_configure():
+    first = rl.get_limiter("https://rl1.test/a", rate=5.0)
+    assert rl.get_limiter("https://RL1.test/b", rate=99.0) is first and first.rate == 5.0
+    second = rl.configure_host("rl1.test", 1.0, burst=3)
+    assert second is not first and rl.get_limiter("rl1.test") is second and second.burst == 3
+
+
+def test_scale_is_relative_to_configured_rate():
+    b = rl.TokenBucket(rate=8.0)
+    b.scale(0.25)
+    assert b.rate == 2.0 and b.base_rate == 8.0
+    b.scale(1.0)
+    assert b.rate == 8.0
+
+
+def test_throttle_waits_for_the_token():
+    rl.configure_host("rl2.test", 20.0)
+    rl.throttle("rl2.test")
+    t0 = time.monotonic()
+    rl.throttle("rl2.test")
+    assert time.monotonic() - t0 >= 0.04
@@ -0,0 +1,112 @@
+import json
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from src import keyword_scoring_free_only as k
+
+LISTS = json.loads((Path(__file__).resolve().parents[1] / "config" / "prohibited_words_ko.json").read_text(encoding="utf-8"))
+WORDS, SYMBOLS = LISTS["words"], LISTS["symbols"]
+PLAIN = ["니트", "원피스", "여성", "롱", "Nike", "abc", "가을", "코트", "배송", "무", "료", "2024"]
+
+
+def legacy_sanitize(text, words, symbols):
+    """The word-by-word loop sanitize_text used before the trie matcher."""
+    original = k._cell_str(text)
+    cur = original
+    removed_words, removed_symbols = [], []
+    for w in k._sorted_desc_by_len(words):
+        cur, n = re.compile(re.escape(w), flags=re.IGNORECASE).subn("", cur)
+        if n > 0:
+            removed_words.append(w)
+    present = [s for s in symbols if s and s in cur]
+    if present:
+        cur, n = re.subn("[" + "".join(re.escape(s) for s in present) + "]", "", cur)
+        if n > 0:
+            removed_symbols = present
+    return k._collapse_spaces(cur), removed_words, removed_symbols
+
+
+def _new(text, words=WORDS, symbols=SYMBOLS):
+    s, info = k.sanitize_text(text, words, symbols)
+    assert info["sanitized"] == s and info["changed"] == (info["original"] != s)
+    return s, info["removed_words"], info["removed_symbols"]
+
+
+def test_trie_matcher_matches_legacy_loop_on_generated_keywords():
+    rnd = random.Random(7)
+    for _ in range(5000):
+        parts = [rnd.choice(WORDS + SYMBOLS + PLAIN) if rnd.random() < 0.5 else rnd.choice(PLAIN)
+                 for _ in range(rnd.randint(1, 6))]
+        text = " ".join(parts)
+        text = text.upper() if rnd.random() < 0.3 else text
+        assert _new(text) == legacy_sanitize(text, WORDS, SYMBOLS), text
+
+
+@pytest.mark.parametrize("text", [
+    "무료 배송 니트", "무료배송 니트", "FREE Shipping 니트", "【특가】 원피스!!", "즉시 할인 특별 할인 코트",
+    "", "   ", "베스트베스트", "가성비 최고 ★★★",
+])
+def test_trie_matcher_matches_legacy_loop_on_examples(text):
+    words = WORDS + ["free shipping"]
+    assert _new(text, words) == legacy_sanitize(text, words, SYMBOLS)
+
+
+def test_longest_overlapping_term_wins_and_is_reported_once():
+    assert _new("무료 배송 무료 니트") == ("니트", ["무료 배송", "무료"], [])
+    assert _new("Sale SALE sale", ["sale"], []) == ("", ["sale"], [])
+
+
+def test_single_pass_does_not_rescan_joined_fragments():
+    # the legacy loop removed "베스트" and then matched the re-joined "무료"
+    assert legacy_sanitize("무베스트료", WORDS, SYMBOLS)[0] == ""
+    assert _new("무베스트료") == ("무료", ["베스트"], [])
+
+
+def test_multi_character_symbols_keep_per_text_class():
+    assert _new("a<<b>>c", [], ["<<", ">>"]) == legacy_sanitize("a<<b>>c", [], ["<<", ">>"])
+
+
+def legacy_sanitize_df(df, words, symbols):
+    """The iterrows loop sanitize_df used before sanitize_series."""
+    import pandas as pd
+
+    logs = []
+    out = df.copy()
+    out["keyword_sanitized"] = df["keyword"].astype(str)
+    out["sanitized_changed"] = False
+    for idx, row in out.iterrows():
+        sanitized, info = k.sanitize_text(row["keyword"], words, symbols)
+        out.at[idx, "keyword_sanitized"] = sanitized
+        out.at[idx, "sanitized_changed"] = info["changed"]
+        logs.append({
+            "row_index": idx,
+            "keyword_original": info["original"],
+            "keyword_sanitized": info["sanitized"],
+            "removed_words": ", ".join(info["removed_words"]),
+            "removed_symbols": ", ".join(info["removed_symbols"]),
+            "changed": info["changed"],
+        })
+    return out, pd.DataFrame(logs)
+
+
+def test_sanitize_df_matches_row_loop():
+    import pandas as pd
+
+    keywords = ["무료 배송 니트", "원피스", None, float("nan"), 2024, "  【특가】 코트!  ", "원피스", "베스트 가을"]
+    df = pd.DataFrame({"seed": list("abcdefgh"), "keyword": keywords}, index=[10, 11, 12, 13, 14, 15, 16, 17])
+    out, log = k.sanitize_df(df, WORDS, SYMBOLS)
+    ref_out, ref_log = legacy_sanitize_df(df, WORDS, SYMBOLS)
+    pd.testing.assert_frame_equal(out, ref_out)
+    pd.testing.assert_frame_equal(log, ref_log)
+
+
+def test_sanitize_series_aligns_with_input_and_dedupes_work():
+    res = k.sanitize_series(["무료 니트", "니트", "무료 니트"], WORDS, SYMBOLS)
+    assert res["sanitized"] == ["니트", "니트", "니트"]
+    assert res["removed_words"] == ["무료", "", "무료"]
+    assert res["changed"] == [True, False, True]
+    assert k.sanitize_series([], WORDS, SYMBOLS) == {
+        "original": [], "sanitized": [], "removed_words": [], "removed_symbols": [], "changed": []}
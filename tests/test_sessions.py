@@ -0,0 +1,41 @@
+import pytest
+
+from tools.common import sessions
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    sessions.close_all()
+    yield
+    sessions.configure_pool(pool_size=10, connect_retries=2, backoff=0.3)
+
+
+def test_one_session_per_host():
+    a = sessions.session_for("https://a.test/x")
+    assert sessions.session_for("https://A.test/y?q=1") is a
+    assert sessions.session_for("https://b.test/") is not a
+
+
+def test_configure_pool_rebuilds_sessions_with_new_settings():
+    old = sessions.session_for("https://a.test/")
+    sessions.configure_pool(pool_size=7, connect_retries=0)
+    new = sessions.session_for("https://a.test/")
+    assert new is not old
+    adapter = new.get_adapter("https://a.test/")
+    assert adapter._pool_maxsize == 7 and adapter.max_retries.connect == 0
+    assert adapter.max_retries.read == 0 and adapter.max_retries.status == 0  # status/read stay with callers
+
+
+def test_host_sessions_merge_default_headers(monkeypatch):
+    seen = []
+
+    class Fake:
+        def request(self, method, url, headers=None, **kw):
+            seen.append((method, url, headers, kw))
+
+    monkeypatch.setattr(sessions, "session_for", lambda url: Fake())
+    hs = sessions.HostSessions({"User-Agent": "ua", "Accept": "*/*"})
+    hs.get("https://a.test/", headers={"Accept": "text/html"}, timeout=3)
+    hs.post("https://a.test/p", json={})
+    assert seen[0] == ("GET", "https://a.test/", {"User-Agent": "ua", "Accept": "text/html"}, {"timeout": 3})
+    assert seen[1][0] == "POST" and seen[1][2] == {"User-Agent": "ua", "Accept": "*/*"}
@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+from tools import fetch_competition_counts as fcc
+from tools.common.shard import in_shard, parse_shard, shard_of
+from tools.merge_competition_shards import merge_shards
+from conftest import read_journal
+
+HEADER = ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined", "scraped_at"]
+
+
+@pytest.mark.parametrize("spec,expected", [(None, None), ("", None), (" ", None), ("0/1", (0, 1)), ("2/3", (2, 3))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["3/3", "-1/2", "0/0", "1", "a/b", "1/2/3"])
+def test_parse_shard_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+def test_shard_of_is_stable_and_variant_insensitive():
+    # pinned: a changed hash would split resumed/merged runs differently
+    assert shard_of("니트 원피스", 1000) == 867
+    assert shard_of("Nike Air", 1000) == 814
+    assert shard_of("  NIKE\tair ", 1000) == shard_of("ｎｉｋｅ air", 1000) == 814
+
+
+def test_in_shard_partitions_keywords():
+    kws = [f"kw {i}" for i in range(300)]
+    owners = [[i for i in range(4) if in_shard(kw, (i, 4))] for kw in kws]
+    assert all(len(o) == 1 for o in owners)
+    assert {o[0] for o in owners} == {0, 1, 2, 3}
+    assert all(in_shard(kw, None) for kw in kws)
+
+
+def _write(path, rows, header=HEADER):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+    return path
+
+
+def test_merge_prefers_more_counts_then_newest(tmp_path):
+    a = _write(tmp_path / "a.csv", [
+        ["s", "니트", "3", "", "", "2026-01-02"],
+        ["s", "코트", "1", "2", "", "2026-01-01"],
+        ["s", "셔츠", "5", "6", "", "2026-01-01"],
+    ])
+    b = _write(tmp_path / "b.csv", [
+        ["s", "롱", "", "", "", "2026-01-05"],
+        ["s", "니트", "3", "4", "", "2026-01-01"],   # more counts wins although older
+        ["s", "코트", "", "9", "", "2026-01-09"],    # fewer counts loses although newer
+        ["s", "셔츠", "7", "8", "", "2026-01-03"],   # same counts: newest wins
+        ["t", "니트", "1", "1", "", "2026-01-01"],   # other seed: separate key
+    ])
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", encoding="utf-8")
+    out = tmp_path / "merged.csv"
+    assert merge_shards([a, empty, b], out) == (8, 5)
+    assert [r[:4] for r in read_journal(out)] == [
+        ("s", "니트", "3", "4"), ("s", "코트", "1", "2"), ("s", "셔츠", "7", "8"), ("s", "롱", "", ""), ("t", "니트", "1", "1"),
+    ]
+
+
+def test_sharded_runs_merge_to_the_unsharded_output(fake_fetch, tmp_path):
+    inp, _ = fake_fetch
+    fcc.fetch_and_append(inp, None, tmp_path / "full.csv", "both", 0.0, 5, 0, None)
+    shards = []
+    for i in range(3):
+        shards.append(tmp_path / f"shard{i}.csv")
+        fcc.fetch_and_append(inp, None, shards[-1], "both", 0.0, 5, 0, None, shard=(i, 3))
+    parts = [{r[1] for r in read_journal(p)} for p in shards]
+    assert all(parts) and not (parts[0] & parts[1] or parts[0] & parts[2] or parts[1] & parts[2])
+
+    merge_shards(shards, tmp_path / "merged.csv")
+    assert sorted(read_journal(tmp_path / "merged.csv")) == sorted(read_journal(tmp_path / "full.csv"))
@@ -0,0 +1,106 @@
+import csv
+
+import pytest
+
+from tools import fetch_competition_counts as fcc
+from tools.common import store as store_mod
+from tools.common.store import STATUS_ERROR, STATUS_MISSING, STATUS_OK, CheckpointStore, row_status
+from conftest import read_journal
+
+HEADER = ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined", "scraped_at"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = CheckpointStore(str(tmp_path / "sub" / "store.sqlite"))
+    yield s
+    s.close()
+
+
+def _row(seed, kw, c, n, status=None, ts="2026-01-01T00:00:00Z"):
+    return (seed, kw, c, n, None, ts, status or row_status("both", c, n))
+
+
+def test_row_status():
+    assert row_status("both", 1, 2) == STATUS_OK
+    assert row_status("both", 1, None) == STATUS_MISSING
+    assert row_status("coupang", 1, None) == STATUS_OK
+    assert row_status("naver", 1, None) == STATUS_MISSING
+    assert row_status("naver", None, 0) == STATUS_OK
+
+
+def test_put_many_upserts_and_errors_never_downgrade(store):
+    assert store.put_many([_row("s", "a", 1, None), _row("s", "b", 1, 2)], [("s", "c", "boom", "t0")]) == 3
+    assert store.put_many([_row("s", "a", 1, 5)], [("s", "b", "late failure", "t1"), ("s", "c", "again", "t2")]) == 3
+    assert len(store) == 3
+    assert (store.status_of("s", "a"), store.status_of("s", "b"), store.status_of("s", "c")) == (
+        STATUS_OK, STATUS_OK, STATUS_ERROR)
+    assert store.status_of("s", "zzz") is None
+    assert store.counts() == {STATUS_OK: 2, STATUS_ERROR: 1}
+    assert store.changes == 6
+
+
+def test_put_many_rolls_back_on_error(store):
+    with pytest.raises(Exception):
+        store.put_many([_row("s", "a", 1, 2), ("too", "short")])
+    assert len(store) == 0
+
+
+def test_stage_and_iter_pending(store, monkeypatch):
+    monkeypatch.setattr(store_mod, "STAGE_BATCH", 3)
+    monkeypatch.setattr(store_mod, "PAGE_SIZE", 2)
+    store.put_many([_row("s", "k1", 1, 2), _row("s", "k3", 1, None)], [("s", "k4", "boom", "t")])
+    pairs = [("s", f"k{i}") for i in range(8)]
+    assert store.stage(iter(pairs)) == (8, 6)  # k1 ok and k3 missing are finished; k4 error is retried
+    assert [(seed, kw) for _, seed, kw in store.iter_pending()] == [p for p in pairs if p[1] not in ("k1", "k3")]
+    assert [pos for pos, _, _ in store.iter_pending()] == [1, 3, 5, 6, 7, 8]
+    assert store.stage([("s", "k1")]) == (1, 0)  # restaging replaces the previous input
+    assert list(store.iter_pending()) == []
+
+
+def test_iter_results_and_incomplete(store, monkeypatch):
+    monkeypatch.setattr(store_mod, "PAGE_SIZE", 2)
+    store.put_many([_row("s", f"k{i}", i, None if i % 2 else i) for i in range(5)], [("s", "bad", "boom", "t")])
+    store.put_many([_row("s", "k0", 9, 9, ts="later")])  # upsert keeps the insertion position
+    assert [r[1] for r in store.iter_results()] == ["k0", "k1", "k2", "k3", "k4"]
+    assert next(store.iter_results()) == ("s", "k0", 9, 9, "later")
+    assert [r[1] for r in store.iter_incomplete("both")] == ["k1", "k3", "bad"]
+    assert [r[1] for r in store.iter_incomplete("coupang")] == ["bad"]
+    assert [r[1] for r in store.iter_incomplete("naver")] == ["k1", "k3", "bad"]
+
+
+def test_import_and_export_csv_journal_roundtrip(store, tmp_path):
+    journal = tmp_path / "journal.csv"
+    rows = [["s0", "니트", "3", "7", "", "t0"], ["s0", "코트", "", "5", "", "t1"], ["s1", "니트", "4", "", "", ""]]
+    with open(journal, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        w.writerows(rows)
+    assert fcc.import_csv_journal(store, journal, "both") == 3
+    assert store.counts() == {STATUS_OK: 1, STATUS_MISSING: 2}
+    out = tmp_path / "export.csv"
+    assert fcc.export_store_csv(store, out, HEADER) == 3
+    with open(out, encoding="utf-8-sig", newline="") as f:
+        got = list(csv.reader(f))
+    assert got[0] == HEADER
+    assert [r[:4] for r in got[1:]] == [r[:4] for r in rows]
+    assert [r[5] for r in got[1:3]] == ["t0", "t1"] and got[3][5]  # a missing scraped_at is filled in
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_store_run_matches_csv_journal_and_resumes(fake_fetch, tmp_path):
+    inp, _ = fake_fetch
+    fcc.fetch_and_append(inp, None, tmp_path / "plain.csv", "both", 0.0, 5, 0, None)
+    want = read_journal(tmp_path / "plain.csv")
+
+    db = str(tmp_path / "run.sqlite")
+    with_store = tmp_path / "store.csv"
+    s = CheckpointStore(db)
+    fcc.fetch_and_append(inp, None, with_store, "both", 0.0, 5, 0, None, store=s, commit_rows=7)
+    s.close()
+    assert read_journal(with_store) == want
+
+    s = CheckpointStore(db)
+    assert s.counts()[STATUS_ERROR] == 1  # "kw 13"
+    assert s.stage(fcc._input_pairs(inp, None)[0]) == (60, 1)
+    s.close()
@@ -0,0 +1,72 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import compute_scores as cs
+from tools import sweep_weights as sw
+from conftest import TOKENS, write_config
+
+
+def _sweep_args(inp, **kw):
+    return argparse.Namespace(
+        excel_in=inp["excel"], sanitized_in=None, expanded_in=inp["expanded"],
+        competition_in=inp["competition"], rescore_cache=None, grid=kw.get("grid", []),
+        configs=kw.get("configs"), topn=kw.get("topn", 10), chunk=kw.get("chunk", 2),
+    )
+
+
+def _scores(inp, excel):
+    out = cs.compute_scores_frames(excel, pd.read_csv(inp["expanded"], encoding="utf-8-sig"),
+                                   competition_df=pd.read_csv(inp["competition"], encoding="utf-8-sig"))
+    return out.sort_index()  # index = row position after dedupe
+
+
+def _metrics(base, other, topn):
+    order = lambda s: s.sort_values(ascending=False, kind="stable").index[:topn]  # noqa: E731
+    overlap = len(set(order(base["score"])) & set(order(other["score"]))) / topn
+    rho = base["score"].rank().corr(other["score"].rank())
+    return overlap, rho
+
+
+def test_list_configs_keeps_label_columns(tmp_path):
+    path = tmp_path / "configs.csv"
+    path.write_text("name,W_intent,니트,note\nheavy,0.9,2,try this\nlight,0.1,,\n,0.5,1,\n", encoding="utf-8-sig")
+    configs, labels = sw._list_configs(path)
+    assert configs == [{"W_intent": 0.9, "니트": 2.0}, {"W_intent": 0.1}, {"W_intent": 0.5, "니트": 1.0}]
+    assert labels == ["heavy try this", "light", None]
+
+
+def test_sweep_matches_compute_scores_per_config(scoring_inputs, tmp_path):
+    inp = scoring_inputs
+    configs = tmp_path / "configs.csv"
+    pd.DataFrame([
+        {"label": "intent heavy", "W_intent": 0.9, "W_competition": 0.1},
+        {"label": "new token", "여름": 1.5},
+        {"label": "knit off", "니트": 0.0, "W_competition": 2.0},
+    ]).to_csv(configs, index=False, encoding="utf-8-sig")
+    report = sw.run(_sweep_args(inp, configs=configs, grid=["W_intent=0.2,0.7"]))
+
+    assert list(report["config"]) == ["baseline", 1, 2, "intent heavy", "new token", "knit off"]
+    base = _scores(inp, inp["excel"])
+    expected = {
+        1: dict(w_intent=0.2),
+        2: dict(w_intent=0.7),
+        3: dict(w_intent=0.9, w_competition=0.1),
+        4: dict(tokens=TOKENS + [("여름", 1.5)]),
+        5: dict(w_competition=2.0, tokens=[(t, 0.0 if t == "니트" else w) for t, w in TOKENS]),
+    }
+    row = report.iloc[0]
+    assert row["top10_overlap"] == 1.0 and row["spearman"] == pytest.approx(1.0)
+    for k, cfg in expected.items():
+        other = _scores(inp, write_config(tmp_path / f"cfg{k}.xlsx", **cfg))
+        overlap, rho = _metrics(base, other, 10)
+        assert report.iloc[k]["top10_overlap"] == pytest.approx(overlap), k
+        assert report.iloc[k]["spearman"] == pytest.approx(rho), k
+
+
+def test_rank_desc_averages_ties():
+    order, ranks = sw._rank_desc(np.array([[3.0], [1.0], [3.0], [2.0]]))
+    assert order.tolist() == [[0, 2, 3, 1]]
+    assert ranks.tolist() == [[1.5, 4.0, 1.5, 3.0]]
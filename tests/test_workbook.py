@@ -0,0 +1,75 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from tools.common import workbook
+from tools.common.workbook import load_workbook, sidecar_path
+
+
+def _write_book(path, extra=""):
+    with pd.ExcelWriter(path) as xw:
+        pd.DataFrame({
+            "keyword": ["니트", "코트", None, "원피스" + extra],
+            "weight": [0.5, 1, None, 2.25],
+            "code": ["007", "12", "", "x"],
+        }).to_excel(xw, sheet_name="Main", index=False)
+        pd.DataFrame([["w_intent", 0.55], [None, None], ["w_competition", 0.45]]).to_excel(
+            xw, sheet_name="Weights", index=False, header=False)
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    monkeypatch.setattr(workbook, "_LOADED", {})
+    path = tmp_path / "config.xlsx"
+    _write_book(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("sheet", ["Main", "Weights"])
+@pytest.mark.parametrize("header,dtype", [(0, None), (None, None), (0, str), (None, object)])
+def test_parse_matches_read_excel(book, sheet, header, dtype):
+    got = load_workbook(book, use_sidecar=False).parse(sheet, header=header, dtype=dtype)
+    want = pd.read_excel(book, sheet_name=sheet, header=header, dtype=dtype)
+    pd.testing.assert_frame_equal(got, want)
+
+
+def test_missing_sheet(book):
+    with pytest.raises(ValueError):
+        load_workbook(book, use_sidecar=False).parse("Nope")
+
+
+def test_sidecar_written_and_reused(book, monkeypatch):
+    wb = load_workbook(book)
+    assert os.path.exists(sidecar_path(book))
+    assert load_workbook(book) is wb
+
+    monkeypatch.setattr(workbook, "_LOADED", {})
+    monkeypatch.setattr(workbook, "_read_cells", lambda p: pytest.fail("sidecar not reused"))
+    assert load_workbook(book).sheet_names == ["Main", "Weights"]
+    # a touched but identical file is trusted through the content hash
+    os.utime(book, ns=(1, 1))
+    monkeypatch.setattr(workbook, "_LOADED", {})
+    load_workbook(book)
+
+
+def test_sidecar_rejected_when_content_changes(book, monkeypatch):
+    load_workbook(book)
+    monkeypatch.setattr(workbook, "_LOADED", {})
+    _write_book(book, extra="!")
+    got = load_workbook(book).parse("Main")
+    assert got["keyword"].iloc[-1] == "원피스!"
+    with open(sidecar_path(book), "rb") as f:
+        assert pickle.load(f)["sheets"]["Main"][-1][0] == "원피스!"
+
+
+def test_sidecar_rejected_on_version_bump(book, monkeypatch):
+    load_workbook(book)
+    monkeypatch.setattr(workbook, "_LOADED", {})
+    monkeypatch.setattr(workbook, "SIDECAR_VERSION", workbook.SIDECAR_VERSION + 1)
+    calls = []
+    real = workbook._read_cells
+    monkeypatch.setattr(workbook, "_read_cells", lambda p: calls.append(p) or real(p))
+    load_workbook(book)
+    assert calls
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from tools import fetch_competition_counts as fcc
+from tools.common.store import STATUS_OK
+from tools.common.workqueue import DONE, FAILED, LEASED, TODO, WorkQueue
+from conftest import read_journal
+
+PAIRS = [("s", f"k{i}") for i in range(6)]
+
+
+def _worker(path, owner, lease=300.0):
+    q = WorkQueue(str(path), lease=lease)
+    q.owner = owner  # one process plays several workers
+    return q
+
+
+@pytest.fixture
+def queues(tmp_path):
+    made = []
+
+    def make(owner, lease=300.0):
+        made.append(_worker(tmp_path / "queue.sqlite", owner, lease))
+        return made[-1]
+    yield make
+    for q in made:
+        q.close()
+
+
+def _row(seed, kw):
+    return (seed, kw, 1, 2, None, "t", STATUS_OK)
+
+
+def test_enqueue_is_idempotent_and_skips_finished(queues):
+    q = queues("a")
+    q.put_many([_row("s", "k1")])
+    q.stage(PAIRS)
+    assert q.enqueue() == 5
+    assert q.enqueue() == 0
+    q2 = queues("b")
+    q2.stage(PAIRS)
+    q2.enqueue()
+    assert q.states() == {TODO: 5}
+
+
+def test_claims_lease_disjoint_batches_in_input_order(queues):
+    a, b = queues("a"), queues("b")
+    a.stage(PAIRS)
+    a.enqueue()
+    assert [kw for _, _, kw in a.claim(2)] == ["k0", "k1"]
+    assert [kw for _, _, kw in b.claim(3)] == ["k2", "k3", "k4"]
+    assert [kw for _, _, kw in a.claim(10)] == ["k5"]
+    assert b.claim(10) == []
+    assert a.states() == {LEASED: 6}
+
+
+def test_expired_lease_is_taken_over(queues):
+    crashed, b = queues("crashed", lease=0.3), queues("b")
+    crashed.stage(PAIRS)
+    crashed.enqueue()
+    crashed.claim(2)
+    assert [kw for _, _, kw in b.claim(10)] == ["k2", "k3", "k4", "k5"]
+    time.sleep(0.4)
+    assert [kw for _, _, kw in b.claim(10)] == ["k0", "k1"]
+    attempts = dict(b._conn.execute("SELECT keyword, attempts FROM tasks").fetchall())
+    assert attempts["k0"] == 2 and attempts["k2"] == 1
+
+
+def test_results_mark_tasks_and_extend_leases(queues):
+    a = queues("a", lease=0.5)
+    a.stage(PAIRS)
+    a.enqueue()
+    a.claim(4)
+    time.sleep(0.35)
+    a.put_many([_row("s", "k0")], errors=[("s", "k1", "boom", "t")])
+    assert a.states() == {DONE: 1, FAILED: 1, LEASED: 2, TODO: 2}
+    time.sleep(0.25)  # past the original lease, within the extended one
+    assert [kw for _, _, kw in queues("b").claim(10)] == ["k4", "k5"]
+
+    assert a.release() == 2
+    assert a.states() == {DONE: 1, FAILED: 1, LEASED: 2, TODO: 2}
+    a.enqueue()  # failed tasks are re-opened
+    assert a.states() == {DONE: 1, LEASED: 2, TODO: 3}
+
+
+def test_iter_claims_stops_when_queue_is_drained(queues):
+    a = queues("a")
+    a.stage(PAIRS)
+    a.enqueue()
+    got = []
+    for pos, seed, kw in a.iter_claims(batch=4, poll=0.01):
+        got.append(kw)
+        a.put_many([_row(seed, kw)])
+    assert got == [kw for _, kw in PAIRS]
+    assert a.states() == {DONE: 6}
+
+
+def test_worker_takes_over_a_crashed_workers_tasks(fake_fetch, tmp_path):
+    inp, _ = fake_fetch
+    fcc.fetch_and_append(inp, None, tmp_path / "plain.csv", "both", 0.0, 5, 0, None)
+
+    qpath = tmp_path / "q.sqlite"
+    crashed = _worker(qpath, "crashed", lease=0.05)
+    crashed.stage(fcc._input_pairs(inp, None)[0])
+    crashed.enqueue()
+    assert len(crashed.claim(15)) == 15  # never finished
+    crashed.close()
+    time.sleep(0.1)
+
+    q = _worker(qpath, "survivor")
+    fcc.fetch_and_append(inp, None, tmp_path / "queue.csv", "both", 0.0, 5, 0, None, store=q, queue_batch=7)
+    assert q.states() == {DONE: 59, FAILED: 1}
+    q.close()
+    assert read_journal(tmp_path / "queue.csv") == read_journal(tmp_path / "plain.csv")
@@ -0,0 +1,103 @@
+import csv
+import io
+import threading
+import time
+
+import pytest
+
+from tools import fetch_competition_counts as fcc
+from tools.common.store import STATUS_ERROR, STATUS_MISSING, CheckpointStore
+from tools.common.writer import GroupCommitWriter
+
+HEADER = ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined", "scraped_at"]
+
+
+def _recorder():
+    groups, lock = [], threading.Lock()
+
+    def commit(items):
+        with lock:
+            groups.append(items)
+    return groups, commit
+
+
+def test_groups_by_max_rows_and_close_flushes_the_rest():
+    groups, commit = _recorder()
+    w = GroupCommitWriter(commit, max_rows=4, interval=60)
+    for i in range(10):
+        w.put(i)
+    w.close()
+    assert groups == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert (w.items, w.commits) == (10, 3)
+    w.close()  # idempotent
+
+
+def test_interval_commits_a_partial_group():
+    groups, commit = _recorder()
+    with GroupCommitWriter(commit, max_rows=100, interval=0.05) as w:
+        w.put("a")
+        w.put("b")
+        deadline = time.monotonic() + 2
+        while not groups and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert groups == [["a", "b"]]
+        w.put("c")
+    assert groups == [["a", "b"], ["c"]]
+
+
+def test_concurrent_producers_commit_every_item_once():
+    groups, commit = _recorder()
+    w = GroupCommitWriter(commit, max_rows=7, interval=0.01)
+    threads = [threading.Thread(target=lambda t=t: [w.put((t, i)) for i in range(200)]) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    w.close()
+    items = [x for g in groups for x in g]
+    assert sorted(items) == [(t, i) for t in range(4) for i in range(200)]
+    assert all(len(g) <= 7 for g in groups)
+    for t in range(4):
+        assert [i for th, i in items if th == t] == list(range(200))  # per-producer order kept
+
+
+def test_commit_error_is_raised_from_put_and_close():
+    def commit(items):
+        raise OSError("disk full")
+
+    w = GroupCommitWriter(commit, max_rows=1, interval=60)
+    w.put(1)
+    deadline = time.monotonic() + 2
+    while w._error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with pytest.raises(OSError, match="disk full"):
+        w.put(2)
+    with pytest.raises(OSError, match="disk full"):
+        w.close()
+    assert w.commits == 0
+
+
+def test_result_sink_csv_journal_and_errors(tmp_path):
+    f, ef = io.StringIO(), io.StringIO()
+    sink = fcc._ResultSink(HEADER, "both", ef, f=f, commit_rows=2, commit_interval=60)
+    sink.row("s", "니트", 3, None)
+    sink.row("s", "코트", 1, 2)
+    sink.error("s", "셔츠", RuntimeError("boom"))
+    sink.row("s", "롱", None, None)
+    sink.close()
+    rows = list(csv.reader(io.StringIO(f.getvalue())))
+    assert [r[:4] for r in rows] == [["s", "니트", "3", ""], ["s", "코트", "1", "2"], ["s", "롱", "", ""]]
+    errors = list(csv.DictReader(io.StringIO(ef.getvalue()), fieldnames=fcc.ERROR_FIELDS))
+    assert [(e["keyword"], e["error"]) for e in errors] == [("셔츠", "boom")]
+    assert sink.results.commits == 2
+
+
+def test_result_sink_store(tmp_path):
+    store = CheckpointStore(str(tmp_path / "s.sqlite"))
+    sink = fcc._ResultSink(HEADER, "both", io.StringIO(), store=store, commit_rows=100, commit_interval=60)
+    sink.row("s", "니트", 3, None)
+    sink.error("s", "셔츠", RuntimeError("boom"))
+    sink.close()
+    assert sink.results.commits == 1  # the row and the error share one transaction
+    assert (store.status_of("s", "니트"), store.status_of("s", "셔츠")) == (STATUS_MISSING, STATUS_ERROR)
+    store.close()
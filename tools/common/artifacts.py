@@ -0,0 +1,61 @@
+import os
+from typing import Optional
+
+import pandas as pd
+
+# Inter-stage tables: CSV (utf-8-sig, the default) or Parquet (needs pyarrow).
+# Readers pick the format from the file suffix; writers from --format.
+FORMATS = ("csv", "parquet")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def is_parquet(path) -> bool:
+    return os.path.splitext(str(path))[1].lower() in PARQUET_SUFFIXES
+
+
+def require_parquet():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise SystemExit("ERROR: --format parquet needs pyarrow (pip install pyarrow)")
+
+
+def with_format(path, fmt: str):
+    """`path` with its suffix switched to the artifact format (same type as given)."""
+    if path is None or fmt != "parquet" or is_parquet(path):
+        return path
+    root, _ = os.path.splitext(str(path))
+    out = root + ".parquet"
+    return out if isinstance(path, str) else type(path)(out)
+
+
+def read_table(path, **csv_kwargs) -> pd.DataFrame:
+    if is_parquet(path):
+        require_parquet()
+        return pd.read_parquet(path)
+    csv_kwargs.setdefault("encoding", "utf-8-sig")
+    return pd.read_csv(path, **csv_kwargs)
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    # Arrow needs one type per column; object columns mixing e.g. ints and
+    # strings (Excel seeds) are stored as strings, missing values kept.
+    fixed = {}
+    for col in df.columns[df.dtypes == object]:
+        kind = pd.api.types.infer_dtype(df[col], skipna=True)
+        if kind.startswith("mixed"):
+            s = df[col]
+            fixed[col] = s.where(s.isna(), s.astype(str))
+    return df.assign(**fixed) if fixed else df
+
+
+def write_table(df: pd.DataFrame, path, fmt: Optional[str] = None):
+    """Write `df` as CSV or Parquet (`fmt` defaults to the path's suffix)."""
+    fmt = fmt or ("parquet" if is_parquet(path) else "csv")
+    if fmt == "parquet":
+        require_parquet()
+        tmp = f"{path}.tmp"
+        _arrow_safe(df).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
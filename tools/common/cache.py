@@ -0,0 +1,117 @@
+import json, os, sqlite3, threading, time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Seconds a cached answer stays fresh, per site. Suggestions drift slowly;
+# result counts are re-checked daily.
+DEFAULT_TTL = {
+    "naver_suggest": 3 * 86400,
+    "coupang": 86400,
+    "naver": 86400,
+}
+
+
+def query_key(q: str) -> str:
+    """Cache/memo key: the query exactly as it is sent (case or width variants are different searches)."""
+    return str(q or "")
+
+
+def parse_max_age(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a --max-age value: either plain seconds for every site ("3600")
+    or per-site overrides ("coupang=3600,naver_suggest=604800").
+    """
+    out: Dict[str, float] = {}
+    if spec is None or str(spec).strip() == "":
+        return out
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            site, val = part.split("=", 1)
+            out[site.strip()] = float(val)
+        else:
+            out["*"] = float(part)
+    return out
+
+
+class ResponseCache:
+    """
+    On-disk cache of parsed responses (counts, suggestion lists) keyed by
+    (site, query as sent). Entries older than the site's TTL are ignored;
+    `refresh=True` skips reads but still stores fresh answers.
+    """
+
+    def __init__(self, path: str, max_age: Optional[Dict[str, float]] = None, refresh: bool = False):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        self.refresh = refresh
+        self.ttl = dict(DEFAULT_TTL)
+        overrides = dict(max_age or {})
+        if "*" in overrides:
+            glob = overrides.pop("*")
+            self.ttl = {k: glob for k in self.ttl}
+            self._default_ttl = glob
+        else:
+            self._default_ttl = 86400.0
+        self.ttl.update(overrides)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " site TEXT NOT NULL, query TEXT NOT NULL, value TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL, PRIMARY KEY (site, query))"
+        )
+
+    def ttl_for(self, site: str) -> float:
+        return float(self.ttl.get(site, self._default_ttl))
+
+    def get(self, site: str, query: str) -> Tuple[bool, Any]:
+        if self.refresh:
+            return False, None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fetched_at FROM responses WHERE site=? AND query=?",
+                (site, query_key(query)),
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_for(site):
+            return False, None
+        return True, json.loads(row[0])
+
+    def put(self, site: str, query: str, value: Any):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (site, query, value, fetched_at) VALUES (?, ?, ?, ?)",
+                (site, query_key(query), json.dumps(value, ensure_ascii=False), time.time()),
+            )
+
+    def get_or_fetch(self, site: str, query: str, fetch: Callable[[], Any]) -> Any:
+        hit, value = self.get(site, query)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            return value
+        value = fetch()
+        # failures come back as None / []; leave them uncached so they are retried
+        if value is not None and value != []:
+            self.put(site, query, value)
+        return value
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def cached(cache: Optional[ResponseCache], site: str, query: str, fetch: Callable[[], Any]) -> Any:
+    """`cache.get_or_fetch` that degrades to a plain call when caching is off."""
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(site, query, fetch)
@@ -0,0 +1,187 @@
+import threading, time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, List, Optional, Sequence
+
+from .ratelimit import get_limiter, host_of
+
+# Responses that mean "slow down" rather than "broken": the circuit opens at
+# once (for Retry-After if given) instead of spending retries on them.
+THROTTLE_STATUSES = (429, 403)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+_DEFAULTS = {
+    "window": 20,          # outcomes in the rolling error rate
+    "min_calls": 5,        # ...needed before the rate can open the circuit
+    "error_rate": 0.5,     # open at this share of failures in the window
+    "cooldown": 30.0,      # first pause; doubles on every re-open
+    "max_cooldown": 600.0,
+    "decrease": 0.5,       # request-rate factor multiplier on open (AIMD)
+    "increase": 0.05,      # ...added back per successful response
+    "min_factor": 0.1,
+}
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Retry-After header (seconds or HTTP date) -> seconds from now."""
+    if value is None or str(value).strip() == "":
+        return None
+    s = str(value).strip()
+    try:
+        return max(0.0, float(s))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(s).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class SiteHealth:
+    """
+    Rolling health of one host (error rate over the last `window` outcomes,
+    latency EWMA, throttle count) and a circuit breaker on top of it:
+
+    closed     requests flow; a throttle response, or an error rate at or
+               above `error_rate`, opens the circuit
+    open       no requests until the pause (Retry-After if the server sent
+               one, else cooldown doubled per re-open) is over
+    half-open  one probe request; success closes, failure re-opens
+
+    Each open also cuts the host's token-bucket rate by `decrease`; every
+    success adds `increase` back until the configured rate is reached.
+    """
+
+    def __init__(self, host: str, **options):
+        self.host = host
+        for key, val in dict(_DEFAULTS, **options).items():
+            setattr(self, key, val)
+        self.state = CLOSED
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.opens = 0
+        self.latency: Optional[float] = None
+        self.factor = 1.0
+        self._outcomes: Deque[bool] = deque(maxlen=int(self.window))
+        self._reopens = 0
+        self._open_until = 0.0
+        self._probe_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """May a request go out now? In half-open state only the first caller (the probe) gets True."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._open_until:
+                self.state, self._probe_at = HALF_OPEN, None
+            if self.state == HALF_OPEN:
+                # a probe that never reported back (caller died) is replaced after a cooldown
+                if self._probe_at is None or now - self._probe_at > self.cooldown:
+                    self._probe_at = now
+                    return True
+            return False
+
+    def paused_for(self) -> float:
+        """Seconds until a request may be tried (0 when one may go now)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            if self.state == OPEN:
+                return max(0.0, self._open_until - time.monotonic())
+            return 0.0 if self._probe_at is None else 1.0
+
+    def record(
+        self,
+        ok: bool,
+        latency: Optional[float] = None,
+        status: Optional[int] = None,
+        retry_after=None,
+        throttle_statuses: Sequence[int] = THROTTLE_STATUSES,
+    ) -> bool:
+        """Account one outcome; returns True when it was a throttle response (circuit now open)."""
+        with self._lock:
+            self.requests += 1
+            if latency is not None:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if status in throttle_statuses:
+                self.throttled += 1
+                self._open(parse_retry_after(retry_after))
+                return True
+            self._outcomes.append(bool(ok))
+            if ok:
+                if self.state == HALF_OPEN:
+                    self.state, self._reopens = CLOSED, 0
+                    self._outcomes.clear()
+                self._set_factor(min(1.0, self.factor + self.increase))
+                return False
+            self.errors += 1
+            if self.state == HALF_OPEN:
+                self._open(None)
+            elif self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if self._outcomes.count(False) / len(self._outcomes) >= self.error_rate:
+                    self._open(None)
+            return False
+
+    def _open(self, retry_after: Optional[float]) -> None:
+        pause = self.cooldown * 2 ** self._reopens if retry_after is None else retry_after
+        pause = min(self.max_cooldown, pause)
+        if self.state == OPEN:  # already paused (e.g. a second 429 in flight): extend only
+            self._open_until = max(self._open_until, time.monotonic() + pause)
+            return
+        self.state = OPEN
+        self._open_until = time.monotonic() + pause
+        self._probe_at = None
+        self._reopens += 1
+        self.opens += 1
+        self._outcomes.clear()
+        self._set_factor(max(self.min_factor, self.factor * self.decrease))
+
+    def _set_factor(self, factor: float) -> None:
+        if factor == self.factor:
+            return
+        self.factor = factor
+        # relative to the limiter's own configured rate, so a configure_host()
+        # after the breaker kicked in is scaled, not overridden
+        get_limiter(self.host).scale(factor)
+
+    def summary(self) -> str:
+        lat = "-" if self.latency is None else f"{self.latency:.2f}s"
+        return (f"{self.host}: {self.state}, requests={self.requests} errors={self.errors} "
+                f"throttled={self.throttled} opens={self.opens} latency~{lat} rate x{self.factor:.2f}")
+
+
+_HEALTH: Dict[str, SiteHealth] = {}
+_LOCK = threading.Lock()
+
+
+def configure_health(**options) -> None:
+    """Change breaker settings (see _DEFAULTS) for every host, existing and future."""
+    unknown = set(options) - set(_DEFAULTS)
+    if unknown:
+        raise TypeError(f"unknown health option(s): {sorted(unknown)}")
+    with _LOCK:
+        _DEFAULTS.update(options)
+        for h in _HEALTH.values():
+            with h._lock:
+                for key, val in options.items():
+                    setattr(h, key, val)
+                if "window" in options:  # deque maxlen is fixed at creation
+                    h._outcomes = deque(h._outcomes, maxlen=int(h.window))
+
+
+def health_for(url_or_host: str) -> SiteHealth:
+    host = host_of(url_or_host)
+    with _LOCK:
+        h = _HEALTH.get(host)
+        if h is None:
+            h = _HEALTH[host] = SiteHealth(host)
+        return h
+
+
+def health_report() -> List[str]:
+    with _LOCK:
+        return [h.summary() for h in _HEALTH.values() if h.requests]
@@ -1,34 +1,51 @@
-import time, random, requests
+import time, random
+from .health import health_for
+from .ratelimit import get_limiter
+from .sessions import session_for
+
+# The connectors call credentialed APIs, where a 403 usually means bad keys
+# or a missing scope rather than throttling: only 429 opens the circuit here
+# (health.THROTTLE_STATUSES also counts 403 for the anonymous scrapers).
+API_THROTTLE_STATUSES = (429,)
 
 class HttpClient:
     def __init__(self, throttle_ms=300, retry_attempts=3):
         self.throttle_ms = throttle_ms
         self.retry_attempts = retry_attempts
-        self._last = 0.0
 
-    def _throttle(self):
-        now = time.time()
-        wait_s = max(0.0, self._last + self.throttle_ms/1000.0 - now)
-        if wait_s > 0:
-            time.sleep(wait_s)
-        self._last = time.time()
+    def _throttle(self, url):
+        # shared per-host token bucket: waits overlap with other requests' latency
+        get_limiter(url, rate=1000.0 / self.throttle_ms if self.throttle_ms else 0.0).acquire()
 
     def get(self, url, **kwargs):
-        return self._with_retry(lambda: requests.get(url, timeout=15, **kwargs))
+        return self._with_retry(url, lambda: session_for(url).get(url, timeout=15, **kwargs))
 
-    def post(self, url, **kwargs):
-        return self._with_retry(lambda: requests.post(url, timeout=15, **kwargs))
+    def post(self, url, retry_throttled=False, **kwargs):
+        # a POST is re-sent after a 429 only when the caller says it is safe to repeat
+        return self._with_retry(url, lambda: session_for(url).post(url, timeout=15, **kwargs),
+                                retry_throttled=retry_throttled)
 
-    def _with_retry(self, fn):
+    def _with_retry(self, url, fn, retry_throttled=True):
+        health = health_for(url)
         err = None
         for i in range(self.retry_attempts):
+            while not health.allow():  # circuit open: wait out the pause (Retry-After included)
+                time.sleep(max(health.paused_for(), 0.1))
             try:
-                self._throttle()
+                self._throttle(url)
+                t0 = time.monotonic()
                 r = fn()
-                if r.status_code >= 500:
-                    raise RuntimeError(f"5xx from server: {r.status_code}")
-                return r
             except Exception as e:
+                health.record(False)
                 err = e
-                time.sleep(min(2**i, 8) + random.random()*0.3)
+            else:
+                if health.record(r.status_code < 500, time.monotonic() - t0, r.status_code,
+                                 r.headers.get("Retry-After"), throttle_statuses=API_THROTTLE_STATUSES):
+                    if not retry_throttled or i == self.retry_attempts - 1:
+                        return r  # the caller sees the 429 as before; later calls wait for the pause
+                    continue  # the next allow() waits for the pause instead of backing off blindly
+                if r.status_code < 500:
+                    return r
+                err = RuntimeError(f"5xx from server: {r.status_code}")
+            time.sleep(min(2**i, 8) + random.random()*0.3)
         raise err
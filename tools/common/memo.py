@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .cache import ResponseCache, cached, query_key
+
+
+class SingleFlight:
+    """
+    In-run memo: each distinct key is fetched once, and concurrent callers
+    for the same key wait for that one fetch instead of issuing their own.
+    Results (including None) are kept for the life of the object; an
+    exception is handed to the waiting callers but not remembered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.fetched = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            fut = self._futures.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._futures[key] = Future()
+                self.fetched += 1
+        if not owner:
+            return fut.result()
+        try:
+            value = fn()
+        except BaseException as e:
+            with self._lock:
+                self._futures.pop(key, None)
+                self.fetched -= 1
+            fut.set_exception(e)
+            raise
+        fut.set_result(value)
+        return value
+
+
+def fetch_once(
+    memo: Optional[SingleFlight],
+    cache: Optional[ResponseCache],
+    site: str,
+    query: str,
+    fetch: Callable[[], Any],
+) -> Any:
+    """Single-flight memo in front of the (optional) on-disk response cache."""
+    call = lambda: cached(cache, site, query, fetch)  # noqa: E731
+    if memo is None:
+        return call()
+    return memo.do((site, query_key(query)), call)
@@ -0,0 +1,93 @@
+import asyncio, threading, time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Per-host politeness limiter: `rate` requests/sec with up to `burst` queued tokens.
+
+    Tokens refill while a request is in flight, so a slow response "pays" for
+    the next request's delay instead of adding to it. `rate <= 0` disables it.
+    Safe to share between threads and asyncio tasks.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = float(rate)
+        self.base_rate = self.rate  # configured pace; scale() adapts `rate` around it
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def scale(self, factor: float):
+        """Run at `factor` x the configured rate (tokens earned so far are kept)."""
+        with self._lock:
+            if self.base_rate <= 0:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self.rate = self.base_rate * float(factor)
+
+    def acquire(self):
+        wait_s = self.reserve()
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+    async def acquire_async(self):
+        wait_s = self.reserve()
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+
+
+_LIMITERS: Dict[str, TokenBucket] = {}
+_LOCK = threading.Lock()
+
+
+def host_of(url_or_host: str) -> str:
+    s = str(url_or_host or "").strip()
+    if "//" in s:
+        s = urlparse(s).hostname or ""
+    return s.lower()
+
+
+def rate_from_delay(delay_s: float) -> float:
+    """Translate a legacy `--sleep` delay into requests/sec (0 = unlimited)."""
+    return 1.0 / delay_s if delay_s and delay_s > 0 else 0.0
+
+
+def configure_host(url_or_host: str, rate: float, burst: float = 1.0) -> TokenBucket:
+    """Set (or replace) the limiter for a host; later lookups share it."""
+    bucket = TokenBucket(rate, burst)
+    with _LOCK:
+        _LIMITERS[host_of(url_or_host)] = bucket
+    return bucket
+
+
+def get_limiter(url_or_host: str, rate: Optional[float] = None, burst: float = 1.0) -> TokenBucket:
+    """Return the host's shared limiter, creating it from `rate`/`burst` on first use."""
+    host = host_of(url_or_host)
+    with _LOCK:
+        bucket = _LIMITERS.get(host)
+        if bucket is None:
+            bucket = _LIMITERS[host] = TokenBucket(rate or 0.0, burst)
+        return bucket
+
+
+def throttle(url_or_host: str, rate: Optional[float] = None, burst: float = 1.0):
+    get_limiter(url_or_host, rate, burst).acquire()
+
+
+async def throttle_async(url_or_host: str, rate: Optional[float] = None, burst: float = 1.0):
+    await get_limiter(url_or_host, rate, burst).acquire_async()
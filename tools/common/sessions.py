@@ -0,0 +1,90 @@
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .ratelimit import host_of
+
+# One keep-alive requests.Session per host, shared by every caller in the
+# process, so repeated requests reuse TCP/TLS connections.
+_SETTINGS = {"pool_size": 10, "connect_retries": 2, "backoff": 0.3}
+_SESSIONS: Dict[str, requests.Session] = {}
+_LOCK = threading.Lock()
+
+
+def configure_pool(
+    pool_size: Optional[int] = None,
+    connect_retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+):
+    """Tune the pools; sessions are rebuilt lazily with the new settings."""
+    with _LOCK:
+        if pool_size is not None:
+            _SETTINGS["pool_size"] = max(1, int(pool_size))
+        if connect_retries is not None:
+            _SETTINGS["connect_retries"] = max(0, int(connect_retries))
+        if backoff is not None:
+            _SETTINGS["backoff"] = float(backoff)
+        old = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for s in old:
+        s.close()
+
+
+def _new_session() -> requests.Session:
+    # Only connection failures are retried here: status codes and read
+    # timeouts stay with the caller's own retry/backoff logic.
+    retry = Retry(
+        total=_SETTINGS["connect_retries"],
+        connect=_SETTINGS["connect_retries"],
+        read=0,
+        status=0,
+        backoff_factor=_SETTINGS["backoff"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_SETTINGS["pool_size"], max_retries=retry)
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def session_for(url_or_host: str) -> requests.Session:
+    host = host_of(url_or_host)
+    with _LOCK:
+        s = _SESSIONS.get(host)
+        if s is None:
+            s = _SESSIONS[host] = _new_session()
+        return s
+
+
+def close_all():
+    with _LOCK:
+        old = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for s in old:
+        s.close()
+
+
+class HostSessions:
+    """
+    requests.Session stand-in that routes each call to the pooled session
+    of the URL's host. `headers` are sent with every request (per-call
+    headers win).
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None):
+        self.headers = dict(headers or {})
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs):
+        merged = dict(self.headers)
+        merged.update(headers or {})
+        return session_for(url).request(method, url, headers=merged, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,35 @@
+import hashlib, re, unicodedata
+from typing import Optional, Tuple
+
+
+def normalize_query(q: str) -> str:
+    """Canonical keyword form: NFKC, collapsed whitespace, casefolded."""
+    s = unicodedata.normalize("NFKC", str(q or ""))
+    return re.sub(r"\s+", " ", s).strip().casefold()
+
+
+def parse_shard(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'i/N' -> (i, N) with 0 <= i < N; None/'' -> None (no sharding)."""
+    if spec is None or str(spec).strip() == "":
+        return None
+    try:
+        i, n = (int(x) for x in str(spec).split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}")
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"shard index must satisfy 0 <= i < N, got {spec!r}")
+    return i, n
+
+
+def shard_of(keyword: str, n: int) -> int:
+    """
+    Stable shard of a keyword: hash of its normalized form, so spelling
+    variants and every seed listing the keyword land together, on every
+    machine and Python version.
+    """
+    digest = hashlib.blake2b(normalize_query(keyword).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % n
+
+
+def in_shard(keyword: str, shard: Optional[Tuple[int, int]]) -> bool:
+    return shard is None or shard_of(keyword, shard[1]) == shard[0]
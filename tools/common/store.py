@@ -0,0 +1,199 @@
+import os, sqlite3, threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Row states. Resume skips finished rows (ok/missing); error rows are retried.
+STATUS_OK = "ok"            # every requested site returned a count
+STATUS_MISSING = "missing"  # fetched, but at least one requested count is empty
+STATUS_ERROR = "error"      # the fetch raised; no counts stored
+FINISHED = (STATUS_OK, STATUS_MISSING)
+_FINISHED_SQL = "('ok', 'missing')"
+
+STAGE_BATCH = 10000
+PAGE_SIZE = 1000
+
+
+def row_status(site_mode: str, comp_c: Optional[int], comp_n: Optional[int]) -> str:
+    need = {"coupang": [comp_c], "naver": [comp_n]}.get(site_mode, [comp_c, comp_n])
+    return STATUS_OK if all(v is not None for v in need) else STATUS_MISSING
+
+
+class CheckpointStore:
+    """
+    SQLite results table for the competition fetcher, keyed by
+    (seed, keyword) with a status column. The input is staged into a temp
+    table and resume is an indexed anti-join against finished rows, so
+    neither the journal nor the input has to be held in memory. The CSV
+    output is an export of this table (insertion order). `fsync=True`
+    makes every commit durable on disk (synchronous=FULL).
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        self.changes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=" + ("FULL" if fsync else "NORMAL"))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " seed TEXT NOT NULL, keyword TEXT NOT NULL,"
+            " comp_coupang INTEGER, comp_naver INTEGER, comp_combined REAL,"
+            " scraped_at TEXT, status TEXT NOT NULL, error TEXT,"
+            " PRIMARY KEY (seed, keyword))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_status ON results (status)")
+        self._conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS pending ("
+            " pos INTEGER PRIMARY KEY, seed TEXT NOT NULL, keyword TEXT NOT NULL)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    # ---- writes ----
+
+    _UPSERT = (
+        "INSERT INTO results (seed, keyword, comp_coupang, comp_naver, comp_combined, scraped_at, status, error)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, NULL)"
+        " ON CONFLICT(seed, keyword) DO UPDATE SET"
+        " comp_coupang=excluded.comp_coupang, comp_naver=excluded.comp_naver,"
+        " comp_combined=excluded.comp_combined, scraped_at=excluded.scraped_at,"
+        " status=excluded.status, error=NULL"
+    )
+
+    def put(self, seed: str, keyword: str, comp_c: Optional[int], comp_n: Optional[int],
+            comp_combined: Optional[float], scraped_at: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute(self._UPSERT, (seed, keyword, comp_c, comp_n, comp_combined, scraped_at, status))
+            self.changes += 1
+
+    # a failed fetch never downgrades a finished row for the same key
+    _ERROR_UPSERT = (
+        "INSERT INTO results (seed, keyword, scraped_at, status, error) VALUES (?, ?, ?, '" + STATUS_ERROR + "', ?)"
+        " ON CONFLICT(seed, keyword) DO UPDATE SET scraped_at=excluded.scraped_at, error=excluded.error"
+        " WHERE results.status = '" + STATUS_ERROR + "'"
+    )
+
+    def put_many(self, rows: Iterable[tuple], errors: Iterable[tuple] = ()) -> int:
+        """
+        One transaction: upsert (seed, keyword, comp_c, comp_n, comp_combined,
+        scraped_at, status) rows and record (seed, keyword, error, ts) failures.
+        """
+        rows, errors = list(rows), list(errors)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._apply(rows, errors)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.changes += len(rows) + len(errors)
+        return len(rows) + len(errors)
+
+    def _apply(self, rows: List[tuple], errors: List[tuple]) -> None:
+        # runs inside put_many's transaction (subclasses add their bookkeeping)
+        self._conn.executemany(self._UPSERT, rows)
+        self._conn.executemany(self._ERROR_UPSERT, [(seed, kw, ts, err) for seed, kw, err, ts in errors])
+
+    # ---- resume ----
+
+    def stage(self, pairs: Iterable[Tuple[str, str]]) -> Tuple[int, int]:
+        """
+        Load the input (seed, keyword) pairs, in order, into the temp table.
+        Returns (staged, pending): pending excludes keys already finished.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM pending")
+                batch: List[Tuple[str, str]] = []
+                for pair in pairs:
+                    batch.append(pair)
+                    if len(batch) >= STAGE_BATCH:
+                        self._conn.executemany("INSERT INTO pending (seed, keyword) VALUES (?, ?)", batch)
+                        batch.clear()
+                if batch:
+                    self._conn.executemany("INSERT INTO pending (seed, keyword) VALUES (?, ?)", batch)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            staged = self._conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+            todo = self._conn.execute(
+                "SELECT COUNT(*) FROM pending p WHERE NOT EXISTS ("
+                " SELECT 1 FROM results r WHERE r.seed = p.seed AND r.keyword = p.keyword"
+                " AND r.status IN " + _FINISHED_SQL + ")"
+            ).fetchone()[0]
+        return staged, todo
+
+    def iter_pending(self) -> Iterator[Tuple[int, str, str]]:
+        """(input position, seed, keyword) of staged pairs not yet finished, paged by position."""
+        last = 0
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    "SELECT p.pos, p.seed, p.keyword FROM pending p WHERE p.pos > ? AND NOT EXISTS ("
+                    " SELECT 1 FROM results r WHERE r.seed = p.seed AND r.keyword = p.keyword"
+                    " AND r.status IN " + _FINISHED_SQL + ") ORDER BY p.pos LIMIT ?",
+                    (last, PAGE_SIZE),
+                ).fetchall()
+            if not page:
+                return
+            yield from page
+            last = page[-1][0]
+
+    # ---- export ----
+
+    def iter_results(self) -> Iterator[Tuple[str, str, Optional[int], Optional[int], Optional[str]]]:
+        """(seed, keyword, comp_coupang, comp_naver, scraped_at) of finished rows, in insertion order."""
+        last = 0
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    "SELECT rowid, seed, keyword, comp_coupang, comp_naver, scraped_at FROM results"
+                    " WHERE rowid > ? AND status IN " + _FINISHED_SQL + " ORDER BY rowid LIMIT ?",
+                    (last, PAGE_SIZE),
+                ).fetchall()
+            if not page:
+                return
+            for row in page:
+                yield row[1:]
+            last = page[-1][0]
+
+    def iter_incomplete(self, site_mode: str) -> Iterator[Tuple[str, str, Optional[int], Optional[int]]]:
+        """(seed, keyword, comp_coupang, comp_naver) of error rows and rows missing a count `site_mode` asks for."""
+        need = {"coupang": ["comp_coupang"], "naver": ["comp_naver"]}.get(site_mode, ["comp_coupang", "comp_naver"])
+        where = " OR ".join(["status = '" + STATUS_ERROR + "'"] + [f"{col} IS NULL" for col in need])
+        last = 0
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    "SELECT rowid, seed, keyword, comp_coupang, comp_naver FROM results"
+                    f" WHERE rowid > ? AND ({where}) ORDER BY rowid LIMIT ?",
+                    (last, PAGE_SIZE),
+                ).fetchall()
+            if not page:
+                return
+            for row in page:
+                yield row[1:]
+            last = page[-1][0]
+
+    def status_of(self, seed: str, keyword: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM results WHERE seed=? AND keyword=?", (seed, keyword)
+            ).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM results GROUP BY status").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,114 @@
+import hashlib, os, pickle, threading
+from typing import Dict, Optional
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+# Bump when the pickled layout changes; stale sidecars are then re-parsed.
+SIDECAR_VERSION = 1
+
+
+def sidecar_path(path: str) -> str:
+    d, name = os.path.split(os.path.abspath(path))
+    return os.path.join(d, f".{name}.parsed.pkl")
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Workbook:
+    """
+    Every sheet of an .xlsx parsed once (openpyxl) into raw cell rows.
+    `parse()` rebuilds what `pd.read_excel(path, sheet_name=..., header=...,
+    dtype=...)` would return from those rows, so callers needing different
+    header/dtype views of one sheet share a single openpyxl pass.
+    """
+
+    def __init__(self, path: str, sheets: Dict[str, list]):
+        self.path = path
+        self._sheets = sheets
+
+    @property
+    def sheet_names(self):
+        return list(self._sheets)
+
+    def parse(self, sheet_name: str, header: Optional[int] = 0, dtype=None) -> pd.DataFrame:
+        if sheet_name not in self._sheets:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        rows = self._sheets[sheet_name]
+        if not rows:
+            return pd.DataFrame()
+        # same options read_excel hands to TextParser
+        return TextParser(rows, header=header, dtype=dtype, skip_blank_lines=False).read()
+
+
+def _read_cells(path: str) -> Dict[str, list]:
+    # na_filter=False keeps cells exactly as read_excel's parser sees them ("" for empty)
+    raw = pd.read_excel(path, sheet_name=None, header=None, dtype=object, na_filter=False)
+    return {name: df.values.tolist() for name, df in raw.items()}
+
+
+_LOADED: Dict[str, tuple] = {}
+_LOCK = threading.Lock()
+
+
+def load_workbook(path: str, use_sidecar: bool = True) -> Workbook:
+    """
+    Parsed workbook for `path`, reused within the process while the file is
+    unchanged. A sidecar pickle next to the workbook lets later runs skip
+    openpyxl: it is trusted when mtime+size match, or when the content hash
+    does (e.g. after a checkout touched the file).
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        hit = _LOADED.get(path)
+        if hit and hit[0] == stamp:
+            return hit[1]
+
+    sheets = None
+    side = sidecar_path(path)
+    meta = {"version": SIDECAR_VERSION, "pandas": pd.__version__, "mtime_ns": stamp[0], "size": stamp[1]}
+    if use_sidecar and os.path.exists(side):
+        try:
+            with open(side, "rb") as f:
+                saved = pickle.load(f)
+            same_env = saved.get("version") == SIDECAR_VERSION and saved.get("pandas") == pd.__version__
+            if same_env and (saved["mtime_ns"], saved["size"]) == stamp:
+                sheets = saved["sheets"]
+            elif same_env and saved["size"] == stamp[1] and saved.get("sha256") == _sha256(path):
+                sheets = saved["sheets"]
+                meta["sha256"] = saved["sha256"]
+                _write_sidecar(side, dict(meta, sheets=sheets))
+        except Exception:
+            sheets = None
+    if sheets is None:
+        sheets = _read_cells(path)
+        if use_sidecar:
+            meta["sha256"] = _sha256(path)
+            _write_sidecar(side, dict(meta, sheets=sheets))
+
+    wb = Workbook(path, sheets)
+    with _LOCK:
+        _LOADED[path] = (stamp, wb)
+    return wb
+
+
+def _write_sidecar(side: str, payload: dict):
+    tmp = side + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, side)
+    except OSError:
+        # read-only data dir: just run without the sidecar
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
@@ -0,0 +1,111 @@
+import os, socket, time
+from typing import Dict, Iterator, List, Tuple
+
+from .store import _FINISHED_SQL, CheckpointStore
+
+# Task states. A leased task whose lease_until has passed is claimable again.
+TODO, LEASED, DONE, FAILED = "todo", "leased", "done", "failed"
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue(CheckpointStore):
+    """
+    Checkpoint store plus a `tasks` table shared by any number of worker
+    processes. Workers enqueue the staged input (idempotent), claim batches
+    under an expiring lease, and a task is marked done in the same
+    transaction that writes its result. A crashed worker's tasks become
+    claimable again when its lease runs out.
+    """
+
+    def __init__(self, path: str, fsync: bool = False, lease: float = 300.0):
+        super().__init__(path, fsync=fsync)
+        self.lease = float(lease)
+        self.owner = worker_id()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " seed TEXT NOT NULL, keyword TEXT NOT NULL, pos INTEGER NOT NULL,"
+            " state TEXT NOT NULL, owner TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (seed, keyword))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, pos)")
+
+    def enqueue(self) -> int:
+        """Add staged pairs without a finished result; failed tasks are re-opened. Returns rows touched."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = self._conn.execute(
+                    "INSERT INTO tasks (seed, keyword, pos, state) SELECT p.seed, p.keyword, p.pos, ? FROM pending p"
+                    " WHERE NOT EXISTS (SELECT 1 FROM results r WHERE r.seed = p.seed AND r.keyword = p.keyword"
+                    " AND r.status IN " + _FINISHED_SQL + ")"
+                    " ON CONFLICT(seed, keyword) DO UPDATE SET state=excluded.state WHERE tasks.state = ?",
+                    (TODO, FAILED),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cur.rowcount
+
+    def claim(self, n: int) -> List[Tuple[int, str, str]]:
+        """Lease up to `n` open tasks (todo, or leased with an expired lease) in input order."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                got = self._conn.execute(
+                    "SELECT pos, seed, keyword FROM tasks"
+                    " WHERE state = ? OR (state = ? AND lease_until < ?) ORDER BY pos LIMIT ?",
+                    (TODO, LEASED, now, int(n)),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE tasks SET state=?, owner=?, lease_until=?, attempts=attempts+1"
+                    " WHERE seed=? AND keyword=?",
+                    [(LEASED, self.owner, now + self.lease, seed, kw) for _, seed, kw in got],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return got
+
+    def iter_claims(self, batch: int = 20, poll: float = 2.0) -> Iterator[Tuple[int, str, str]]:
+        """
+        Claim and yield (pos, seed, keyword) batch by batch. When nothing is
+        open but other leases are live, wait for them: they either finish or
+        expire and are taken over here.
+        """
+        while True:
+            got = self.claim(batch)
+            if got:
+                yield from got
+                continue
+            if not self.states().get(LEASED):
+                return
+            time.sleep(poll)
+
+    def _apply(self, rows: List[tuple], errors: List[tuple]) -> None:
+        super()._apply(rows, errors)
+        done = [(DONE, r[0], r[1]) for r in rows] + [(FAILED, e[0], e[1]) for e in errors]
+        self._conn.executemany("UPDATE tasks SET state=?, owner=NULL, lease_until=NULL WHERE seed=? AND keyword=?", done)
+        # every commit extends the worker's remaining leases
+        self._conn.execute(
+            "UPDATE tasks SET lease_until=? WHERE state=? AND owner=?",
+            (time.time() + self.lease, LEASED, self.owner),
+        )
+
+    def release(self) -> int:
+        """Hand this worker's unfinished leases back (clean shutdown)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE tasks SET state=?, owner=NULL, lease_until=NULL WHERE state=? AND owner=?",
+                (TODO, LEASED, self.owner),
+            )
+            return cur.rowcount
+
+    def states(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
@@ -0,0 +1,78 @@
+import queue, threading, time
+from typing import Any, Callable, List, Optional
+
+FSYNC_POLICIES = ("off", "batch")
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Items put() by any number of threads are committed in groups by one
+    writer thread: once `max_rows` are buffered or `interval` seconds after
+    the first buffered item, whichever comes first. `commit(items)` must
+    make a group durable as a unit (one write + flush, one transaction);
+    a crash loses at most the group still being buffered. A failed commit
+    is re-raised from the next put() or from close().
+    """
+
+    def __init__(self, commit: Callable[[List[Any]], None], max_rows: int = 100,
+                 interval: float = 1.0, name: str = "group-commit"):
+        self._commit = commit
+        self.max_rows = max(1, int(max_rows))
+        self.interval = max(0.0, float(interval))
+        self.items = 0
+        self.commits = 0
+        self._q: "queue.Queue[Any]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item: Any) -> None:
+        if self._error is not None:
+            raise self._error
+        self._q.put(item)
+
+    def close(self) -> None:
+        """Commit what is buffered and stop the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._q.put(_STOP)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self) -> None:
+        batch: List[Any] = []
+        deadline = 0.0
+        while True:
+            try:
+                item = self._q.get(timeout=max(0.0, deadline - time.monotonic()) if batch else None)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.interval
+                batch.append(item)
+            if len(batch) >= self.max_rows or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+
+    def _flush(self, batch: List[Any]) -> None:
+        if batch and self._error is None:
+            try:
+                self._commit(list(batch))
+                self.items += len(batch)
+                self.commits += 1
+            except BaseException as e:  # surfaced to the producers
+                self._error = e
+        batch.clear()
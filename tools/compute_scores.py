@@ -8,6 +8,7 @@ Compute final keyword scores by merging:
 
 Outputs:
 - CSV: output/keyword_scores_free.csv (UTF-8-SIG)
+  (--format parquet: output/keyword_scores_free.parquet, dtypes kept)
 - XLSX: output/keyword_scores_free.xlsx (with filters & basic styling)
 - (optional) HTML: output/report.html (Top-N table)
 """
@@ -15,13 +16,25 @@ Outputs:
 from __future__ import annotations
 
 import argparse
+import json
 import math
+import os
 import re
+import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, is_parquet, read_table, require_parquet, with_format, write_table  # noqa: E402
+from tools.common.workbook import load_workbook  # noqa: E402
+
 
 # ---------- Helpers (column detection) ----------
 
@@ -124,7 +137,7 @@ def _read_excel_config(xlsx: Path) -> Tuple[float, float, List[Tuple[str, float]
       W_intent, W_competition (renormalized),
       tokens: list of (token, weight) for enabled==True (fallback to all if no 'enabled' col)
     """
-    cfg = pd.read_excel(xlsx, sheet_name="config", engine="openpyxl")
+    cfg = load_workbook(str(xlsx)).parse("config")
     cfg_cols = list(cfg.columns)
 
     # ---- Weights detection ----
@@ -145,9 +158,10 @@ def _read_excel_config(xlsx: Path) -> Tuple[float, float, List[Tuple[str, float]
         kv_key = _detect_col(cfg_cols, ["key", "name", "metric", "k"])
         kv_val = _detect_col(cfg_cols, ["value", "val", "num", "v"])
         if kv_key and kv_val:
-            for _, row in cfg[[kv_key, kv_val]].dropna(subset=[kv_key]).iterrows():
-                k = str(row[kv_key]).strip().lower()
-                v = _coerce_num(row[kv_val])
+            kv = cfg[[kv_key, kv_val]].dropna(subset=[kv_key])
+            for k, v in zip(kv[kv_key].tolist(), kv[kv_val].tolist()):
+                k = str(k).strip().lower()
+                v = _coerce_num(v)
                 if v is None:
                     continue
                 if k == "w_intent":
@@ -157,27 +171,29 @@ def _read_excel_config(xlsx: Path) -> Tuple[float, float, List[Tuple[str, float]
 
     # 3) Literal scan
     if w_int is None or w_cmp is None:
-        for r in range(len(cfg)):
-            for c in range(len(cfg_cols)):
-                val = str(cfg.iloc[r, c]).strip().lower()
-                if val in {"w_intent", "w_competition"}:
-                    # right neighbor
-                    if c + 1 < len(cfg_cols):
-                        v = _coerce_num(cfg.iloc[r, c + 1])
-                        if v is not None:
-                            if val == "w_intent" and w_int is None:
-                                w_int = v
-                            elif val == "w_competition" and w_cmp is None:
-                                w_cmp = v
-                            continue
-                    # below neighbor
-                    if r + 1 < len(cfg):
-                        v = _coerce_num(cfg.iloc[r + 1, c])
-                        if v is not None:
-                            if val == "w_intent" and w_int is None:
-                                w_int = v
-                            elif val == "w_competition" and w_cmp is None:
-                                w_cmp = v
+        # normalize the whole sheet once; visit only the label cells (row-major)
+        vals = cfg.where(cfg.notna(), "").astype(str)
+        norm = vals.apply(lambda col: col.str.strip().str.lower()).to_numpy(dtype=object).reshape(cfg.shape)
+        label_cells = np.argwhere((norm == "w_intent") | (norm == "w_competition"))
+        for r, c in label_cells:
+            val = norm[r, c]
+            # right neighbor
+            if c + 1 < len(cfg_cols):
+                v = _coerce_num(cfg.iat[r, c + 1])
+                if v is not None:
+                    if val == "w_intent" and w_int is None:
+                        w_int = v
+                    elif val == "w_competition" and w_cmp is None:
+                        w_cmp = v
+                    continue
+            # below neighbor
+            if r + 1 < len(cfg):
+                v = _coerce_num(cfg.iat[r + 1, c])
+                if v is not None:
+                    if val == "w_intent" and w_int is None:
+                        w_int = v
+                    elif val == "w_competition" and w_cmp is None:
+                        w_cmp = v
 
     # Defaults & renormalize
     if w_int is None or w_cmp is None:
@@ -223,6 +239,44 @@ def _compute_intent_proxy(text: str, tokens: List[Tuple[str, float]]) -> float:
     return s
 
 
+def intent_dot(hits: Sequence[np.ndarray], weights: Sequence[float], n_rows: int) -> np.ndarray:
+    """
+    Sparse matrix-vector product of a keyword×token hit matrix (one row-index
+    array per token) with token weights. Accumulates in token order, so each
+    row's sum equals the per-row loop in _compute_intent_proxy bit for bit.
+    """
+    acc = np.zeros(n_rows, dtype=float)
+    for rows, w in zip(hits, weights):
+        acc[rows] += w
+    return acc
+
+
+class IntentMatcher:
+    """
+    Batch form of _compute_intent_proxy: enabled tokens are lower-cased once
+    and matched against a whole keyword column, checking each distinct
+    keyword once.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, float]]):
+        self.tokens = [str(t).lower() for t, _ in tokens]
+        self.weights = [float(w) for _, w in tokens]
+
+    def hits(self, texts: Sequence[object]) -> List[np.ndarray]:
+        """Keyword×token incidence, column-wise: sorted row indices per token."""
+        lowered = np.asarray([str(x).lower() for x in texts], dtype=object)
+        codes, uniq = pd.factorize(lowered)
+        out = []
+        for tok in self.tokens:
+            u = np.fromiter((tok in s for s in uniq), dtype=bool, count=len(uniq))
+            out.append(np.flatnonzero(u[codes]))
+        return out
+
+    def score(self, texts: Sequence[object]) -> np.ndarray:
+        """Weighted intent_proxy for every row of `texts`."""
+        return intent_dot(self.hits(texts), self.weights, len(texts))
+
+
 # ---------- Load base with fallback ----------
 
 def _load_base(expanded_in: Optional[Path], sanitized_in: Optional[Path]) -> Tuple[pd.DataFrame, Path, str, Optional[str]]:
@@ -230,15 +284,22 @@ def _load_base(expanded_in: Optional[Path], sanitized_in: Optional[Path]) -> Tup
     Returns: (base_df, src_used, keyword_col, seed_col or None)
     Tries expanded first, then sanitized; applies robust keyword/seed detection.
     """
-    tried_info: List[Tuple[Path, List[str]]] = []
-    for src in (expanded_in, sanitized_in):
-        if src and src.exists():
-            df = pd.read_csv(src, encoding="utf-8-sig")
-            kw_col = _guess_keyword_col(df)
-            if kw_col:
-                seed_col = _guess_seed_col(df)
-                return df, src, kw_col, seed_col
-            tried_info.append((src, list(df.columns)))
+    return _pick_base(
+        (src, lambda src=src: read_table(src))
+        for src in (expanded_in, sanitized_in) if src and src.exists()
+    )
+
+
+def _pick_base(candidates) -> Tuple[pd.DataFrame, object, str, Optional[str]]:
+    """First (label, loader) candidate whose frame has a keyword column."""
+    tried_info: List[Tuple[object, List[str]]] = []
+    for src, load in candidates:
+        df = load()
+        kw_col = _guess_keyword_col(df)
+        if kw_col:
+            seed_col = _guess_seed_col(df)
+            return df, src, kw_col, seed_col
+        tried_info.append((src, list(df.columns)))
     lines = ["ERROR: Could not detect a keyword column in base CSVs.", "Tried sources:"]
     for src, cols in tried_info:
         lines.append(f" - {src}: columns={cols}")
@@ -276,29 +337,75 @@ def _dedupe(df: pd.DataFrame) -> pd.DataFrame:
     return df.drop_duplicates(subset=keys, keep="first").reset_index(drop=True)
 
 
-# ---------- Pipeline ----------
+# ---------- Re-score cache ----------
+# Sidecar .npz with everything scoring needs after the merge: the text
+# columns, competition vectors and the keyword×token hit matrix (CSC:
+# token_ptr/hit_rows). Weight edits in the config then only need
+# intent_dot + min-max instead of re-reading CSVs and re-matching.
 
-def compute_scores(
-    excel_in: Path,
-    sanitized_in: Optional[Path],
-    expanded_in: Optional[Path],
-    competition_in: Optional[Path],
-    out_csv: Path,
-    out_xlsx: Optional[Path],
-    html_out: Optional[Path],
-    topn: int,
+RESCORE_CACHE_VERSION = 1
+_TEXT_COLS = ("seed", "keyword", "keyword_sanitized")
+_COMP_COLS = ("comp_coupang", "comp_naver", "comp_combined")
+
+
+def _file_sig(p: Path) -> str:
+    if not p.exists():
+        return ""
+    st = p.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def save_rescore_cache(
+    path: Path,
+    merged: pd.DataFrame,
+    tokens: List[str],
+    hits: List[np.ndarray],
+    sources: Dict[str, str],
 ) -> None:
-    print("[INFO] Reading Excel config:", excel_in)
-    w_int, w_cmp, tokens = _read_excel_config(excel_in)
-    print(f"[OK] Weights: W_intent={w_int:.4f}, W_competition={w_cmp:.4f}")
-    print(f"[OK] Tokens: {len(tokens)} loaded")
+    arrays: Dict[str, np.ndarray] = {"version": np.array(RESCORE_CACHE_VERSION)}
+    for c in _TEXT_COLS:
+        na = merged[c].isna().to_numpy(dtype=bool)
+        arrays[c] = np.array([("" if m else str(v)) for v, m in zip(merged[c], na)], dtype=str)
+        arrays[c + "_na"] = na
+    for c in _COMP_COLS:
+        if c in merged.columns:
+            arrays[c] = merged[c].to_numpy(dtype=float)
+    arrays["tokens"] = np.array(tokens, dtype=str)
+    arrays["token_ptr"] = np.cumsum([0] + [len(h) for h in hits]).astype(np.int64)
+    arrays["hit_rows"] = np.concatenate(hits).astype(np.int64) if hits else np.zeros(0, dtype=np.int64)
+    arrays["sources"] = np.array(json.dumps(sources, ensure_ascii=False))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def load_rescore_cache(path: Path) -> Tuple[pd.DataFrame, List[str], List[np.ndarray], Dict[str, str]]:
+    """Returns (merged frame, tokens, per-token hit rows, {source: signature})."""
+    if not path.exists():
+        raise SystemExit(f"ERROR: re-score cache not found: {path} (run once with --rescore-cache)")
+    with np.load(path, allow_pickle=False) as z:
+        if int(z["version"]) != RESCORE_CACHE_VERSION:
+            raise SystemExit(f"ERROR: unsupported re-score cache version in {path}; rebuild it.")
+        merged = pd.DataFrame()
+        for c in _TEXT_COLS:
+            merged[c] = pd.Series(z[c].tolist(), dtype=object).mask(z[c + "_na"])
+        for c in _COMP_COLS:
+            if c in z.files:
+                merged[c] = z[c]
+        tokens = z["tokens"].tolist()
+        ptr, rows = z["token_ptr"], z["hit_rows"]
+        hits = [rows[ptr[j]:ptr[j + 1]] for j in range(len(tokens))]
+        sources = json.loads(str(z["sources"]))
+    return merged, tokens, hits, sources
 
-    # Load base with fallback (expanded → sanitized)
-    base_df, src_used, kw_col, seed_col = _load_base(expanded_in, sanitized_in)
-    print(f"[INFO] Loaded base rows: {len(base_df)} from {src_used}")
-    print(f"[INFO] Detected columns → keyword: '{kw_col}' | seed: '{seed_col or 'None'}'")
 
-    # -------- Build base (copy; no rename collisions) --------
+# ---------- Pipeline ----------
+
+def _base_frame(base_df: pd.DataFrame, kw_col: str, seed_col: Optional[str]) -> pd.DataFrame:
+    """seed / keyword / keyword_sanitized columns (copy; no rename collisions)."""
     base = pd.DataFrame()
     if seed_col and seed_col in base_df.columns:
         base["seed"] = base_df[seed_col].map(_canon_seed_str)
@@ -314,65 +421,68 @@ def compute_scores(
         base["keyword_sanitized"] = ks
     else:
         base["keyword_sanitized"] = base["keyword"]
-
-    # -------- Load competition (optional, very robust) --------
-    comp = None
-    if competition_in and competition_in.exists():
-        comp = pd.read_csv(competition_in, encoding="utf-8-sig")
-        # Drop unnamed indexy columns
-        comp = comp.loc[:, [c for c in comp.columns if not str(c).lower().startswith("unnamed")]]
-
-        # Try to detect columns
-        comp_seed = _detect_col(comp.columns, ["seed", "seed_index", "parent", "root", "seed_name"])
-        comp_kw = _detect_col(comp.columns, [
-            "keyword", "term", "query",
-            "expanded_keyword", "expansion", "expanded",
-            "child", "variant", "kw", "text", "title", "source",
-            "연관키워드", "추천어", "확장키워드", "확장_키워드",
-        ]) or _detect_col_fuzzy(comp.columns, ["keyword", "query", "term", "title", "expand", "source", "연관", "추천", "확장"])
-
-        c_coup = _detect_col(comp.columns, ["comp_coupang", "coupang", "comp_cp"])
-        c_nav = _detect_col(comp.columns, ["comp_naver", "naver", "comp_nv"])
-        c_comb = _detect_col(comp.columns, ["comp_combined", "combined", "score_comp"])
-
-        # If keyword col still unknown, try heuristic pick
-        if not comp_kw:
-            comp_kw = _guess_keyword_col(comp)
-
-        # Normalize column names where found
-        cols_map: Dict[str, str] = {}
-        if comp_seed:
-            cols_map[comp_seed] = "seed"
-        if comp_kw:
-            cols_map[comp_kw] = "keyword"
-        if c_coup:
-            cols_map[c_coup] = "comp_coupang"
-        if c_nav:
-            cols_map[c_nav] = "comp_naver"
-        if c_comb:
-            cols_map[c_comb] = "comp_combined"
-        if cols_map:
-            comp = comp.rename(columns=cols_map)
-
-        if "keyword" not in comp.columns:
-            print("[WARN] competition file has no recognizable keyword column; skipping merge.")
-            comp = None
-        else:
-            # ---- Canonicalize dtypes before merge ----
-            comp["keyword"] = comp["keyword"].astype(str)
-            if "seed" in comp.columns:
-                comp["seed"] = comp["seed"].map(_canon_seed_str)
-
-            # derive combined if missing
-            if "comp_combined" not in comp.columns or comp["comp_combined"].isna().all():
-                cc = pd.to_numeric(comp.get("comp_coupang", pd.Series([None] * len(comp))), errors="coerce").fillna(0)
-                nn = pd.to_numeric(comp.get("comp_naver", pd.Series([None] * len(comp))), errors="coerce").fillna(0)
-                comp["comp_combined"] = (cc.add(1).apply(math.log) + nn.add(1).apply(math.log))
-
-            # select only existing target columns
-            select_cols = [c for c in ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined"] if c in comp.columns]
-            comp = comp[select_cols]
-
+    return base
+
+
+def _drop_unnamed(comp: pd.DataFrame) -> pd.DataFrame:
+    # Drop unnamed indexy columns
+    return comp.loc[:, [c for c in comp.columns if not str(c).lower().startswith("unnamed")]]
+
+
+def _comp_columns(comp: pd.DataFrame) -> Dict[str, str]:
+    """Map detected competition columns to seed/keyword/comp_* names."""
+    # Try to detect columns
+    comp_seed = _detect_col(comp.columns, ["seed", "seed_index", "parent", "root", "seed_name"])
+    comp_kw = _detect_col(comp.columns, [
+        "keyword", "term", "query",
+        "expanded_keyword", "expansion", "expanded",
+        "child", "variant", "kw", "text", "title", "source",
+        "연관키워드", "추천어", "확장키워드", "확장_키워드",
+    ]) or _detect_col_fuzzy(comp.columns, ["keyword", "query", "term", "title", "expand", "source", "연관", "추천", "확장"])
+
+    c_coup = _detect_col(comp.columns, ["comp_coupang", "coupang", "comp_cp"])
+    c_nav = _detect_col(comp.columns, ["comp_naver", "naver", "comp_nv"])
+    c_comb = _detect_col(comp.columns, ["comp_combined", "combined", "score_comp"])
+
+    # If keyword col still unknown, try heuristic pick
+    if not comp_kw:
+        comp_kw = _guess_keyword_col(comp)
+
+    # Normalize column names where found
+    cols_map: Dict[str, str] = {}
+    if comp_seed:
+        cols_map[comp_seed] = "seed"
+    if comp_kw:
+        cols_map[comp_kw] = "keyword"
+    if c_coup:
+        cols_map[c_coup] = "comp_coupang"
+    if c_nav:
+        cols_map[c_nav] = "comp_naver"
+    if c_comb:
+        cols_map[c_comb] = "comp_combined"
+    return cols_map
+
+
+def _prepare_comp(comp: pd.DataFrame, derive_combined: bool) -> pd.DataFrame:
+    """Canonicalize renamed competition rows; derive comp_combined when asked."""
+    # ---- Canonicalize dtypes before merge ----
+    comp["keyword"] = comp["keyword"].astype(str)
+    if "seed" in comp.columns:
+        comp["seed"] = comp["seed"].map(_canon_seed_str)
+
+    # derive combined if missing
+    if derive_combined:
+        cc = pd.to_numeric(comp.get("comp_coupang", pd.Series([None] * len(comp))), errors="coerce").fillna(0)
+        nn = pd.to_numeric(comp.get("comp_naver", pd.Series([None] * len(comp))), errors="coerce").fillna(0)
+        comp["comp_combined"] = (cc.add(1).apply(math.log) + nn.add(1).apply(math.log))
+
+    # select only existing target columns
+    select_cols = [c for c in ["seed", "keyword", "comp_coupang", "comp_naver", "comp_combined"] if c in comp.columns]
+    return comp[select_cols]
+
+
+def _merge_comp(base: pd.DataFrame, comp: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Left-join competition onto base and fill NaNs to avoid NaN scores."""
     # -------- Merge base + competition --------
     if comp is not None and "seed" in comp.columns and "seed" in base.columns:
         merged = pd.merge(base, comp, on=["seed", "keyword"], how="left")
@@ -390,11 +500,52 @@ def compute_scores(
         merged["comp_combined"] = pd.to_numeric(merged["comp_combined"], errors="coerce").fillna(0.0)
     else:
         merged["comp_combined"] = 0.0
+    return merged
+
+
+def _build_merged(
+    sanitized_in: Optional[Path],
+    expanded_in: Optional[Path],
+    competition_in: Optional[Path],
+) -> pd.DataFrame:
+    """Base keywords left-joined with competition metrics (NaNs filled)."""
+    # Load base with fallback (expanded → sanitized)
+    base_df, src_used, kw_col, seed_col = _load_base(expanded_in, sanitized_in)
+    comp = read_table(competition_in) if competition_in and competition_in.exists() else None
+    return _merge_frames(base_df, src_used, kw_col, seed_col, comp)
+
+
+def _merge_frames(
+    base_df: pd.DataFrame,
+    src_used: object,
+    kw_col: str,
+    seed_col: Optional[str],
+    comp: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    print(f"[INFO] Loaded base rows: {len(base_df)} from {src_used}")
+    print(f"[INFO] Detected columns → keyword: '{kw_col}' | seed: '{seed_col or 'None'}'")
+    base = _base_frame(base_df, kw_col, seed_col)
+
+    # -------- Load competition (optional, very robust) --------
+    if comp is not None:
+        comp = _drop_unnamed(comp)
+        cols_map = _comp_columns(comp)
+        if cols_map:
+            comp = comp.rename(columns=cols_map)
+
+        if "keyword" not in comp.columns:
+            print("[WARN] competition file has no recognizable keyword column; skipping merge.")
+            comp = None
+        else:
+            derive = "comp_combined" not in comp.columns or comp["comp_combined"].isna().all()
+            comp = _prepare_comp(comp, derive)
+
+    return _merge_comp(base, comp)
 
-    # -------- Intent proxy & normalizations --------
-    print("[INFO] Computing intent proxies...")
-    merged["intent_proxy"] = merged["keyword_sanitized"].astype(str).apply(lambda x: _compute_intent_proxy(x, tokens))
 
+def _score_frame(merged: pd.DataFrame, intent: np.ndarray, w_int: float, w_cmp: float) -> pd.DataFrame:
+    """Normalize, score, dedupe and sort; returns the output frame."""
+    merged["intent_proxy"] = intent
     merged["intent_norm"] = _minmax(merged["intent_proxy"])
     merged["competition_norm"] = _minmax(merged["comp_combined"])
     merged["score"] = 100.0 * (w_int * merged["intent_norm"] + w_cmp * (1.0 - merged["competition_norm"]))
@@ -420,10 +571,24 @@ def compute_scores(
         ["seed" if "seed" in out_df.columns else "score", "score"],
         ascending=[True, False] if "seed" in out_df.columns else [False]
     )
+    return out_df
 
-    out_csv.parent.mkdir(parents=True, exist_ok=True)
-    out_df.to_csv(out_csv, index=False, encoding="utf-8-sig")
-    print("[OK] Saved CSV:", out_csv)
+
+def _write_outputs(
+    out_df: pd.DataFrame,
+    out_csv: Optional[Path],
+    out_xlsx: Optional[Path],
+    html_out: Optional[Path],
+    topn: int,
+    w_int: float,
+    w_cmp: float,
+    fmt: str = "csv",
+) -> None:
+    if out_csv:
+        out_path = with_format(out_csv, fmt)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        write_table(out_df, out_path, fmt)
+        print(f"[OK] Saved {'Parquet' if fmt == 'parquet' else 'CSV'}:", out_path)
 
     if out_xlsx:
         out_xlsx.parent.mkdir(parents=True, exist_ok=True)
@@ -453,20 +618,405 @@ def compute_scores(
         print("[OK] Saved HTML:", html_out)
 
 
+def compute_scores(
+    excel_in: Path,
+    sanitized_in: Optional[Path],
+    expanded_in: Optional[Path],
+    competition_in: Optional[Path],
+    out_csv: Path,
+    out_xlsx: Optional[Path],
+    html_out: Optional[Path],
+    topn: int,
+    rescore_cache: Optional[Path] = None,
+    fmt: str = "csv",
+) -> None:
+    print("[INFO] Reading Excel config:", excel_in)
+    w_int, w_cmp, tokens = _read_excel_config(excel_in)
+    print(f"[OK] Weights: W_intent={w_int:.4f}, W_competition={w_cmp:.4f}")
+    print(f"[OK] Tokens: {len(tokens)} loaded")
+
+    merged = _build_merged(sanitized_in, expanded_in, competition_in)
+
+    # -------- Intent proxy & normalizations --------
+    print("[INFO] Computing intent proxies...")
+    matcher = IntentMatcher(tokens)
+    hits = matcher.hits(merged["keyword_sanitized"].astype(str).tolist())
+    intent = intent_dot(hits, matcher.weights, len(merged))
+    if rescore_cache:
+        sources = {str(p): _file_sig(p) for p in (sanitized_in, expanded_in, competition_in) if p}
+        save_rescore_cache(rescore_cache, merged, matcher.tokens, hits, sources)
+        print("[OK] Saved re-score cache:", rescore_cache)
+
+    out_df = _score_frame(merged, intent, w_int, w_cmp)
+    _write_outputs(out_df, out_csv, out_xlsx, html_out, topn, w_int, w_cmp, fmt)
+
+
+def compute_scores_frames(
+    excel_in: Path,
+    expanded_df: Optional[pd.DataFrame],
+    sanitized_df: Optional[pd.DataFrame] = None,
+    competition_df: Optional[pd.DataFrame] = None,
+    out_csv: Optional[Path] = None,
+    out_xlsx: Optional[Path] = None,
+    html_out: Optional[Path] = None,
+    topn: int = 50,
+    fmt: str = "csv",
+) -> pd.DataFrame:
+    """
+    compute_scores() on in-memory stage frames (expanded preferred, then
+    sanitized). Returns the scores frame; outputs are written only when
+    their paths are given.
+    """
+    print("[INFO] Reading Excel config:", excel_in)
+    w_int, w_cmp, tokens = _read_excel_config(excel_in)
+    print(f"[OK] Weights: W_intent={w_int:.4f}, W_competition={w_cmp:.4f}")
+    print(f"[OK] Tokens: {len(tokens)} loaded")
+
+    candidates = [(name, lambda df=df: df) for name, df in
+                  (("expanded frame", expanded_df), ("sanitized frame", sanitized_df))
+                  if df is not None and not df.empty]
+    merged = _merge_frames(*_pick_base(candidates), competition_df)
+
+    print("[INFO] Computing intent proxies...")
+    intent = IntentMatcher(tokens).score(merged["keyword_sanitized"].astype(str).tolist())
+    out_df = _score_frame(merged, intent, w_int, w_cmp)
+    _write_outputs(out_df, out_csv, out_xlsx, html_out, topn, w_int, w_cmp, fmt)
+    return out_df
+
+
+def rescore(
+    excel_in: Path,
+    rescore_cache: Path,
+    out_csv: Path,
+    out_xlsx: Optional[Path],
+    html_out: Optional[Path],
+    topn: int,
+    fmt: str = "csv",
+) -> None:
+    """
+    Re-score from a cache written by compute_scores(rescore_cache=...):
+    only the Excel config is re-read; tokens not yet in the cache are
+    matched once and added to it.
+    """
+    t0 = time.perf_counter()
+    print("[INFO] Reading Excel config:", excel_in)
+    w_int, w_cmp, tokens = _read_excel_config(excel_in)
+    print(f"[OK] Weights: W_intent={w_int:.4f}, W_competition={w_cmp:.4f}")
+    print(f"[OK] Tokens: {len(tokens)} loaded")
+
+    merged, cached_tokens, hits, sources = load_rescore_cache(rescore_cache)
+    print(f"[INFO] Loaded re-score cache: {len(merged)} rows, {len(cached_tokens)} tokens")
+    for src, sig in sources.items():
+        if _file_sig(Path(src)) != sig:
+            print(f"[WARN] {src} changed since the cache was built; run a full compute_scores to refresh it.")
+
+    matcher = IntentMatcher(tokens)
+    col_of = {t: j for j, t in enumerate(cached_tokens)}
+    new_tokens = [t for t in dict.fromkeys(matcher.tokens) if t not in col_of]
+    if new_tokens:
+        print(f"[INFO] Matching {len(new_tokens)} new token(s)")
+        texts = merged["keyword_sanitized"].astype(str).tolist()
+        new_hits = IntentMatcher([(t, 0.0) for t in new_tokens]).hits(texts)
+        for t, h in zip(new_tokens, new_hits):
+            col_of[t] = len(cached_tokens)
+            cached_tokens.append(t)
+            hits.append(h)
+        save_rescore_cache(rescore_cache, merged, cached_tokens, hits, sources)
+
+    intent = intent_dot([hits[col_of[t]] for t in matcher.tokens], matcher.weights, len(merged))
+    out_df = _score_frame(merged, intent, w_int, w_cmp)
+    print(f"[OK] Re-scored {len(merged)} rows in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    _write_outputs(out_df, out_csv, out_xlsx, html_out, topn, w_int, w_cmp, fmt)
+
+
+# ---------- Streaming mode ----------
+# Bounded-memory variant for very large keyword sets (--chunksize N). CSVs
+# are read N rows at a time; competition rows live in a temporary SQLite
+# file and are looked up per chunk; pass 1 scores intent, tracks the global
+# min/max and dedupes on insert; pass 2 normalizes chunk by chunk and the
+# final (seed, score desc) order comes from SQLite's on-disk sort. CSV and
+# HTML match the in-memory path; XLSX is skipped.
+
+_OUT_BASE = ["seed", "keyword", "keyword_sanitized"]
+_OUT_TAIL = ["comp_combined", "intent_proxy", "intent_norm", "competition_norm", "score"]
+_METRICS = ["comp_coupang", "comp_naver", "comp_combined"]
+
+
+def _nkeys(*cols: pd.Series) -> List[str]:
+    """
+    NaN-safe text keys over one or more columns (pandas merges/dedupes treat
+    NaN == NaN, SQL NULLs do not).
+    """
+    parts = [
+        ["\x00" if m else "\x01" + str(v) for v, m in zip(c.tolist(), c.isna().tolist())]
+        for c in cols
+    ]
+    return ["\x1f".join(p) for p in zip(*parts)]
+
+
+def _records(df: pd.DataFrame) -> List[list]:
+    """Rows as Python lists with NaN → None, ready for sqlite3."""
+    return df.astype(object).where(df.notna(), None).to_numpy().tolist()
+
+
+def _detect_base_stream(
+    expanded_in: Optional[Path], sanitized_in: Optional[Path], chunksize: int
+) -> Tuple[Path, str, Optional[str]]:
+    """Same source/column choice as _load_base, from the first chunk only."""
+    tried_info: List[Tuple[Path, List[str]]] = []
+    for src in (expanded_in, sanitized_in):
+        if src and src.exists():
+            df = pd.read_csv(src, encoding="utf-8-sig", nrows=max(50, chunksize))
+            kw_col = _guess_keyword_col(df)
+            if kw_col:
+                return src, kw_col, _guess_seed_col(df)
+            tried_info.append((src, list(df.columns)))
+    lines = ["ERROR: Could not detect a keyword column in base CSVs.", "Tried sources:"]
+    for src, cols in tried_info:
+        lines.append(f" - {src}: columns={cols}")
+    raise SystemExit("\n".join(lines))
+
+
+def _load_comp_stream(conn, competition_in: Optional[Path], chunksize: int) -> Optional[List[str]]:
+    """Load competition rows into table `comp`; returns its columns (None = no merge)."""
+    if not (competition_in and competition_in.exists()):
+        return None
+    reader = lambda: pd.read_csv(competition_in, encoding="utf-8-sig", chunksize=chunksize)  # noqa: E731
+    first = _drop_unnamed(next(iter(reader()), pd.DataFrame()))
+    cols_map = _comp_columns(first)
+    if "keyword" not in set(cols_map.values()) | set(first.columns):
+        print("[WARN] competition file has no recognizable keyword column; skipping merge.")
+        return None
+
+    # comp_combined is derived when absent or entirely empty (a whole-file property)
+    comb_src = next((c for c, v in cols_map.items() if v == "comp_combined"), None)
+    if comb_src is None and "comp_combined" in first.columns:
+        comb_src = "comp_combined"
+    derive = True
+    if comb_src is not None:
+        for ch in pd.read_csv(competition_in, encoding="utf-8-sig", usecols=[comb_src], chunksize=chunksize):
+            if ch[comb_src].notna().any():
+                derive = False
+                break
+
+    cols: Optional[List[str]] = None
+    for ch in reader():
+        ch = _drop_unnamed(ch)
+        if cols_map:
+            ch = ch.rename(columns=cols_map)
+        ch = _prepare_comp(ch, derive)
+        if cols is None:
+            cols = list(ch.columns)
+            conn.execute(f"CREATE TABLE comp (kkey TEXT, {', '.join(cols)})")
+            conn.execute("CREATE INDEX comp_kkey ON comp (kkey)")
+        rows = [[k] + r for k, r in zip(_comp_keys(ch), _records(ch))]
+        conn.executemany(f"INSERT INTO comp VALUES ({', '.join('?' * (len(cols) + 1))})", rows)
+    return cols
+
+
+def _comp_keys(df: pd.DataFrame, use_seed: bool = True) -> List[str]:
+    # join key: (seed, keyword) when competition has seeds, else keyword
+    if use_seed and "seed" in df.columns:
+        return _nkeys(df["seed"], df["keyword"])
+    return _nkeys(df["keyword"])
+
+
+def _comp_for(conn, cols: List[str], base: pd.DataFrame) -> pd.DataFrame:
+    """Competition rows matching any base row's join key, in file order."""
+    conn.execute("DELETE FROM want")
+    keys = _comp_keys(base, use_seed="seed" in cols)
+    conn.executemany("INSERT OR IGNORE INTO want VALUES (?)", ((k,) for k in keys))
+    cur = conn.execute(
+        f"SELECT {', '.join(cols)} FROM comp WHERE kkey IN (SELECT kkey FROM want) ORDER BY rowid"
+    )
+    return pd.DataFrame.from_records(cur.fetchall(), columns=cols)
+
+
+def compute_scores_streaming(
+    excel_in: Path,
+    sanitized_in: Optional[Path],
+    expanded_in: Optional[Path],
+    competition_in: Optional[Path],
+    out_csv: Path,
+    out_xlsx: Optional[Path],
+    html_out: Optional[Path],
+    topn: int,
+    chunksize: int,
+) -> None:
+    import sqlite3
+    import tempfile
+
+    print("[INFO] Reading Excel config:", excel_in)
+    w_int, w_cmp, tokens = _read_excel_config(excel_in)
+    print(f"[OK] Weights: W_intent={w_int:.4f}, W_competition={w_cmp:.4f}")
+    print(f"[OK] Tokens: {len(tokens)} loaded")
+    matcher = IntentMatcher(tokens)
+
+    src_used, kw_col, seed_col = _detect_base_stream(expanded_in, sanitized_in, chunksize)
+    print(f"[INFO] Streaming base rows from {src_used} (chunks of {chunksize})")
+    print(f"[INFO] Detected columns → keyword: '{kw_col}' | seed: '{seed_col or 'None'}'")
+
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=out_csv.parent, prefix=".scores_") as tmp:
+        conn = sqlite3.connect(str(Path(tmp) / "work.sqlite"))
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=FILE")
+        conn.execute("CREATE TEMP TABLE want (kkey TEXT PRIMARY KEY)")
+        comp_cols = _load_comp_stream(conn, competition_in, chunksize)
+
+        # ---- Pass 1: merge, intent, global min/max, dedupe ----
+        cols: Optional[List[str]] = None
+        lo = {"intent_proxy": math.nan, "comp_combined": math.nan}
+        hi = dict(lo)
+        int_metric: Dict[str, bool] = {}
+        n_rows = 0
+        text_cols = [kw_col] + (["keyword_sanitized"] if kw_col != "keyword_sanitized" else [])
+        for chunk in pd.read_csv(src_used, encoding="utf-8-sig", chunksize=chunksize,
+                                 dtype={c: str for c in text_cols}):
+            base = _base_frame(chunk, kw_col, seed_col)
+            comp = _comp_for(conn, comp_cols, base) if comp_cols else None
+            merged = _merge_comp(base, comp)
+            merged["intent_proxy"] = matcher.score(merged["keyword_sanitized"].astype(str).tolist())
+            for c in lo:
+                lo[c] = min(lo[c], merged[c].min()) if not math.isnan(lo[c]) else merged[c].min()
+                hi[c] = max(hi[c], merged[c].max()) if not math.isnan(hi[c]) else merged[c].max()
+            for c in _METRICS:
+                if c in merged.columns:
+                    int_metric[c] = int_metric.get(c, True) and pd.api.types.is_integer_dtype(merged[c])
+            if cols is None:
+                cols = _OUT_BASE + [c for c in _METRICS if c in merged.columns and c != "comp_combined"] + ["comp_combined", "intent_proxy"]
+                conn.execute(f"CREATE TABLE rows (pos INTEGER PRIMARY KEY, dkey TEXT UNIQUE, {', '.join(cols)})")
+            dkeys = _nkeys(merged["seed"], merged["keyword"])
+            conn.executemany(
+                f"INSERT OR IGNORE INTO rows VALUES ({', '.join('?' * (len(cols) + 2))})",
+                ([n_rows + i, k] + r for i, (k, r) in enumerate(zip(dkeys, _records(merged[cols])))),
+            )
+            n_rows += len(merged)
+        if cols is None:
+            raise SystemExit(f"ERROR: no rows in {src_used}")
+        n_out = conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+        print(f"[INFO] Pass 1: {n_rows} rows scanned, {n_out} after dedupe")
+
+        # ---- Pass 2: normalize + score chunk by chunk ----
+        def _norm(v: pd.Series, c: str) -> pd.Series:
+            rng = hi[c] - lo[c]
+            if pd.isna(lo[c]) or pd.isna(hi[c]) or rng == 0:
+                return pd.Series([0.0] * len(v), index=v.index, dtype=float)
+            return (v - lo[c]) / rng
+
+        out_cols = cols[:-2] + _OUT_TAIL
+        conn.execute(f"CREATE TABLE scored (pos INTEGER PRIMARY KEY, {', '.join(out_cols)})")
+        last = -1
+        while True:
+            recs = conn.execute(
+                f"SELECT pos, {', '.join(cols)} FROM rows WHERE pos > ? ORDER BY pos LIMIT ?", (last, chunksize)
+            ).fetchall()
+            if not recs:
+                break
+            last = recs[-1][0]
+            df = pd.DataFrame.from_records(recs, columns=["pos"] + cols)
+            for c in ("intent_proxy", "comp_combined"):
+                df[c] = df[c].astype(float)
+            df["intent_norm"] = _norm(df["intent_proxy"], "intent_proxy")
+            df["competition_norm"] = _norm(df["comp_combined"], "comp_combined")
+            df["score"] = 100.0 * (w_int * df["intent_norm"] + w_cmp * (1.0 - df["competition_norm"]))
+            conn.executemany(
+                f"INSERT INTO scored VALUES ({', '.join('?' * (len(out_cols) + 1))})",
+                _records(df[["pos"] + out_cols]),
+            )
+
+        # ---- Output: SQLite sorts on disk, rows stream to the CSV ----
+        cur = conn.execute(f"SELECT {', '.join(out_cols)} FROM scored ORDER BY seed IS NULL, seed, score DESC, pos")
+        top_parts: List[pd.DataFrame] = []
+        n_top = int(max(1, topn))
+        first = True
+        while True:
+            recs = cur.fetchmany(chunksize)
+            if not recs and not first:
+                break
+            part = pd.DataFrame.from_records(recs, columns=out_cols)
+            for c in out_cols:
+                if c in int_metric:
+                    part[c] = part[c].astype("int64" if int_metric[c] else float)
+                elif c in _OUT_TAIL:
+                    part[c] = part[c].astype(float)
+                else:
+                    part[c] = part[c].where(part[c].notna(), np.nan)
+            part.to_csv(out_csv, index=False, mode="w" if first else "a", header=first,
+                        encoding="utf-8-sig" if first else "utf-8")
+            if sum(len(p) for p in top_parts) < n_top:
+                top_parts.append(part.head(n_top))
+            first = False
+            if not recs:
+                break
+        conn.close()
+    print("[OK] Saved CSV:", out_csv)
+
+    if out_xlsx:
+        print("[WARN] --out-xlsx is skipped with --chunksize (XLSX is built in memory).")
+    if html_out:
+        top_df = pd.concat(top_parts, ignore_index=True).head(n_top)
+        _write_outputs(top_df, None, None, html_out, topn, w_int, w_cmp)
+
+
 # ---------- CLI ----------
 
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--excel-in", type=Path, required=True, help="Excel file with 'seeds' and 'config' sheets")
-    ap.add_argument("--sanitized-in", type=Path, help="CSV of sanitized keywords")
-    ap.add_argument("--expanded-in", type=Path, help="CSV of expanded keywords (preferred)")
-    ap.add_argument("--competition-in", type=Path, help="CSV of competition counts (optional)")
+    ap.add_argument("--sanitized-in", type=Path, help="CSV/Parquet of sanitized keywords")
+    ap.add_argument("--expanded-in", type=Path, help="CSV/Parquet of expanded keywords (preferred)")
+    ap.add_argument("--competition-in", type=Path, help="CSV/Parquet of competition counts (optional)")
     ap.add_argument("--out-csv", type=Path, required=True, help="Output CSV path")
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="Scores artifact format; parquet (needs pyarrow) writes --out-csv with a .parquet suffix")
     ap.add_argument("--out-xlsx", type=Path, help="Output XLSX path")
     ap.add_argument("--html-out", type=Path, help="Optional HTML report path")
     ap.add_argument("--topn", type=int, default=50, help="Top-N rows for HTML report")
+    ap.add_argument("--rescore-cache", type=Path,
+                    help="Sidecar .npz (hit matrix + competition vector) to write, or to read with --rescore")
+    ap.add_argument("--rescore", action="store_true",
+                    help="Re-score from --rescore-cache after config edits (skips CSV loading and matching)")
+    ap.add_argument("--chunksize", type=int, default=0,
+                    help="Stream inputs N rows at a time with bounded memory (0 = load everything; XLSX is skipped)")
     args = ap.parse_args()
 
+    if args.chunksize and (args.rescore or args.rescore_cache):
+        ap.error("--chunksize cannot be combined with --rescore/--rescore-cache")
+    inputs = (args.sanitized_in, args.expanded_in, args.competition_in)
+    if args.chunksize and (args.format == "parquet" or any(p and is_parquet(p) for p in inputs)):
+        ap.error("--chunksize streams CSV only; drop it for Parquet artifacts")
+    if args.format == "parquet":
+        require_parquet()
+    if args.chunksize:
+        compute_scores_streaming(
+            excel_in=args.excel_in,
+            sanitized_in=args.sanitized_in,
+            expanded_in=args.expanded_in,
+            competition_in=args.competition_in,
+            out_csv=args.out_csv,
+            out_xlsx=args.out_xlsx,
+            html_out=args.html_out,
+            topn=args.topn,
+            chunksize=args.chunksize,
+        )
+        return 0
+
+    if args.rescore:
+        if not args.rescore_cache:
+            ap.error("--rescore requires --rescore-cache")
+        rescore(
+            excel_in=args.excel_in,
+            rescore_cache=args.rescore_cache,
+            out_csv=args.out_csv,
+            out_xlsx=args.out_xlsx,
+            html_out=args.html_out,
+            topn=args.topn,
+            fmt=args.format,
+        )
+        return 0
+
     compute_scores(
         excel_in=args.excel_in,
         sanitized_in=args.sanitized_in,
@@ -476,6 +1026,8 @@ def main() -> int:
         out_xlsx=args.out_xlsx,
         html_out=args.html_out,
         topn=args.topn,
+        rescore_cache=args.rescore_cache,
+        fmt=args.format,
     )
     return 0
 
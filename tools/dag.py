@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# tools/dag.py
+"""
+Incremental stage runner with a content-hash stage cache.
+
+The pipeline is declared in build_stages():
+
+  collect : src/keyword_scoring_free_only.py
+            inputs: 'seeds' sheet, prohibited JSON, prohibited blocks of 'config'
+  score   : tools/compute_scores.py
+            inputs: scoring config (weights/tokens), collect artifacts
+  verify  : tools/verify_outputs.py
+            inputs: collect artifacts, score outputs
+
+A stage is skipped when its input hashes, the hash of its command line and
+the hashes of its outputs all match its last successful run (recorded in
+output/.dag_state.json). Inputs are hashed by content, Excel inputs by the
+parsed values the stage actually uses, so editing only the weights re-runs
+score (and verify) but not the scrape.
+
+When collect re-runs and score is selected, both run in this interpreter
+through tools/pipeline.py (frames handed over in memory, artifacts still
+written so they can be hashed). A stage running on its own, e.g. score after
+a weights edit, runs as its script in a subprocess.
+
+Usage:
+  python tools/dag.py --in data/seeds.xlsx --expand 2 --sleep 0.6 --site-mode naver
+  python tools/dag.py ... --dry-run                 # show what would run and why
+  python tools/dag.py ... --force collect           # re-run a stage regardless
+  python tools/dag.py ... --stages collect,score    # run a subset
+  python tools/dag.py ... --collect-args "--pipelined --expand-workers 4"
+  python tools/dag.py ... --format parquet         # Parquet artifacts for every stage
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, require_parquet, with_format  # noqa: E402
+from tools.common.workbook import load_workbook  # noqa: E402
+
+STATE_VERSION = 1
+
+
+# ---------- Hashing ----------
+
+def _digest(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _json_digest(obj) -> str:
+    return _digest(json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str))
+
+
+def file_hash(path) -> str:
+    p = Path(path)
+    if not p.exists():
+        return "missing"
+    h = hashlib.sha256()
+    with open(p, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def sheet_hash(xlsx, sheet: str) -> str:
+    """Cell values of one sheet (other sheets of the workbook don't count)."""
+    df = load_workbook(str(xlsx)).parse(sheet, header=None, dtype=str)
+    return _digest(df.to_csv(index=False, header=False))
+
+
+def prohibited_config_hash(xlsx) -> str:
+    from src.keyword_scoring_free_only import parse_prohibited_from_config
+    return _json_digest(parse_prohibited_from_config(str(xlsx)))
+
+
+def scoring_config_hash(xlsx) -> str:
+    from tools.compute_scores import _read_excel_config
+    return _json_digest(_read_excel_config(Path(xlsx)))
+
+
+# ---------- Stages ----------
+
+class Stage:
+    """
+    One pipeline step: a script + arguments, named input hashers, the files
+    it writes and the stages it reads from.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        cmd: List[str],
+        inputs: Dict[str, Callable[[], str]],
+        outputs: Sequence[Path],
+        deps: Sequence[str] = (),
+    ):
+        self.name = name
+        self.cmd = [str(c) for c in cmd]
+        self.inputs = inputs
+        self.outputs = [Path(p) for p in outputs]
+        self.deps = list(deps)
+
+    def input_hashes(self) -> Dict[str, str]:
+        out = {}
+        for label, fn in self.inputs.items():
+            try:
+                out[label] = fn()
+            except Exception as e:  # let the stage itself report the problem
+                out[label] = f"unreadable: {e}"
+        return out
+
+    def param_hash(self) -> str:
+        return _json_digest(self.cmd)
+
+    def output_hashes(self) -> Dict[str, str]:
+        return {str(p): file_hash(p) for p in self.outputs}
+
+
+def _paths(args) -> Dict[str, Path]:
+    out, fmt = args.out_dir, args.format
+    return {
+        "sanitized": with_format(out / "sanitized_keywords.csv", fmt),
+        "expanded": with_format(out / "expanded_keywords.csv", fmt),
+        "competition": with_format(out / "competition_counts.csv", fmt),
+        "scores_csv": with_format(out / "keyword_scores_free.csv", fmt),
+        "scores_xlsx": out / "keyword_scores_free.xlsx",
+        "html": out / "report.html",
+    }
+
+
+def build_stages(args) -> List[Stage]:
+    xlsx = args.in_path
+    fmt = args.format
+    # every stage gets the same --format, so artifact paths agree end to end
+    # (csv keeps the original command lines and with them the recorded state)
+    fmt_args = ["--format", fmt] if fmt != "csv" else []
+    paths = _paths(args)
+    sanitized, expanded, competition = paths["sanitized"], paths["expanded"], paths["competition"]
+    scores_csv, scores_xlsx, html = paths["scores_csv"], paths["scores_xlsx"], paths["html"]
+    artifacts = {"sanitized": sanitized, "expanded": expanded, "competition": competition}
+
+    collect = Stage(
+        "collect",
+        ["src/keyword_scoring_free_only.py",
+         "--in", xlsx,
+         "--prohibited-json", args.prohibited_json,
+         "--expand", args.expand, "--sleep", args.sleep, "--site-mode", args.site_mode,
+         "--sanitized-out", sanitized, "--expanded-out", expanded, "--competition-out", competition,
+         ] + fmt_args + shlex.split(args.collect_args),
+        inputs={
+            "seeds": lambda: sheet_hash(xlsx, "seeds"),
+            "prohibited_json": lambda: file_hash(args.prohibited_json),
+            "prohibited_config": lambda: prohibited_config_hash(xlsx),
+        },
+        outputs=list(artifacts.values()),
+    )
+    score = Stage(
+        "score",
+        ["tools/compute_scores.py",
+         "--excel-in", xlsx,
+         "--sanitized-in", sanitized, "--expanded-in", expanded, "--competition-in", competition,
+         "--out-csv", scores_csv, "--out-xlsx", scores_xlsx,
+         "--topn", args.topn, "--html-out", html,
+         ] + fmt_args + shlex.split(args.score_args),
+        inputs=dict(
+            {"scoring_config": lambda: scoring_config_hash(xlsx)},
+            **{name: (lambda p=p: file_hash(p)) for name, p in artifacts.items()},
+        ),
+        outputs=[scores_csv, scores_xlsx, html],
+        deps=["collect"],
+    )
+    verify_in = dict(artifacts, scores_csv=scores_csv, scores_xlsx=scores_xlsx, html=html)
+    verify = Stage(
+        "verify",
+        ["tools/verify_outputs.py",
+         "--sanitized", sanitized, "--expanded", expanded, "--competition", competition,
+         "--scores-csv", scores_csv, "--scores-xlsx", scores_xlsx, "--html", html] + fmt_args,
+        inputs={name: (lambda p=p: file_hash(p)) for name, p in verify_in.items()},
+        outputs=[Path("output/_verify_report.md")],
+        deps=["collect", "score"],
+    )
+    return [collect, score, verify]
+
+
+def build_fused(args, stages: List[Stage]) -> Dict[Tuple[str, ...], Callable[[], None]]:
+    """
+    Stage groups that run together in this interpreter when the first one
+    re-runs: collect + score through tools/pipeline.py. The Pipeline gets
+    collect's own command line, so both paths use the same options.
+    """
+    if args.score_args.strip():
+        return {}  # --rescore/--chunksize etc. exist only on the compute_scores.py CLI
+    collect = next(st for st in stages if st.name == "collect")
+    paths = _paths(args)
+
+    def collect_and_score():
+        from src.keyword_scoring_free_only import build_parser
+        from tools.pipeline import Pipeline
+
+        options = vars(build_parser().parse_args(collect.cmd[1:]))
+        pipe = Pipeline(options.pop("in_path"), **options)
+        # artifacts are still written: score/verify hash them
+        pipe.run(out_csv=paths["scores_csv"], out_xlsx=paths["scores_xlsx"], html_out=paths["html"],
+                 topn=args.topn, fmt=args.format, write_artifacts=True)
+
+    return {("collect", "score"): collect_and_score}
+
+
+# ---------- State ----------
+
+def load_state(path: Path) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if saved.get("version") != STATE_VERSION:
+        return {}
+    return saved.get("stages", {})
+
+
+def save_state(path: Path, stages: Dict[str, dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "stages": stages}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _stale_reason(st: Stage, prev: Optional[dict], inputs: Dict[str, str]) -> Optional[str]:
+    if not prev:
+        return "no previous run"
+    if prev.get("params") != st.param_hash():
+        return "parameters changed"
+    changed = [k for k, v in inputs.items() if prev.get("inputs", {}).get(k) != v]
+    if changed:
+        return "inputs changed: " + ", ".join(changed)
+    if prev.get("outputs") != st.output_hashes():
+        return "outputs missing or modified"
+    return None
+
+
+# ---------- Runner ----------
+
+def _record(state: Dict[str, dict], st: Stage, inputs: Dict[str, str], seconds: float):
+    state[st.name] = {
+        "inputs": inputs,
+        "params": st.param_hash(),
+        "outputs": st.output_hashes(),
+        "seconds": round(seconds, 2),
+        "finished_at": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run(
+    stages: List[Stage],
+    state_path: Path,
+    selected: Optional[Sequence[str]] = None,
+    force: Sequence[str] = (),
+    dry_run: bool = False,
+    fused: Optional[Dict[Tuple[str, ...], Callable[[], None]]] = None,
+) -> int:
+    state = load_state(state_path)
+    rerun = set()
+    done = set()
+    t0 = time.perf_counter()
+    for st in stages:
+        if (selected and st.name not in selected) or st.name in done:
+            continue
+        inputs = st.input_hashes()
+        if st.name in force or "all" in force:
+            reason = "forced"
+        elif dry_run and rerun.intersection(st.deps):
+            reason = "upstream stage re-runs"
+        else:
+            reason = _stale_reason(st, state.get(st.name), inputs)
+        if reason is None:
+            print(f"[SKIP] {st.name}: up to date")
+            continue
+
+        rerun.add(st.name)
+        # a re-run stage makes its dependents dirty: run a fused group in-process
+        group = next((g for g in fused or {} if g[0] == st.name and all(not selected or n in selected for n in g)), None)
+        if group:
+            print(f"[RUN] {'+'.join(group)} ({reason}): in-process via tools/pipeline.py")
+            rerun.update(group)
+            done.update(group)
+            if dry_run:
+                continue
+            started = time.perf_counter()
+            try:
+                fused[group]()
+            except (Exception, SystemExit) as e:
+                for name in group:
+                    state.pop(name, None)
+                save_state(state_path, state)
+                print(f"[ERR] stages '{'+'.join(group)}' failed: {e}", file=sys.stderr)
+                return 1
+            seconds = time.perf_counter() - started
+            for member in (m for m in stages if m.name in group):
+                _record(state, member, inputs if member is st else member.input_hashes(), seconds)
+            save_state(state_path, state)
+            print(f"[OK] {'+'.join(group)} done in {seconds:.1f}s")
+            continue
+
+        cmd = [sys.executable, "-u", str(ROOT_DIR / st.cmd[0])] + st.cmd[1:]
+        print(f"[RUN] {st.name} ({reason}): {' '.join(shlex.quote(c) for c in st.cmd)}")
+        if dry_run:
+            continue
+        started = time.perf_counter()
+        rc = subprocess.call(cmd)
+        if rc != 0:
+            state.pop(st.name, None)
+            save_state(state_path, state)
+            print(f"[ERR] stage '{st.name}' failed (exit={rc})", file=sys.stderr)
+            return rc
+        _record(state, st, inputs, time.perf_counter() - started)
+        save_state(state_path, state)
+        print(f"[OK] {st.name} done in {state[st.name]['seconds']:.1f}s")
+    verb = "would run" if dry_run else "ran"
+    print(f"[OK] DAG finished in {time.perf_counter() - t0:.1f}s ({verb}: {', '.join(sorted(rerun)) or 'nothing'})")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="in_path", type=Path, default=Path("data/seeds.xlsx"),
+                    help="Excel file with 'seeds' and 'config' sheets")
+    ap.add_argument("--prohibited-json", type=Path, default=Path("config/prohibited_words_ko.json"))
+    ap.add_argument("--out-dir", type=Path, default=Path("output"), help="Directory for artifacts and scores")
+    ap.add_argument("--expand", type=int, default=20)
+    ap.add_argument("--sleep", type=float, default=0.7)
+    ap.add_argument("--site-mode", choices=["both", "coupang", "naver"], default="both")
+    ap.add_argument("--topn", type=int, default=50)
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="Artifact format passed to every stage (parquet needs pyarrow)")
+    ap.add_argument("--collect-args", default="", help="Extra keyword_scoring_free_only.py arguments")
+    ap.add_argument("--score-args", default="", help="Extra compute_scores.py arguments")
+    ap.add_argument("--stages", default="", help="Comma-separated subset of stages to consider (default: all)")
+    ap.add_argument("--force", action="append", default=[], help="Re-run this stage even if up to date (repeatable; 'all')")
+    ap.add_argument("--dry-run", action="store_true", help="Only print which stages would run and why")
+    ap.add_argument("--state", type=Path, default=Path("output/.dag_state.json"))
+    args = ap.parse_args()
+    for opt in ("collect_args", "score_args"):
+        if "--format" in (a.split("=", 1)[0] for a in shlex.split(getattr(args, opt))):
+            ap.error(f"set the artifact format with --format, not inside --{opt.replace('_', '-')}")
+    if args.format == "parquet":
+        require_parquet()
+
+    stages = build_stages(args)
+    names = [st.name for st in stages]
+    selected = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in selected + args.force if s not in names and s != "all"]
+    if unknown:
+        ap.error(f"unknown stage(s): {unknown} (known: {names})")
+    return run(stages, args.state, selected, args.force, args.dry_run, build_fused(args, stages))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,10 +4,45 @@
 Incremental competition fetcher with robust column detection and
 header-compatible append writes.
 
-- Reads expanded/sanitized CSVs and detects keyword/seed columns smartly.
+- Reads expanded/sanitized CSVs (or Parquet) and detects keyword/seed columns smartly.
 - Appends to an existing output CSV using its header if present.
-- Survives interrupts (flush after each row) and resumes by skipping
-  already-processed (seed, keyword) pairs.
+- Survives interrupts and resumes by skipping already-processed
+  (seed, keyword) pairs. Rows are committed in groups (--commit-rows /
+  --commit-interval, tools/common/writer.py), so a crash loses at most the
+  last group; --fsync batch also syncs each group to disk.
+- Every request goes through a shared per-host token bucket
+  (tools/common/ratelimit.py), so politeness waits overlap with network time.
+- Parsed counts are cached on disk per (site, keyword) (tools/common/cache.py);
+  --max-age sets the TTL, --refresh bypasses cached entries.
+- A keyword listed under several seeds is fetched once per run and the
+  result is written to every (seed, keyword) row (tools/common/memo.py).
+- Connections are pooled per host with keep-alive (tools/common/sessions.py).
+- --stream-extract reads search pages in chunks and stops at the first
+  result-count match; BeautifulSoup card counting only runs on pages where
+  every count regex misses.
+- --store keeps results in an SQLite checkpoint table keyed by (seed, keyword)
+  (tools/common/store.py): resume is an indexed anti-join of the staged
+  input, and --out is re-exported from the store at the end of the run.
+  An existing CSV journal is imported the first time.
+- --queue turns the store into a work queue shared by any number of
+  fetcher processes (tools/common/workqueue.py): each claims keyword
+  batches under an expiring lease and marks them done in the transaction
+  that writes their results; a crashed worker's lease just runs out.
+- --retry-failed refetches only rows with missing counts and keywords
+  logged in logs/errors.csv (only those in this run's input and --shard),
+  in --retry-rounds passes with an exponential --retry-backoff between
+  them, and updates those rows in place.
+- --shard i/N keeps only the keywords whose normalized form hashes to
+  shard i of N (tools/common/shard.py), so N machines can split one input;
+  tools/merge_competition_shards.py combines their outputs.
+- Per-site circuit breaker (tools/common/health.py): 429/403 answers pause
+  the site at once (honoring Retry-After), a high rolling error rate opens
+  it too; half-open probes close it again and the request rate ramps back
+  up. A paused site is skipped while the other keeps going; retries are
+  not spent on a throttling site.
+- Optional asyncio mode (--async) keeps several requests in flight per host,
+  bounded by --max-per-host and paced by --politeness, while still writing
+  rows in input order.
 
 Usage:
   python tools/fetch_competition_counts.py \
@@ -15,19 +50,48 @@ Usage:
     --sanitized-in output/sanitized_keywords.csv \
     --out output/competition_counts.csv \
     --site-mode both --sleep 0.8 --retries 2 --timeout 12
+
+  # also leave output/competition_counts.parquet for compute_scores
+  python tools/fetch_competition_counts.py ... --format parquet
+
+  # resume from an SQLite checkpoint store (CSV is exported from it)
+  python tools/fetch_competition_counts.py ... --store output/competition_counts.sqlite
+
+  # several worker processes on one box share a lease-based queue
+  python tools/fetch_competition_counts.py ... --queue output/competition_counts.sqlite &
+  python tools/fetch_competition_counts.py ... --queue output/competition_counts.sqlite &
+
+  # later: refetch only failed keywords and rows with empty counts
+  python tools/fetch_competition_counts.py --expanded-in output/expanded_keywords.csv \
+    --out output/competition_counts.csv --retry-failed
+
+  # one of 4 machines (shards 0/4 .. 3/4), then merge the shard outputs
+  python tools/fetch_competition_counts.py ... --shard 0/4 --out output/competition_counts.shard0.csv
+
+  # concurrent: up to 4 in-flight requests per host
+  python tools/fetch_competition_counts.py ... --async --max-per-host 4 --politeness 0.8
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import codecs
+import contextlib
 import csv
 import datetime as _dt
-import random
+import io
+import itertools
+import os
 import re
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
 
 try:
     import requests
@@ -36,6 +100,21 @@ except Exception as e:  # pragma: no cover
     print(f"Missing dependency: requests / beautifulsoup4 ({e})", file=sys.stderr)
     raise
 
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, is_parquet, read_table, require_parquet, with_format, write_table  # noqa: E402
+from tools.common.cache import ResponseCache, parse_max_age  # noqa: E402
+from tools.common.health import configure_health, health_for, health_report  # noqa: E402
+from tools.common.memo import SingleFlight, fetch_once  # noqa: E402
+from tools.common.ratelimit import configure_host, rate_from_delay, throttle  # noqa: E402
+from tools.common.sessions import HostSessions, configure_pool  # noqa: E402
+from tools.common.shard import in_shard, parse_shard  # noqa: E402
+from tools.common.store import STATUS_OK, CheckpointStore, row_status  # noqa: E402
+from tools.common.workqueue import LEASED, WorkQueue  # noqa: E402
+from tools.common.writer import FSYNC_POLICIES, GroupCommitWriter  # noqa: E402
+
 # Target sites
 NAVER_SHOPPING_URL = "https://search.shopping.naver.com/search/all?query={q}"
 NAVER_GENERAL_URL = "https://search.naver.com/search.naver?query={q}"
@@ -65,7 +144,19 @@ def _now_iso_utc() -> str:
     return _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds")
 
 
+def _iter_csv_rows(path: Path) -> Iterator[Dict[str, str]]:
+    if is_parquet(path):
+        yield from _read_csv_rows(path)
+        return
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+
 def _read_csv_rows(path: Path) -> List[Dict[str, str]]:
+    if is_parquet(path):
+        # same string cells csv.DictReader would hand back ("" for missing)
+        df = read_table(path)
+        return df.astype(str).where(df.notna(), "").to_dict(orient="records")
     with open(path, "r", encoding="utf-8-sig", newline="") as f:
         r = csv.DictReader(f)
         return list(r)
@@ -150,22 +241,29 @@ def _guess_seed_col(rows: List[Dict[str, str]]) -> Optional[str]:
     return col
 
 
-def _build_session(ua: Optional[str]) -> requests.Session:
-    s = requests.Session()
-    s.headers.update({"User-Agent": ua or DEFAULT_UA, **EXTRA_HEADERS})
-    s.max_redirects = 5
-    return s
+def _build_session(ua: Optional[str]) -> HostSessions:
+    # pooled keep-alive session per host; these headers go with every request
+    return HostSessions({"User-Agent": ua or DEFAULT_UA, **EXTRA_HEADERS})
 
 
-def _try_request(session: requests.Session, url: str, timeout: float, retries: int, sleep: float) -> Optional[str]:
+def _try_request(session: HostSessions, url: str, timeout: float, retries: int, sleep: float) -> Optional[str]:
+    health = health_for(url)
     for i in range(retries + 1):
+        if not health.allow():
+            return None  # site paused by its circuit breaker
+        if i:
+            time.sleep(sleep * (1.5 ** (i - 1)))  # backoff only between failed attempts
+        throttle(url, rate=rate_from_delay(sleep))
+        t0 = time.monotonic()
         try:
             r = session.get(url, timeout=timeout)
-            if r.status_code == 200 and r.text:
-                return r.text
         except requests.RequestException:
-            pass
-        time.sleep(sleep * (1.5 ** i))
+            health.record(False, time.monotonic() - t0)
+            continue
+        if health.record(r.status_code < 500, time.monotonic() - t0, r.status_code, r.headers.get("Retry-After")):
+            return None  # throttled: further retries would only dig deeper
+        if r.status_code == 200 and r.text:
+            return r.text
     return None
 
 
@@ -179,21 +277,132 @@ def _parse_int(txt: str) -> Optional[int]:
         return None
 
 
-def _naver_comp(session: requests.Session, kw: str, timeout: float, retries: int, sleep: float) -> Optional[int]:
-    import urllib.parse as ul
-    # 1) Naver Shopping
-    url1 = NAVER_SHOPPING_URL.format(q=ul.quote(kw))
-    html = _try_request(session, url1, timeout, retries, sleep)
+# Result-count patterns per page, in priority order
+NAVER_SHOPPING_COUNT_PATTERNS = [
+    r"(?:검색결과|검색 결과)\s*([\d,]+)\s*(?:개|건)",
+    r"\"total\"\s*:\s*([\d]+)",  # inline JSON
+]
+NAVER_GENERAL_COUNT_PATTERNS = [
+    r"약\s*([\d,]+)\s*건",
+    r"([\d,]+)\s*건",  # looser fallback
+]
+COUPANG_COUNT_PATTERNS = [
+    r"(?:검색결과|검색 결과)\s*([\d,]+)\s*개",
+]
+
+STREAM_CHUNK = 16 * 1024
+STREAM_OVERLAP = 256  # chars re-scanned so a match split across chunks is still found
+
+
+def _scan_stream(r: requests.Response, patterns: Sequence[str]) -> Tuple[Optional[int], str]:
+    """
+    Read a streamed body chunk by chunk and stop as soon as the count is
+    settled. Patterns keep their priority order like the full-body path: a
+    lower-priority match is taken only once every pattern before it has a
+    definite answer (its first match did not parse, or EOF without a
+    match). A match touching the end of the data read so far is not trusted
+    until more arrives, so digits split across chunks are not truncated.
+    Returns (count, text_read).
+    """
+    rxs = [re.compile(p) for p in patterns]
+    starts = [0] * len(rxs)  # where each unsettled pattern resumes searching
+    spent = [False] * len(rxs)  # first match seen and it did not parse
+    decoder = codecs.getincrementaldecoder(r.encoding or "utf-8")(errors="replace")
+    text = ""
+
+    def _settle(final: bool) -> Optional[int]:
+        for i, rx in enumerate(rxs):
+            if spent[i]:
+                continue
+            m = rx.search(text, starts[i])
+            if m is not None and (final or m.end() < len(text)):
+                n = _parse_int(m.group(1))
+                if n is not None:
+                    return n
+                spent[i] = True  # only the first match counts, as with re.search on the full body
+            elif not final:
+                # undecided: lower-priority patterns must wait for more data
+                starts[i] = m.start() if m is not None else max(starts[i], len(text) - STREAM_OVERLAP)
+                return None
+        return None
+
+    for chunk in r.iter_content(chunk_size=STREAM_CHUNK):
+        text += decoder.decode(chunk)
+        n = _settle(final=False)
+        if n is not None:
+            return n, text
+    text += decoder.decode(b"", final=True)
+    return _settle(final=True), text
+
+
+def _try_request_scan(
+    session: HostSessions, url: str, patterns: Sequence[str], timeout: float, retries: int, sleep: float
+) -> Tuple[Optional[int], Optional[str]]:
+    """Streaming twin of _try_request: returns (count, None) on an early match or (None, html) to fall back on."""
+    health = health_for(url)
+    for i in range(retries + 1):
+        if not health.allow():
+            return None, None
+        if i:
+            time.sleep(sleep * (1.5 ** (i - 1)))
+        throttle(url, rate=rate_from_delay(sleep))
+        t0 = time.monotonic()
+        answered = False
+        try:
+            with session.get(url, timeout=timeout, stream=True) as r:
+                answered = True
+                if health.record(r.status_code < 500, time.monotonic() - t0, r.status_code,
+                                 r.headers.get("Retry-After")):
+                    return None, None
+                if r.status_code == 200:
+                    n, text = _scan_stream(r, patterns)
+                    if n is not None:
+                        return n, None
+                    if text:
+                        return None, text
+        except requests.RequestException:
+            if not answered:
+                health.record(False, time.monotonic() - t0)
+    return None, None
+
+
+def _fetch_count(
+    session: HostSessions,
+    url: str,
+    patterns: Sequence[str],
+    timeout: float,
+    retries: int,
+    sleep: float,
+    stream: bool,
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Fetch `url` and extract a result count with `patterns`.
+    Returns (count, None) on a match, else (None, html-or-None) so callers
+    can run the soup-based fallback only when the regexes miss.
+    """
+    if stream:
+        return _try_request_scan(session, url, patterns, timeout, retries, sleep)
+    html = _try_request(session, url, timeout, retries, sleep)
     if html:
-        for pat in [
-            r"(?:검색결과|검색 결과)\s*([\d,]+)\s*(?:개|건)",
-            r"\"total\"\s*:\s*([\d]+)",  # inline JSON
-        ]:
+        for pat in patterns:
             m = re.search(pat, html)
             if m:
                 n = _parse_int(m.group(1))
                 if n is not None:
-                    return n
+                    return n, None
+    return None, html
+
+
+def _naver_comp(
+    session: HostSessions, kw: str, timeout: float, retries: int, sleep: float, stream: bool = False
+) -> Optional[int]:
+    import urllib.parse as ul
+    # 1) Naver Shopping
+    url1 = NAVER_SHOPPING_URL.format(q=ul.quote(kw))
+    n, html = _fetch_count(session, url1, NAVER_SHOPPING_COUNT_PATTERNS, timeout, retries, sleep, stream)
+    if n is not None:
+        return n
+    if html:
         try:
             soup = BeautifulSoup(html, "html.parser")
             # card-ish fallback
@@ -205,32 +414,20 @@ def _naver_comp(session: requests.Session, kw: str, timeout: float, retries: int
 
     # 2) General search (약 N건)
     url2 = NAVER_GENERAL_URL.format(q=ul.quote(kw))
-    html = _try_request(session, url2, timeout, retries, sleep)
-    if html:
-        for pat in [
-            r"약\s*([\d,]+)\s*건",
-            r"([\d,]+)\s*건",  # looser fallback
-        ]:
-            m = re.search(pat, html)
-            if m:
-                n = _parse_int(m.group(1))
-                if n is not None:
-                    return n
-    return None
+    n, _ = _fetch_count(session, url2, NAVER_GENERAL_COUNT_PATTERNS, timeout, retries, sleep, stream)
+    return n
 
 
-def _coupang_comp(session: requests.Session, kw: str, timeout: float, retries: int, sleep: float) -> Optional[int]:
+def _coupang_comp(
+    session: HostSessions, kw: str, timeout: float, retries: int, sleep: float, stream: bool = False
+) -> Optional[int]:
     import urllib.parse as ul
     url = COUPANG_URL.format(q=ul.quote(kw))
-    html = _try_request(session, url, timeout, retries, sleep)
+    n, html = _fetch_count(session, url, COUPANG_COUNT_PATTERNS, timeout, retries, sleep, stream)
+    if n is not None:
+        return n
     if not html:
         return None
-
-    m = re.search(r"(?:검색결과|검색 결과)\s*([\d,]+)\s*개", html)
-    if m:
-        n = _parse_int(m.group(1))
-        if n is not None:
-            return n
     try:
         soup = BeautifulSoup(html, "html.parser")
         cards = soup.select("[id*='productList'] li.search-product, li.search-product")
@@ -241,6 +438,44 @@ def _coupang_comp(session: requests.Session, kw: str, timeout: float, retries: i
     return None
 
 
+def _fetch_site(
+    site: str,
+    session: HostSessions,
+    kw: str,
+    timeout: float,
+    retries: int,
+    sleep: float,
+    cache: Optional[ResponseCache] = None,
+    memo: Optional[SingleFlight] = None,
+    stream: bool = False,
+) -> Optional[int]:
+    fetch = _coupang_comp if site == "coupang" else _naver_comp
+    return fetch_once(memo, cache, site, kw, lambda: fetch(session, kw, timeout, retries, sleep, stream))
+
+
+# hosts behind each site (naver falls back from shopping to general search)
+SITE_URLS = {"coupang": (COUPANG_URL,), "naver": (NAVER_SHOPPING_URL, NAVER_GENERAL_URL)}
+
+
+def _sites_paused_for(sites: Sequence[str]) -> float:
+    """Seconds until one of `sites` accepts requests again (0 if one does now)."""
+    return min(health_for(url).paused_for() for site in sites for url in SITE_URLS[site])
+
+
+def _wait_while_paused(sites: Sequence[str]) -> None:
+    """
+    Block while the circuit breaker pauses every requested site. With one
+    site paused the row is fetched from the other (the paused count stays
+    empty for --retry-failed).
+    """
+    pause = _sites_paused_for(sites)
+    if pause > 0:
+        print(f"[WARN] All sites paused by the circuit breaker; resuming in {pause:.0f}s")
+    while pause > 0:
+        time.sleep(pause)
+        pause = _sites_paused_for(sites)
+
+
 def _read_existing_header_and_keys(outp: Path) -> Tuple[Optional[List[str]], Set[Tuple[str, str]]]:
     keys: Set[Tuple[str, str]] = set()
     header: Optional[List[str]] = None
@@ -257,33 +492,44 @@ def _read_existing_header_and_keys(outp: Path) -> Tuple[Optional[List[str]], Set
     return header, keys
 
 
-def _iter_input_rows(
+def _input_pairs(
     expanded: Optional[Path], sanitized: Optional[Path]
-) -> Tuple[List[Tuple[str, str]], Optional[str], Optional[str]]:
+) -> Tuple[Iterator[Tuple[str, str]], Optional[str], Optional[str]]:
+    """Stream (seed, keyword) pairs of the input; columns are guessed from its first 50 rows."""
     src: Optional[Path] = None
     if expanded and expanded.exists():
         src = expanded
     elif sanitized and sanitized.exists():
         src = sanitized
     if not src:
-        return [], None, None
+        return iter(()), None, None
 
-    data = _read_csv_rows(src)
-    if not data:
-        return [], None, None
+    rows = _iter_csv_rows(src)
+    head = [r for _, r in zip(range(50), rows)]
+    if not head:
+        return iter(()), None, None
 
-    seed_col = _guess_seed_col(data)
-    kw_col = _guess_keyword_col(data)
+    seed_col = _guess_seed_col(head)
+    kw_col = _guess_keyword_col(head)
     if not kw_col:
         raise SystemExit("ERROR: Could not locate a keyword column in input CSV.")
 
-    pairs: List[Tuple[str, str]] = []
-    for row in data:
-        seed = (row.get(seed_col) if seed_col else "") or ""
-        kw = (row.get(kw_col) or "").strip()
-        if kw:
-            pairs.append((seed.strip(), kw))
-    return pairs, seed_col, kw_col
+    def _pairs() -> Iterator[Tuple[str, str]]:
+        for src_rows in (head, rows):
+            for row in src_rows:
+                seed = (row.get(seed_col) if seed_col else "") or ""
+                kw = (row.get(kw_col) or "").strip()
+                if kw:
+                    yield seed.strip(), kw
+
+    return _pairs(), seed_col, kw_col
+
+
+def _iter_input_rows(
+    expanded: Optional[Path], sanitized: Optional[Path]
+) -> Tuple[List[Tuple[str, str]], Optional[str], Optional[str]]:
+    pairs, seed_col, kw_col = _input_pairs(expanded, sanitized)
+    return list(pairs), seed_col, kw_col
 
 
 def _choose_output_header(existing: Optional[List[str]]) -> List[str]:
@@ -299,6 +545,7 @@ def _row_dict_for_header(
     kw: str,
     comp_c: Optional[int],
     comp_n: Optional[int],
+    scraped_at: Optional[str] = None,
 ) -> Dict[str, str]:
     row: Dict[str, str] = {h: "" for h in header}
     # seed/keyword
@@ -323,22 +570,165 @@ def _row_dict_for_header(
         row["comp_naver"] = "" if comp_n is None else str(comp_n)
 
     # combined (compute if both present)
-    combined: Optional[float] = None
-    if comp_c is not None or comp_n is not None:
-        import math
-        c = math.log1p(comp_c or 0)
-        n = math.log1p(comp_n or 0)
-        combined = c + n
+    combined = _combined(comp_c, comp_n)
     if "comp_combined" in row and combined is not None:
         row["comp_combined"] = f"{combined:.4f}"
 
     # timestamp
     if "scraped_at" in row:
-        row["scraped_at"] = _now_iso_utc()
+        row["scraped_at"] = scraped_at or _now_iso_utc()
 
     return row
 
 
+def _combined(comp_c: Optional[int], comp_n: Optional[int]) -> Optional[float]:
+    if comp_c is None and comp_n is None:
+        return None
+    import math
+    return math.log1p(comp_c or 0) + math.log1p(comp_n or 0)
+
+
+def export_table(outp: Path, fmt: str) -> Path:
+    """
+    Typed snapshot of the CSV journal for the next stage: counts as nullable
+    integers, comp_combined as float, seed/keyword as strings.
+    """
+    df = pd.read_csv(outp, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    for col in ("comp_coupang", "comp_naver"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    if "comp_combined" in df.columns:
+        df["comp_combined"] = pd.to_numeric(df["comp_combined"], errors="coerce")
+    dst = with_format(outp, fmt)
+    write_table(df, dst, fmt)
+    return dst
+
+
+def _read_existing_header(outp: Path) -> Optional[List[str]]:
+    if not outp.exists():
+        return None
+    with open(outp, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), None) or None
+
+
+def _iter_journal(outp: Path) -> Iterator[Tuple[str, str, Optional[int], Optional[int], Dict[str, str]]]:
+    """(seed, keyword, comp_coupang, comp_naver, row) of a CSV journal, keys as the resume reads them."""
+    with open(outp, "r", encoding="utf-8-sig", newline="") as f:
+        r = csv.DictReader(f)
+        header = r.fieldnames or []
+        seed_col = _detect_col(header, ["seed"])
+        kw_col = _detect_col(header, ["keyword", "term", "query"])
+        for row in r:
+            seed = (row.get(seed_col) if seed_col else "") or ""
+            kw = (row.get(kw_col) if kw_col else row.get("keyword", "")) or ""
+            comp_c = _parse_int(row.get("comp_coupang") or "")
+            comp_n = _parse_int(row.get("comp_naver") or "")
+            yield seed.strip(), kw.strip(), comp_c, comp_n, row
+
+
+def import_csv_journal(store: CheckpointStore, outp: Path, site_mode: str) -> int:
+    """Load an existing CSV journal into the store."""
+    rows = (
+        (seed, kw, comp_c, comp_n, _combined(comp_c, comp_n), row.get("scraped_at") or None,
+         row_status(site_mode, comp_c, comp_n))
+        for seed, kw, comp_c, comp_n, row in _iter_journal(outp)
+    )
+    n = 0
+    while True:
+        chunk = list(itertools.islice(rows, 10000))
+        if not chunk:
+            return n
+        n += store.put_many(chunk)
+
+
+def export_store_csv(store: CheckpointStore, outp: Path, header: List[str]) -> int:
+    """Rewrite `outp` from the store's finished rows (insertion order) under `header`."""
+    tmp = outp.with_name(f"{outp.name}.{os.getpid()}.tmp")  # queue workers may export concurrently
+    n = 0
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        dw = csv.DictWriter(f, fieldnames=header)
+        dw.writeheader()
+        for seed, kw, comp_c, comp_n, scraped_at in store.iter_results():
+            dw.writerow(_row_dict_for_header(header, seed, kw, comp_c, comp_n, scraped_at))
+            n += 1
+    os.replace(tmp, outp)
+    return n
+
+
+ERRORS_CSV = Path("logs/errors.csv")
+ERROR_FIELDS = ["ts", "site", "seed", "keyword", "url", "error"]
+
+
+def _write_rows(f, fieldnames: List[str], rows: List[Dict[str, str]], fsync: bool) -> None:
+    # one write per group, so a crash can only cut the last group
+    buf = io.StringIO()
+    csv.DictWriter(buf, fieldnames=fieldnames).writerows(rows)
+    f.write(buf.getvalue())
+    f.flush()
+    if fsync:
+        os.fsync(f.fileno())
+
+
+class _ResultSink:
+    """
+    Where finished rows go: the CSV journal or the checkpoint store, plus
+    logs/errors.csv for failures (the store also marks them status=error).
+    Workers only enqueue; writer threads commit in groups of `commit_rows`
+    or every `commit_interval` seconds, so at most the last group is lost
+    on a crash (and refetched on resume).
+    """
+
+    def __init__(self, header: List[str], site_mode: str, ef, f=None,
+                 store: Optional[CheckpointStore] = None, commit_rows: int = 100,
+                 commit_interval: float = 1.0, fsync: bool = False):
+        self.header = header
+        self.site_mode = site_mode
+        self.store = store
+        self.fsync = fsync
+        self._f, self._ef = f, ef
+        commit = self._commit_store if store is not None else self._commit_csv
+        self.results = GroupCommitWriter(commit, commit_rows, commit_interval, name="results-writer")
+        self.errors = GroupCommitWriter(self._commit_errors, commit_rows, commit_interval, name="errors-writer")
+
+    def row(self, seed: str, kw: str, comp_c: Optional[int], comp_n: Optional[int]) -> None:
+        if self.store is not None:
+            self.results.put(("row", (seed, kw, comp_c, comp_n, _combined(comp_c, comp_n), _now_iso_utc(),
+                                      row_status(self.site_mode, comp_c, comp_n))))
+        else:
+            self.results.put(_row_dict_for_header(self.header, seed, kw, comp_c, comp_n))
+
+    def error(self, seed: str, kw: str, err: BaseException) -> None:
+        rec = {
+            "ts": _now_iso_utc(),
+            "site": self.site_mode,
+            "seed": seed,
+            "keyword": kw,
+            "url": "-",
+            "error": str(err),
+        }
+        self.errors.put(rec)
+        if self.store is not None:
+            self.results.put(("error", (seed, kw, rec["error"], rec["ts"])))
+
+    def _commit_csv(self, rows: List[Dict[str, str]]) -> None:
+        _write_rows(self._f, self.header, rows, self.fsync)
+
+    def _commit_errors(self, rows: List[Dict[str, str]]) -> None:
+        _write_rows(self._ef, ERROR_FIELDS, rows, self.fsync)
+
+    def _commit_store(self, items: List[tuple]) -> None:
+        self.store.put_many(
+            [x for kind, x in items if kind == "row"],
+            errors=[x for kind, x in items if kind == "error"],
+        )
+
+    def close(self) -> None:
+        try:
+            self.results.close()
+        finally:
+            self.errors.close()
+
+
 def fetch_and_append(
     expanded_in: Optional[Path],
     sanitized_in: Optional[Path],
@@ -348,100 +738,554 @@ def fetch_and_append(
     timeout: float,
     retries: int,
     ua: Optional[str],
+    async_mode: bool = False,
+    max_per_host: int = 4,
+    politeness: Optional[float] = None,
+    burst: float = 1.0,
+    cache: Optional[ResponseCache] = None,
+    pool_size: Optional[int] = None,
+    stream: bool = False,
+    store: Optional[CheckpointStore] = None,
+    commit_rows: int = 100,
+    commit_interval: float = 1.0,
+    fsync: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    queue_batch: int = 20,
 ) -> None:
+    # enough pooled connections per host for every in-flight request
+    configure_pool(pool_size=pool_size or (max(1, int(max_per_host)) if async_mode else 2))
     session = _build_session(ua)
-    existing_header, exist_keys = _read_existing_header_and_keys(outp)
-    to_process, seed_col, kw_col = _iter_input_rows(expanded_in, sanitized_in)
+    memo = SingleFlight()
+    pace = sleep if politeness is None or not async_mode else politeness
+    for url in (COUPANG_URL, NAVER_SHOPPING_URL, NAVER_GENERAL_URL):
+        configure_host(url, rate_from_delay(pace), burst)
+    outp.parent.mkdir(parents=True, exist_ok=True)
+    Path("logs").mkdir(parents=True, exist_ok=True)
+
+    work: Iterable[Tuple[int, str, str]]
+    if store is not None:
+        # resume = anti-join of the staged input against finished store rows
+        existing_header = _read_existing_header(outp)
+        exist_keys: Set[Tuple[str, str]] = set()
+        if not len(store) and outp.exists():
+            print(f"[INFO] Imported {import_csv_journal(store, outp, site_mode)} rows from {outp} into {store.path}")
+        pairs, seed_col, kw_col = _input_pairs(expanded_in, sanitized_in)
+        total, todo = store.stage(p for p in pairs if in_shard(p[1], shard))
+        print(f"[INFO] Store: {total} input rows, {total - todo} already done, {todo} pending")
+        if isinstance(store, WorkQueue):
+            store.enqueue()
+            print(f"[INFO] Queue: {store.states()} (worker {store.owner})")
+            work = store.iter_claims(queue_batch)
+        else:
+            work = store.iter_pending()
+    else:
+        existing_header, exist_keys = _read_existing_header_and_keys(outp)
+        to_process, seed_col, kw_col = _iter_input_rows(expanded_in, sanitized_in)
+        if shard is not None:
+            n_in = len(to_process)
+            to_process = [p for p in to_process if in_shard(p[1], shard)]
+            print(f"[INFO] Shard {shard[0]}/{shard[1]}: {len(to_process)} of {n_in} input rows")
+        total = len(to_process)
+        work = ((idx, seed, kw) for idx, (seed, kw) in enumerate(to_process, start=1))
 
     header = _choose_output_header(existing_header)
     write_header = not outp.exists()
-    outp.parent.mkdir(parents=True, exist_ok=True)
-    Path("logs").mkdir(parents=True, exist_ok=True)
+    sites = [s for s in ("coupang", "naver") if site_mode in ("both", s)]
 
-    total = len(to_process)
     done = 0
     skipped = 0
     started_at = time.time()
 
-    with open(outp, "a", encoding="utf-8-sig", newline="") as f, \
-         open(Path("logs/errors.csv"), "a", encoding="utf-8-sig", newline="") as ef:
-        dw = csv.DictWriter(f, fieldnames=header)
-        ew = csv.DictWriter(ef, fieldnames=["ts", "site", "seed", "keyword", "url", "error"])
-        if write_header:
-            dw.writeheader()
-            ew.writeheader()
-
-        for idx, (seed, kw) in enumerate(to_process, start=1):
-            key = (seed, kw)
-            if key in exist_keys:
-                skipped += 1
-                continue
-
-            comp_c: Optional[int] = None
-            comp_n: Optional[int] = None
-
+    with contextlib.ExitStack() as stack:
+        ef = stack.enter_context(open(ERRORS_CSV, "a", encoding="utf-8-sig", newline=""))
+        ew = csv.DictWriter(ef, fieldnames=ERROR_FIELDS)
+        f = None
+        if store is not None:
+            if ef.tell() == 0:
+                ew.writeheader()
+            stack.callback(_export_if_changed, store, outp, header)
+            if isinstance(store, WorkQueue):
+                stack.callback(_release_leases, store)
+        else:
+            f = stack.enter_context(open(outp, "a", encoding="utf-8-sig", newline=""))
+            if write_header:
+                csv.DictWriter(f, fieldnames=header).writeheader()
+                ew.writeheader()
+        # closed (last group committed) before the files and the export
+        sink = _ResultSink(header, site_mode, ef, f=f, store=store, commit_rows=commit_rows,
+                           commit_interval=commit_interval, fsync=fsync)
+        stack.callback(sink.close)
+
+        if async_mode:
             try:
-                if site_mode in ("both", "coupang"):
-                    comp_c = _coupang_comp(session, kw, timeout, retries, sleep)
-                    time.sleep(sleep + random.random() * 0.2)
-                if site_mode in ("both", "naver"):
-                    comp_n = _naver_comp(session, kw, timeout, retries, sleep)
-                    time.sleep(sleep + random.random() * 0.2)
-
-                dw.writerow(_row_dict_for_header(header, seed, kw, comp_c, comp_n))
-                f.flush()
+                asyncio.run(_fetch_all_async(
+                    work, total, exist_keys, sink,
+                    site_mode=site_mode,
+                    sleep=sleep,
+                    timeout=timeout,
+                    retries=retries,
+                    session=session,
+                    max_per_host=max_per_host,
+                    cache=cache,
+                    memo=memo,
+                    stream=stream,
+                ))
+            except KeyboardInterrupt:
+                print("\nKeyboardInterrupt received. Partial results kept. Re-run to resume.")
+        else:
+            for idx, seed, kw in work:
+                key = (seed, kw)
+                if key in exist_keys:
+                    skipped += 1
+                    continue
+
+                comp_c: Optional[int] = None
+                comp_n: Optional[int] = None
+
+                try:
+                    _wait_while_paused(sites)
+                    if site_mode in ("both", "coupang"):
+                        comp_c = _fetch_site("coupang", session, kw, timeout, retries, sleep, cache, memo, stream)
+                    if site_mode in ("both", "naver"):
+                        comp_n = _fetch_site("naver", session, kw, timeout, retries, sleep, cache, memo, stream)
+                except KeyboardInterrupt:
+                    print("\nKeyboardInterrupt received. Partial results kept. Re-run to resume.")
+                    break
+                except Exception as e:
+                    sink.error(seed, kw, e)
+                    continue
+
+                # a failed commit surfaces here and stops the run
+                sink.row(seed, kw, comp_c, comp_n)
                 done += 1
 
                 if idx % 10 == 0:
                     elapsed = time.time() - started_at
                     print(f"[{idx}/{total}] done={done} skipped={skipped} elapsed={elapsed:.1f}s")
 
-            except KeyboardInterrupt:
-                print("\nKeyboardInterrupt received. Partial results kept. Re-run to resume.")
-                break
-            except Exception as e:
-                ts = _now_iso_utc()
-                site = "both" if site_mode == "both" else site_mode
-                ew.writerow({
-                    "ts": ts,
-                    "site": site,
-                    "seed": seed,
-                    "keyword": kw,
-                    "url": "-",
-                    "error": str(e),
-                })
-                ef.flush()
-                # continue to next
-
+    print(f"Distinct fetches: {memo.fetched} of {memo.calls} lookups")
     print(f"All done. Output: {str(outp)}")
 
 
+def _export_if_changed(store: CheckpointStore, outp: Path, header: List[str]) -> None:
+    if store.changes or not outp.exists():
+        print(f"[OK] Exported {export_store_csv(store, outp, header)} rows from {store.path} to {outp}")
+
+
+def _release_leases(q: WorkQueue) -> None:
+    n = q.release()
+    if n:
+        print(f"[INFO] Released {n} unfinished lease(s) back to the queue")
+    leased = q.states().get(LEASED, 0)
+    if leased:
+        print(f"[INFO] {leased} task(s) still leased by other workers")
+
+
+# -------- Retry mode --------
+
+RETRY_FIELDS = ("comp_coupang", "comp_naver", "comp_combined", "scraped_at")
+Target = Tuple[str, str, Optional[int], Optional[int]]  # seed, keyword, comp_coupang, comp_naver
+
+
+def _logged_error_keys(site_mode: str) -> Dict[Tuple[str, str], None]:
+    """(seed, keyword) keys of logs/errors.csv rows from a run that asked for a site `site_mode` wants."""
+    keys: Dict[Tuple[str, str], None] = {}
+    if not ERRORS_CSV.exists():
+        return keys
+    with open(ERRORS_CSV, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("ts") == "ts":  # header repeated by earlier appends
+                continue
+            site = (row.get("site") or "").strip()
+            if site_mode != "both" and site not in ("both", site_mode):
+                continue
+            key = ((row.get("seed") or "").strip(), (row.get("keyword") or "").strip())
+            if key[1]:
+                keys[key] = None
+    return keys
+
+
+def _retry_targets(
+    outp: Path,
+    store: Optional[CheckpointStore],
+    site_mode: str,
+    input_pairs: Iterable[Tuple[str, str]] = (),
+    shard: Optional[Tuple[int, int]] = None,
+) -> List[Target]:
+    """
+    Rows to refetch: journal/store rows missing a count `site_mode` asks for
+    (counts already present are kept), then logs/errors.csv keys that have
+    no complete row. The error log is shared by every run, so a logged key
+    is only taken when it is in this run's input (`input_pairs`); with
+    `shard` set, only keys of that shard are kept.
+    """
+    targets: Dict[Tuple[str, str], Target] = {}
+    complete: Set[Tuple[str, str]] = set()
+    if store is not None:
+        for seed, kw, comp_c, comp_n in store.iter_incomplete(site_mode):
+            targets[(seed, kw)] = (seed, kw, comp_c, comp_n)
+    elif outp.exists():
+        for seed, kw, comp_c, comp_n, _ in _iter_journal(outp):
+            if row_status(site_mode, comp_c, comp_n) == STATUS_OK:
+                complete.add((seed, kw))
+            else:
+                targets.setdefault((seed, kw), (seed, kw, comp_c, comp_n))
+    logged = _logged_error_keys(site_mode)
+    for key in input_pairs:
+        if key not in logged or key in targets or key in complete:
+            continue
+        if store is not None and store.status_of(*key) is not None:
+            continue  # in the store and not incomplete
+        targets[key] = (key[0], key[1], None, None)
+    return [t for key, t in targets.items() if key not in complete and in_shard(key[1], shard)]
+
+
+def _rewrite_journal(
+    outp: Path, header: List[str], fixed: Dict[Tuple[str, str], Tuple[Optional[int], Optional[int]]]
+) -> None:
+    """Rewrite the CSV journal with refetched counts in place; keys it lacks are appended."""
+    left = dict(fixed)
+    tmp = outp.with_name(outp.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        dw = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
+        dw.writeheader()
+        if outp.exists():
+            for seed, kw, _, _, row in _iter_journal(outp):
+                if (seed, kw) in fixed:
+                    left.pop((seed, kw), None)
+                    fresh = _row_dict_for_header(header, seed, kw, *fixed[(seed, kw)])
+                    row.update({col: fresh[col] for col in RETRY_FIELDS if col in fresh})
+                dw.writerow(row)
+        for (seed, kw), (comp_c, comp_n) in left.items():
+            dw.writerow(_row_dict_for_header(header, seed, kw, comp_c, comp_n))
+    os.replace(tmp, outp)
+
+
+def retry_failed(
+    outp: Path,
+    site_mode: str,
+    sleep: float,
+    timeout: float,
+    retries: int,
+    ua: Optional[str],
+    cache: Optional[ResponseCache] = None,
+    store: Optional[CheckpointStore] = None,
+    rounds: int = 3,
+    backoff: float = 60.0,
+    pool_size: Optional[int] = None,
+    stream: bool = False,
+    commit_rows: int = 100,
+    commit_interval: float = 1.0,
+    fsync: bool = False,
+    expanded_in: Optional[Path] = None,
+    sanitized_in: Optional[Path] = None,
+    shard: Optional[Tuple[int, int]] = None,
+) -> None:
+    """
+    Refetch only the failed/incomplete rows, in up to `rounds` passes.
+    Pass k > 1 starts after backoff * 2**(k-2) seconds and retries what is
+    still incomplete; only the missing site of a row is fetched again.
+    Keywords that only appear in logs/errors.csv are retried when the input
+    (expanded_in/sanitized_in) lists them.
+    """
+    configure_pool(pool_size=pool_size or 2)
+    session = _build_session(ua)
+    for url in (COUPANG_URL, NAVER_SHOPPING_URL, NAVER_GENERAL_URL):
+        configure_host(url, rate_from_delay(sleep), 1.0)
+    Path("logs").mkdir(parents=True, exist_ok=True)
+    if store is not None and not len(store) and outp.exists():
+        print(f"[INFO] Imported {import_csv_journal(store, outp, site_mode)} rows from {outp} into {store.path}")
+
+    pairs, _, _ = _input_pairs(expanded_in, sanitized_in)
+    targets = _retry_targets(outp, store, site_mode, pairs, shard)
+    print(f"[INFO] Retry queue: {len(targets)} rows (missing counts or logged errors)")
+    if not targets:
+        return
+    header = _choose_output_header(_read_existing_header(outp))
+    sites = [s for s in ("coupang", "naver") if site_mode in ("both", s)]
+    fixed: Dict[Tuple[str, str], Tuple[Optional[int], Optional[int]]] = {}
+
+    with open(ERRORS_CSV, "a", encoding="utf-8-sig", newline="") as ef:
+        if ef.tell() == 0:
+            csv.DictWriter(ef, fieldnames=ERROR_FIELDS).writeheader()
+        sink = _ResultSink(header, site_mode, ef, store=store, commit_rows=commit_rows,
+                           commit_interval=commit_interval, fsync=fsync)
+        try:
+            for rnd in range(1, max(1, int(rounds)) + 1):
+                if rnd > 1:
+                    wait = backoff * 2 ** (rnd - 2)
+                    print(f"[INFO] Retry round {rnd}: {len(targets)} rows left, waiting {wait:.0f}s")
+                    time.sleep(wait)
+                memo = SingleFlight()  # a None from the previous round must not be reused
+                left: List[Target] = []
+                for seed, kw, comp_c, comp_n in targets:
+                    try:
+                        _wait_while_paused(sites)
+                        if site_mode in ("both", "coupang") and comp_c is None:
+                            comp_c = _fetch_site("coupang", session, kw, timeout, retries, sleep, cache, memo, stream)
+                        if site_mode in ("both", "naver") and comp_n is None:
+                            comp_n = _fetch_site("naver", session, kw, timeout, retries, sleep, cache, memo, stream)
+                    except Exception as e:
+                        sink.error(seed, kw, e)
+                        left.append((seed, kw, comp_c, comp_n))
+                        continue
+                    if store is not None:
+                        sink.row(seed, kw, comp_c, comp_n)
+                    else:
+                        fixed[(seed, kw)] = (comp_c, comp_n)
+                    if row_status(site_mode, comp_c, comp_n) != STATUS_OK:
+                        left.append((seed, kw, comp_c, comp_n))
+                if store is None and fixed:
+                    _rewrite_journal(outp, header, fixed)
+                print(f"[OK] Retry round {rnd}: {len(targets) - len(left)} of {len(targets)} rows complete")
+                targets = left
+                if not targets:
+                    break
+        except KeyboardInterrupt:
+            print("\nKeyboardInterrupt received. Rows retried so far are kept.")
+            if store is None and fixed:
+                _rewrite_journal(outp, header, fixed)
+        finally:
+            sink.close()
+    if store is not None:
+        _export_if_changed(store, outp, header)
+    if targets:
+        print(f"[WARN] {len(targets)} rows still incomplete; re-run --retry-failed later")
+
+
+# -------- Async mode --------
+
+
+async def _fetch_all_async(
+    work: Iterable[Tuple[int, str, str]],
+    total: int,
+    exist_keys: Set[Tuple[str, str]],
+    sink: _ResultSink,
+    site_mode: str,
+    sleep: float,
+    timeout: float,
+    retries: int,
+    session: HostSessions,
+    max_per_host: int,
+    cache: Optional[ResponseCache] = None,
+    memo: Optional[SingleFlight] = None,
+    stream: bool = False,
+) -> None:
+    """
+    Fetch pending keywords with up to `max_per_host` requests in flight per
+    site. Blocking fetches run on a thread pool sharing the pooled per-host
+    sessions; pacing comes from the shared per-host token buckets in _try_request.
+    Results are awaited in input order, so rows are written in the same
+    order as the sequential mode and resume-by-key keeps working.
+    """
+    max_per_host = max(1, int(max_per_host))
+    sites = [s for s in ("coupang", "naver") if site_mode in ("both", s)]
+    gates = {s: asyncio.Semaphore(max_per_host) for s in sites}
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_per_host * max(1, len(sites)))
+
+    def _call(site: str, kw: str) -> Optional[int]:
+        return _fetch_site(site, session, kw, timeout, retries, sleep, cache, memo, stream)
+
+    async def _site(site: str, kw: str) -> Optional[int]:
+        async with gates[site]:
+            return await loop.run_in_executor(executor, _call, site, kw)
+
+    async def _pair(kw: str) -> Tuple[Optional[int], Optional[int]]:
+        pause = _sites_paused_for(sites)
+        while pause > 0:  # every site paused by its circuit breaker
+            await asyncio.sleep(pause)
+            pause = _sites_paused_for(sites)
+        res = await asyncio.gather(*(_site(s, kw) for s in sites), return_exceptions=True)
+        for r in res:
+            if isinstance(r, BaseException):
+                raise r
+        got = dict(zip(sites, res))
+        return got.get("coupang"), got.get("naver")
+
+    done = 0
+    skipped = 0
+    started_at = time.time()
+    window = max_per_host * 4
+    pending: Deque[Tuple[int, str, str, "asyncio.Task"]] = deque()
+    work = iter(work)
+
+    def _fill() -> None:
+        nonlocal skipped
+        while len(pending) < window:
+            nxt = next(work, None)
+            if nxt is None:
+                return
+            idx, seed, kw = nxt
+            if (seed, kw) in exist_keys:
+                skipped += 1
+                continue
+            pending.append((idx, seed, kw, asyncio.ensure_future(_pair(kw))))
+
+    try:
+        _fill()
+        while pending:
+            idx, seed, kw, task = pending.popleft()
+            try:
+                comp_c, comp_n = await task
+            except Exception as e:
+                sink.error(seed, kw, e)
+            else:
+                sink.row(seed, kw, comp_c, comp_n)
+                done += 1
+            if idx % 10 == 0:
+                elapsed = time.time() - started_at
+                print(f"[{idx}/{total}] done={done} skipped={skipped} elapsed={elapsed:.1f}s")
+            _fill()
+    finally:
+        for *_, task in pending:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--expanded-in", type=Path, help="Input CSV: expanded keywords")
-    ap.add_argument("--sanitized-in", type=Path, help="Input CSV: sanitized keywords (fallback)")
+    ap.add_argument("--expanded-in", type=Path, help="Input CSV/Parquet: expanded keywords")
+    ap.add_argument("--sanitized-in", type=Path, help="Input CSV/Parquet: sanitized keywords (fallback)")
     ap.add_argument("--out", type=Path, required=True, help="Output CSV (append/checkpoint)")
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="parquet: also write a typed .parquet snapshot next to --out (needs pyarrow)")
     ap.add_argument("--site-mode", choices=["both", "naver", "coupang"], default="both")
     ap.add_argument("--sleep", type=float, default=0.8)
     ap.add_argument("--timeout", type=float, default=12.0)
     ap.add_argument("--retries", type=int, default=2)
     ap.add_argument("--ua", type=str, default=None)
+    ap.add_argument("--async", dest="async_mode", action="store_true",
+                    help="Fetch concurrently (asyncio) with per-host limits")
+    ap.add_argument("--max-per-host", type=int, default=4,
+                    help="Async mode: max in-flight requests per host")
+    ap.add_argument("--politeness", type=float, default=None,
+                    help="Async mode: min seconds between requests per host (default: --sleep)")
+    ap.add_argument("--burst", type=float, default=1.0,
+                    help="Requests a host may receive back-to-back before pacing applies")
+    ap.add_argument("--pool-size", type=int, default=None,
+                    help="Keep-alive connections per host (default: --max-per-host in async mode, else 2)")
+    ap.add_argument("--connect-retries", type=int, default=2,
+                    help="Transport-level retries on connection errors (pooled sessions)")
+    ap.add_argument("--stream-extract", action="store_true",
+                    help="Stream search pages and stop reading at the first result-count match "
+                         "(earliest in the page); parse the full HTML only when no pattern matches")
+    ap.add_argument("--cache", type=Path, default=Path("output/.cache/responses.sqlite"),
+                    help="SQLite response cache shared across runs")
+    ap.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    ap.add_argument("--max-age", type=str, default=None,
+                    help="Cache TTL seconds: '3600' for all sites or 'coupang=3600,naver=7200'")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Ignore cached entries (fresh responses are still stored)")
+    ap.add_argument("--queue", type=Path, default=None,
+                    help="SQLite work queue + checkpoint store shared by several fetcher processes "
+                         "(use instead of --store)")
+    ap.add_argument("--queue-batch", type=int, default=20, help="Queue mode: keywords claimed per lease")
+    ap.add_argument("--lease", type=float, default=300.0,
+                    help="Queue mode: seconds a claim stays leased without a commit before others may take it")
+    ap.add_argument("--retry-failed", action="store_true",
+                    help="Refetch only rows with missing counts, plus keywords of the input logged in logs/errors.csv "
+                         "(without an input only --out/--store rows are retried)")
+    ap.add_argument("--retry-rounds", type=int, default=3, help="Retry mode: passes over the still-failing rows")
+    ap.add_argument("--retry-backoff", type=float, default=60.0,
+                    help="Retry mode: seconds before the 2nd pass, doubled for each later pass")
+    ap.add_argument("--shard", type=str, default=None,
+                    help="i/N: fetch only shard i (0-based) of N, split by a stable hash of the normalized keyword")
+    ap.add_argument("--breaker-cooldown", type=float, default=30.0,
+                    help="Seconds a site is paused when its circuit opens (doubles per re-open; Retry-After wins)")
+    ap.add_argument("--breaker-error-rate", type=float, default=0.5,
+                    help="Open a site's circuit at this share of failed requests among its last 20")
+    ap.add_argument("--commit-rows", type=int, default=100,
+                    help="Commit results/errors in groups of this many rows")
+    ap.add_argument("--commit-interval", type=float, default=1.0,
+                    help="...or at least every this many seconds")
+    ap.add_argument("--fsync", choices=FSYNC_POLICIES, default="off",
+                    help="batch: fsync the output after every committed group")
+    ap.add_argument("--store", type=Path, default=None,
+                    help="SQLite checkpoint store (e.g. output/competition_counts.sqlite); "
+                         "--out is then exported from it. An existing --out CSV is imported once")
 
     args = ap.parse_args()
-    if not args.expanded_in and not args.sanitized_in:
+    if not args.expanded_in and not args.sanitized_in and not args.retry_failed:
         print("ERROR: Provide at least one of --expanded-in or --sanitized-in", file=sys.stderr)
         return 2
-
-    fetch_and_append(
-        expanded_in=args.expanded_in,
-        sanitized_in=args.sanitized_in,
-        outp=args.out,
-        site_mode=args.site_mode,
-        sleep=args.sleep,
-        timeout=args.timeout,
-        retries=args.retries,
-        ua=args.ua,
-    )
+    if is_parquet(args.out):
+        print("ERROR: --out is the resumable CSV journal; use --format parquet for a Parquet copy", file=sys.stderr)
+        return 2
+    if args.format == "parquet":
+        require_parquet()
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        ap.error(str(e))
+    if args.store and args.queue:
+        ap.error("--queue already is a checkpoint store; use one of --store / --queue")
+
+    configure_pool(connect_retries=args.connect_retries)
+    configure_health(cooldown=args.breaker_cooldown, error_rate=args.breaker_error_rate)
+    cache = None if args.no_cache else ResponseCache(
+        str(args.cache), max_age=parse_max_age(args.max_age), refresh=args.refresh)
+    fsync = args.fsync == "batch"
+    if args.queue:
+        store: Optional[CheckpointStore] = WorkQueue(str(args.queue), fsync=fsync, lease=args.lease)
+    else:
+        store = CheckpointStore(str(args.store), fsync=fsync) if args.store else None
+
+    if args.retry_failed:
+        retry_failed(
+            outp=args.out,
+            site_mode=args.site_mode,
+            sleep=args.sleep,
+            timeout=args.timeout,
+            retries=args.retries,
+            ua=args.ua,
+            cache=cache,
+            store=store,
+            rounds=args.retry_rounds,
+            backoff=args.retry_backoff,
+            pool_size=args.pool_size,
+            stream=args.stream_extract,
+            commit_rows=args.commit_rows,
+            commit_interval=args.commit_interval,
+            fsync=fsync,
+            expanded_in=args.expanded_in,
+            sanitized_in=args.sanitized_in,
+            shard=shard,
+        )
+    else:
+        fetch_and_append(
+            expanded_in=args.expanded_in,
+            sanitized_in=args.sanitized_in,
+            outp=args.out,
+            site_mode=args.site_mode,
+            sleep=args.sleep,
+            timeout=args.timeout,
+            retries=args.retries,
+            ua=args.ua,
+            async_mode=args.async_mode,
+            max_per_host=args.max_per_host,
+            politeness=args.politeness,
+            burst=args.burst,
+            cache=cache,
+            pool_size=args.pool_size,
+            stream=args.stream_extract,
+            store=store,
+            commit_rows=args.commit_rows,
+            commit_interval=args.commit_interval,
+            fsync=fsync,
+            shard=shard,
+            queue_batch=args.queue_batch,
+        )
+    if store is not None:
+        print(f"Store: {store.counts()} ({store.path})")
+        store.close()
+    if cache is not None:
+        print(f"Cache: hits={cache.hits} misses={cache.misses} ({cache.path})")
+        cache.close()
+    for line in health_report():
+        print(f"Site health: {line}")
+    if args.format == "parquet" and args.out.exists():
+        print(f"Saved Parquet: {export_table(args.out, args.format)}")
     return 0
 
 
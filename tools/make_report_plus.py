@@ -3,7 +3,7 @@
 """
 Report+ (Free Edition): searchable/sortable HTML dashboard.
 
-- Input : output/keyword_scores_free.csv
+- Input : output/keyword_scores_free.csv (or .parquet with --format parquet)
 - Output: output/report_plus.html
 - Features:
   * Top N by score
@@ -12,14 +12,21 @@ Report+ (Free Edition): searchable/sortable HTML dashboard.
   * 헤더 클릭 정렬 (score 등)
   * 현재 보이는 테이블 CSV로 내보내기(클라이언트 사이드)
 
-No external deps beyond pandas.
+No external deps beyond pandas (pyarrow for Parquet input).
 """
 from __future__ import annotations
 import argparse
+import sys
 from pathlib import Path
 import pandas as pd
 import html
 
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, read_table, with_format  # noqa: E402
+
 def _bar(pct: float, label: str) -> str:
     pct = max(0.0, min(100.0, float(pct)))
     return (
@@ -79,9 +86,10 @@ def main() -> int:
     ap.add_argument("--out", type=Path, default=Path("output/report_plus.html"))
     ap.add_argument("--topn", type=int, default=20)
     ap.add_argument("--per-seed", type=int, default=5)
+    ap.add_argument("--format", choices=FORMATS, default="csv", help="parquet: read --scores with a .parquet suffix")
     args = ap.parse_args()
 
-    df = pd.read_csv(args.scores, encoding="utf-8-sig")
+    df = read_table(with_format(args.scores, args.format))
 
     # base CSS/JS (search + sort + export)
     css = """
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# tools/merge_competition_shards.py
+"""
+Merge competition_counts outputs of sharded fetcher runs into one file.
+
+- Each shard comes from fetch_competition_counts.py --shard i/N (CSV, or
+  its --format parquet snapshot); globs are expanded.
+- One row per (seed, keyword): a row with more counts beats one with empty
+  counts, then the newest scraped_at wins. Keys keep their first-seen order.
+- Header: the first shard's header (_choose_output_header), rows are laid
+  out with _row_dict_for_header exactly like the fetcher writes them.
+- --format parquet also writes the typed .parquet snapshot next to --out.
+
+Usage:
+  python -u tools/merge_competition_shards.py output/competition_counts.shard*.csv \
+    --out output/competition_counts.csv --format parquet
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import itertools
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, require_parquet  # noqa: E402
+from tools.fetch_competition_counts import (  # noqa: E402
+    _choose_output_header,
+    _detect_col,
+    _iter_csv_rows,
+    _parse_int,
+    _row_dict_for_header,
+    export_table,
+)
+
+Row = Tuple[Optional[int], Optional[int], str]  # comp_coupang, comp_naver, scraped_at
+
+
+def _rank(row: Row) -> Tuple[int, str]:
+    return (row[0] is not None) + (row[1] is not None), row[2]
+
+
+def merge_shards(paths: List[Path], outp: Path) -> Tuple[int, int]:
+    """Write the merged CSV to `outp`; returns (rows read, rows written)."""
+    header: Optional[List[str]] = None
+    best: Dict[Tuple[str, str], Row] = {}
+    seen = 0
+    for path in paths:
+        rows = _iter_csv_rows(path)
+        first = next(rows, None)
+        if first is None:
+            print(f"[WARN] empty shard: {path}")
+            continue
+        cols = list(first.keys())
+        header = header or _choose_output_header(cols)
+        seed_col = _detect_col(cols, ["seed"])
+        kw_col = _detect_col(cols, ["keyword", "term", "query"]) or "keyword"
+        n = 0
+        for row in itertools.chain([first], rows):
+            seed = ((row.get(seed_col) if seed_col else "") or "").strip()
+            kw = (row.get(kw_col) or "").strip()
+            cand = (_parse_int(row.get("comp_coupang") or ""), _parse_int(row.get("comp_naver") or ""),
+                    row.get("scraped_at") or "")
+            old = best.get((seed, kw))
+            if old is None or _rank(cand) >= _rank(old):
+                best[(seed, kw)] = cand  # re-assigning an existing key keeps its position
+            n += 1
+        seen += n
+        print(f"[INFO] {path}: {n} rows")
+
+    header = header or _choose_output_header(None)
+    outp.parent.mkdir(parents=True, exist_ok=True)
+    tmp = outp.with_name(outp.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        dw = csv.DictWriter(f, fieldnames=header)
+        dw.writeheader()
+        for (seed, kw), (comp_c, comp_n, scraped_at) in best.items():
+            dw.writerow(_row_dict_for_header(header, seed, kw, comp_c, comp_n, scraped_at or None))
+    os.replace(tmp, outp)
+    return seen, len(best)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("shards", nargs="+", help="Shard outputs (CSV/Parquet paths or globs)")
+    ap.add_argument("--out", type=Path, default=Path("output/competition_counts.csv"), help="Merged CSV")
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="parquet: also write a typed .parquet snapshot next to --out (needs pyarrow)")
+    args = ap.parse_args()
+    if args.format == "parquet":
+        require_parquet()
+
+    paths: List[Path] = []
+    for spec in args.shards:
+        hits = sorted(glob.glob(spec)) or [spec]
+        paths.extend(Path(h) for h in hits)
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        raise SystemExit(f"ERROR: shard file(s) not found: {missing}")
+    if args.out.resolve() in {p.resolve() for p in paths}:
+        raise SystemExit("ERROR: --out must not be one of the shard inputs")
+
+    seen, kept = merge_shards(paths, args.out)
+    print(f"[OK] merged {len(paths)} shard(s) → {args.out}  (rows: {seen} → {kept})")
+    if args.format == "parquet":
+        print(f"[OK] Saved Parquet: {export_table(args.out, args.format)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# tools/pipeline.py
+"""
+In-process pipeline: sanitize → expand → competition → score.
+
+Runs the stages of src/keyword_scoring_free_only.py and tools/compute_scores.py
+in one interpreter and hands the DataFrames from stage to stage in memory.
+Intermediate artifacts (sanitized/expanded/competition) are written only when
+asked (--write-artifacts, or Pipeline.write_artifacts()).
+
+Python:
+  from tools.pipeline import Pipeline
+  p = Pipeline("data/seeds.xlsx", expand=2, sleep=0.6, site_mode="naver")
+  scores = p.run(out_csv=Path("output/keyword_scores_free.csv"))
+  p.expanded, p.competition      # stage frames stay on the object
+
+CLI (same options as keyword_scoring_free_only.py, plus the scoring outputs):
+  python tools/pipeline.py --in data/seeds.xlsx --expand 2 --site-mode naver \
+    --out-csv output/keyword_scores_free.csv --html-out output/report.html
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import keyword_scoring_free_only as kw  # noqa: E402
+from tools.common.artifacts import require_parquet, with_format, write_table  # noqa: E402
+from tools.compute_scores import compute_scores_frames  # noqa: E402
+
+
+class Pipeline:
+    """
+    One run over an Excel input. Options are the keyword_scoring_free_only.py
+    CLI options by dest name (expand=2, site_mode="naver", ...); anything not
+    given keeps the CLI default. Each stage method stores its frame on the
+    object and returns it.
+    """
+
+    def __init__(self, excel_in, **options):
+        args = kw.build_parser().parse_args(["--in", str(excel_in)])
+        unknown = sorted(set(options) - set(vars(args)))
+        if unknown:
+            raise TypeError(f"unknown pipeline option(s): {unknown}")
+        for name, value in options.items():
+            setattr(args, name, value)
+        self.args = args
+        self.excel_in = Path(excel_in)
+        self.prohibited = None
+        self.seeds: Optional[pd.DataFrame] = None
+        self.sanitized: Optional[pd.DataFrame] = None
+        self.sanitize_log: Optional[pd.DataFrame] = None
+        self.expanded: Optional[pd.DataFrame] = None
+        self.competition: Optional[pd.DataFrame] = None
+        self.scores: Optional[pd.DataFrame] = None
+        self._memo = self._cache = None
+        self._network = False
+
+    def _net(self):
+        if not self._network:
+            self._memo, self._cache = kw.setup_network(self.args)
+            self._network = True
+        return self._memo, self._cache
+
+    def load(self) -> pd.DataFrame:
+        self.seeds, meta = kw.load_seeds_excel(str(self.excel_in))
+        base = kw.load_default_prohibited(self.args.prohibited_json)
+        extra = kw.parse_prohibited_from_config(str(self.excel_in))
+        self.prohibited = kw.merge_prohibited(base, extra)
+        print(f"[OK] Seeds: {meta['rows_total']} rows | prohibited words={len(self.prohibited['words'])}, "
+              f"symbols={len(self.prohibited['symbols'])}")
+        return self.seeds
+
+    def sanitize(self) -> pd.DataFrame:
+        if self.seeds is None:
+            self.load()
+        self.sanitized, self.sanitize_log = kw.sanitize_df(
+            self.seeds, self.prohibited["words"], self.prohibited["symbols"]
+        )
+        changed = int(self.sanitized["sanitized_changed"].sum())
+        print(f"[OK] Sanitized: {changed} / {len(self.sanitized)} rows changed")
+        return self.sanitized
+
+    def expand(self) -> pd.DataFrame:
+        if self.sanitized is None:
+            self.sanitize()
+        memo, cache = self._net()
+        a = self.args
+        self.expanded = kw.expand_all(
+            df_sanitized=self.sanitized,
+            max_each=int(a.expand),
+            ua=a.ua,
+            timeout=float(a.timeout),
+            retries=int(a.retries),
+            sleep_sec=float(a.sleep),
+            proh_words=self.prohibited["words"],
+            proh_symbols=self.prohibited["symbols"],
+            cache=cache,
+            memo=memo,
+            workers=int(a.expand_workers),
+        )
+        print(f"[OK] Expanded: {len(self.expanded)} rows")
+        return self.expanded
+
+    def collect(self) -> pd.DataFrame:
+        if self.expanded is None:
+            self.expand()
+        memo, cache = self._net()
+        a = self.args
+        self.competition = kw.collect_competition(
+            expanded_df=self.expanded,
+            site_mode=a.site_mode,
+            ua=a.ua,
+            timeout=float(a.timeout),
+            retries=int(a.retries),
+            sleep_sec=float(a.sleep),
+            cache=cache,
+            memo=memo,
+        )
+        print(f"[OK] Competition: {len(self.competition)} rows "
+              f"({memo.fetched} distinct fetches of {memo.calls} lookups)")
+        return self.competition
+
+    def expand_collect(self) -> pd.DataFrame:
+        """expand + collect overlapped (--pipelined); sets both frames."""
+        if self.sanitized is None:
+            self.sanitize()
+        memo, cache = self._net()
+        a = self.args
+        self.expanded, self.competition = kw.expand_and_collect(
+            df_sanitized=self.sanitized,
+            max_each=int(a.expand),
+            site_mode=a.site_mode,
+            ua=a.ua,
+            timeout=float(a.timeout),
+            retries=int(a.retries),
+            sleep_sec=float(a.sleep),
+            proh_words=self.prohibited["words"],
+            proh_symbols=self.prohibited["symbols"],
+            cache=cache,
+            memo=memo,
+            workers=int(a.expand_workers),
+            comp_workers=int(a.competition_workers),
+            queue_size=int(a.pipeline_queue),
+        )
+        print(f"[OK] Expanded: {len(self.expanded)} rows | Competition: {len(self.competition)} rows "
+              f"({memo.fetched} distinct fetches of {memo.calls} lookups)")
+        return self.competition
+
+    def score(
+        self,
+        out_csv: Optional[Path] = None,
+        out_xlsx: Optional[Path] = None,
+        html_out: Optional[Path] = None,
+        topn: int = 50,
+        fmt: str = "csv",
+    ) -> pd.DataFrame:
+        if self.competition is None and self.args.pipelined:
+            self.expand_collect()
+        elif self.competition is None:
+            self.collect()
+        self.scores = compute_scores_frames(
+            self.excel_in,
+            expanded_df=self.expanded,
+            sanitized_df=self.sanitized,
+            competition_df=self.competition,
+            out_csv=out_csv,
+            out_xlsx=out_xlsx,
+            html_out=html_out,
+            topn=topn,
+            fmt=fmt,
+        )
+        return self.scores
+
+    def write_artifacts(
+        self,
+        sanitized_out: Optional[str] = None,
+        expanded_out: Optional[str] = None,
+        competition_out: Optional[str] = None,
+        fmt: str = "csv",
+    ) -> None:
+        """Write the stage frames computed so far (same files as keyword_scoring_free_only.py)."""
+        frames = [
+            (sanitized_out, None if self.sanitized is None else kw.sanitized_preview(self.sanitized, self.sanitize_log)),
+            (expanded_out, self.expanded),
+            (competition_out, self.competition),
+        ]
+        for path, df in frames:
+            if path and df is not None:
+                path = with_format(path, fmt)
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                write_table(df, path, fmt)
+                print("[OK] Saved artifact:", path)
+
+    def run(
+        self,
+        out_csv: Optional[Path] = None,
+        out_xlsx: Optional[Path] = None,
+        html_out: Optional[Path] = None,
+        topn: int = 50,
+        fmt: str = "csv",
+        write_artifacts: bool = False,
+    ) -> pd.DataFrame:
+        """All stages; artifacts go to the *_out options when write_artifacts is set."""
+        t0 = time.perf_counter()
+        try:
+            fetch = (self.expand_collect,) if self.args.pipelined else (self.expand, self.collect)
+            for stage in (self.load, self.sanitize) + fetch:
+                t = time.perf_counter()
+                stage()
+                print(f"[INFO] {stage.__name__}: {time.perf_counter() - t:.2f}s")
+            if write_artifacts:
+                a = self.args
+                self.write_artifacts(a.sanitized_out, a.expanded_out, a.competition_out, fmt)
+            self.score(out_csv, out_xlsx, html_out, topn, fmt)
+        finally:
+            self.close()
+        print(f"[OK] Pipeline finished in {time.perf_counter() - t0:.2f}s")
+        return self.scores
+
+    def close(self) -> None:
+        if self._cache is not None:
+            print(f"[INFO] Response cache: hits={self._cache.hits}, misses={self._cache.misses}")
+            self._cache.close()
+            self._cache = None
+
+
+def main(argv=None) -> int:
+    ap = kw.build_parser()
+    ap.description = "Keyword Scoring (Free Edition) — all stages in one process"
+    ap.add_argument("--out-csv", type=Path, default=None, help="Scores CSV path (Parquet with --format parquet)")
+    ap.add_argument("--out-xlsx", type=Path, default=None, help="Scores XLSX path")
+    ap.add_argument("--html-out", type=Path, default=None, help="HTML report path")
+    ap.add_argument("--topn", type=int, default=50, help="Top-N rows for the HTML report")
+    ap.add_argument("--write-artifacts", action="store_true",
+                    help="Also write the sanitized/expanded/competition artifacts to the *-out paths")
+    args = ap.parse_args(argv)
+    if args.format == "parquet":
+        require_parquet()
+
+    scoring = {"out_csv", "out_xlsx", "html_out", "topn", "write_artifacts"}
+    options = {k: v for k, v in vars(args).items() if k not in scoring and k != "in_path"}
+    pipe = Pipeline(args.in_path, **options)
+    pipe.run(
+        out_csv=args.out_csv,
+        out_xlsx=args.out_xlsx,
+        html_out=args.html_out,
+        topn=args.topn,
+        fmt=args.format,
+        write_artifacts=args.write_artifacts,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# tools/sweep_weights.py
+"""
+Score many weight configurations in one batched pass and report how much
+each one moves the ranking away from the Excel config (the baseline).
+
+Configurations come from a grid (--grid, repeatable, Cartesian product) or a
+CSV list (--configs, one configuration per row). Names are W_intent,
+W_competition or an intent token; a token not in the config is added with
+that weight. Blank/missing values keep the baseline. In --configs, columns
+named config/name/label and columns with non-numeric values label the row.
+
+  --grid "W_intent=0.3:0.8:0.05" --grid "니트=0,0.5,1"
+
+The keyword×token hit matrix and competition_norm are built once (from the
+CSVs, or from a compute_scores --rescore-cache sidecar); each chunk of
+configurations is then a scatter-add, a column-wise min-max and a sort.
+
+Report (CSV): per configuration the normalized weights, top-N overlap with
+the baseline top-N and Spearman rank correlation with the baseline scores.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.compute_scores import (  # noqa: E402
+    IntentMatcher,
+    _build_merged,
+    _dedupe,
+    _minmax,
+    _read_excel_config,
+    load_rescore_cache,
+)
+
+WEIGHT_KEYS = ("w_intent", "w_competition")
+LABEL_COLUMNS = ("config", "name", "label")
+
+
+# ---------- Configurations ----------
+
+def _parse_values(spec: str) -> List[float]:
+    """'0,0.5,1' or inclusive range 'start:stop:step'."""
+    spec = spec.strip()
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        if step <= 0:
+            raise SystemExit(f"ERROR: grid step must be > 0: {spec}")
+        return [round(v, 10) for v in np.arange(start, stop + step / 2, step)]
+    return [float(x) for x in spec.split(",") if x.strip()]
+
+
+def _grid_configs(specs: Sequence[str]) -> List[Dict[str, float]]:
+    names, values = [], []
+    for spec in specs:
+        if "=" not in spec:
+            raise SystemExit(f"ERROR: --grid expects NAME=VALUES: {spec}")
+        name, vals = spec.split("=", 1)
+        names.append(name.strip())
+        values.append(_parse_values(vals))
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _list_configs(path: Path) -> Tuple[List[Dict[str, float]], List[Optional[str]]]:
+    """Configurations of a --configs CSV and their row labels (None when the row has none)."""
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    df.columns = [str(c).strip() for c in df.columns]
+    label_cols: List[str] = []
+    numeric: Dict[str, pd.Series] = {}
+    for col in df.columns:
+        vals = df[col].str.strip()
+        nums = pd.to_numeric(vals.replace("", np.nan), errors="coerce")
+        if col.lower() in LABEL_COLUMNS or (nums.isna() & (vals != "")).any():
+            label_cols.append(col)
+        else:
+            numeric[col] = nums
+    if label_cols:
+        print(f"[INFO] --configs label column(s): {label_cols}")
+    configs = [{c: float(v.iat[i]) for c, v in numeric.items() if pd.notna(v.iat[i])} for i in range(len(df))]
+    labels = [" ".join(x for x in (df[c].iat[i].strip() for c in label_cols) if x) or None for i in range(len(df))]
+    return configs, labels
+
+
+def _renormalize(w_int: float, w_cmp: float) -> Tuple[float, float]:
+    # same rule as _read_excel_config
+    s = (w_int or 0) + (w_cmp or 0)
+    if s <= 0:
+        return 0.55, 0.45
+    return float(w_int) / s, float(w_cmp) / s
+
+
+# ---------- Batched scoring ----------
+
+def _token_matrix(
+    base_tokens: List[Tuple[str, float]],
+    configs: List[Dict[str, float]],
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Token entries (baseline order, then tokens only named by configs) and a
+    weight matrix [entries × configs]. Overrides apply to every entry of
+    the token; tokens added by one configuration weigh 0 in the others.
+    """
+    entries = [str(t).lower() for t, _ in base_tokens]
+    base_w = [float(w) for _, w in base_tokens]
+    for cfg in configs:
+        for name in cfg:
+            low = name.lower()
+            if low not in WEIGHT_KEYS and low not in entries:
+                entries.append(low)
+                base_w.append(0.0)
+    T = np.tile(np.asarray(base_w, dtype=float)[:, None], (1, len(configs)))
+    for k, cfg in enumerate(configs):
+        for name, w in cfg.items():
+            low = name.lower()
+            if low in WEIGHT_KEYS:
+                continue
+            for j, t in enumerate(entries):
+                if t == low:
+                    T[j, k] = w
+    return entries, T
+
+
+def _minmax_cols(m: np.ndarray) -> np.ndarray:
+    """Column-wise _minmax (constant columns → 0.0)."""
+    lo = m.min(axis=0)
+    rng = m.max(axis=0) - lo
+    flat = rng == 0
+    out = (m - lo) / np.where(flat, 1.0, rng)
+    out[:, flat] = 0.0
+    return out
+
+
+def _rank_desc(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One stable sort per configuration, rows descending by score (ties in row
+    order). Returns (order [K × n], average ranks [K × n]); descending ranks
+    leave Spearman unchanged.
+    """
+    neg = -np.ascontiguousarray(scores.T)
+    order = np.argsort(neg, axis=1, kind="stable")
+    sv = np.take_along_axis(neg, order, axis=1)
+    n = sv.shape[1]
+    idx = np.broadcast_to(np.arange(n), sv.shape)
+    starts = np.ones(sv.shape, dtype=bool)
+    starts[:, 1:] = sv[:, 1:] != sv[:, :-1]
+    ends = np.ones(sv.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, idx, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, idx, n - 1)[:, ::-1], axis=1)[:, ::-1]
+    ranks = np.empty(sv.shape, dtype=float)
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=1)
+    return order, ranks
+
+
+def _spearman_rows(ranks: np.ndarray, base_rank: np.ndarray) -> np.ndarray:
+    a = ranks - ranks.mean(axis=1, keepdims=True)
+    b = base_rank - base_rank.mean()
+    den = np.sqrt((a * a).sum(axis=1) * (b * b).sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(den > 0, (a @ b) / den, np.nan)
+
+
+def sweep(
+    hits: List[np.ndarray],
+    entries: List[str],
+    T: np.ndarray,
+    weights: np.ndarray,
+    comp_norm: np.ndarray,
+    keep: np.ndarray,
+    base_col: int,
+    topn: int,
+    chunk: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (topn_overlap, spearman) per configuration. `weights` is [2 × K]
+    (normalized W_intent / W_competition), `keep` the rows surviving dedupe.
+    """
+    n, K = len(comp_norm), T.shape[1]
+    comp_term = 1.0 - comp_norm
+
+    def _scores(cols: slice) -> np.ndarray:
+        acc = np.zeros((n, cols.stop - cols.start), dtype=float)
+        for rows, w in zip(hits, T[:, cols]):
+            acc[rows] += w
+        intent_norm = _minmax_cols(acc)
+        return (100.0 * (weights[0, cols] * intent_norm + weights[1, cols] * comp_term[:, None]))[keep]
+
+    base_order, base_ranks = _rank_desc(_scores(slice(base_col, base_col + 1)))
+    base_rank = base_ranks[0]
+    in_base_top = np.zeros(len(base_rank), dtype=bool)
+    in_base_top[base_order[0, :topn]] = True
+    n_top = max(1, min(topn, len(base_rank)))
+
+    overlap = np.empty(K)
+    rho = np.empty(K)
+    for start in range(0, K, chunk):
+        cols = slice(start, min(K, start + chunk))
+        order, ranks = _rank_desc(_scores(cols))
+        overlap[cols] = in_base_top[order[:, :topn]].sum(axis=1) / n_top
+        rho[cols] = _spearman_rows(ranks, base_rank)
+    return overlap, rho
+
+
+# ---------- Inputs ----------
+
+def _load(args) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """Merged frame and {token: hit rows} for the cached or freshly matched tokens."""
+    if args.rescore_cache:
+        merged, tokens, hits, _sources = load_rescore_cache(args.rescore_cache)
+        print(f"[INFO] Loaded re-score cache: {len(merged)} rows, {len(tokens)} tokens")
+        return merged, dict(zip(tokens, hits))
+    merged = _build_merged(args.sanitized_in, args.expanded_in, args.competition_in)
+    return merged, {}
+
+
+def run(args) -> pd.DataFrame:
+    t0 = time.perf_counter()
+    print("[INFO] Reading Excel config:", args.excel_in)
+    w_int0, w_cmp0, base_tokens = _read_excel_config(args.excel_in)
+
+    configs: List[Dict[str, float]] = []
+    labels: List[Optional[str]] = []
+    if args.grid:
+        configs += _grid_configs(args.grid)
+        labels += [None] * len(configs)
+    if args.configs:
+        listed, listed_labels = _list_configs(args.configs)
+        configs += listed
+        labels += listed_labels
+    if not configs:
+        raise SystemExit("ERROR: nothing to sweep (use --grid and/or --configs)")
+    configs = [{}] + configs  # column 0 = baseline
+    labels = ["baseline"] + labels
+    print(f"[OK] Configurations: {len(configs) - 1} (+ baseline)")
+
+    merged, token_hits = _load(args)
+    entries, T = _token_matrix(base_tokens, configs)
+    missing = [t for t in dict.fromkeys(entries) if t not in token_hits]
+    if missing:
+        texts = merged["keyword_sanitized"].astype(str).tolist()
+        token_hits.update(zip(missing, IntentMatcher([(t, 0.0) for t in missing]).hits(texts)))
+    hits = [token_hits[t] for t in entries]
+
+    weights = np.empty((2, len(configs)))
+    for k, cfg in enumerate(configs):
+        lower = {name.lower(): v for name, v in cfg.items()}
+        weights[:, k] = _renormalize(lower.get("w_intent", w_int0), lower.get("w_competition", w_cmp0))
+
+    comp_norm = _minmax(merged["comp_combined"]).to_numpy(dtype=float)
+    keep_idx = _dedupe(merged[["seed", "keyword"]].assign(_row=np.arange(len(merged))))["_row"].to_numpy()
+    keep = np.zeros(len(merged), dtype=bool)
+    keep[keep_idx] = True
+
+    print(f"[INFO] Scoring {len(configs)} configurations × {int(keep.sum())} keywords...")
+    overlap, rho = sweep(hits, entries, T, weights, comp_norm, keep, 0, args.topn, max(1, args.chunk))
+
+    rows = []
+    for k, cfg in enumerate(configs):
+        rec: Dict[str, object] = {"config": labels[k] or k}
+        rec["W_intent"] = weights[0, k]
+        rec["W_competition"] = weights[1, k]
+        rec.update({name: v for name, v in cfg.items() if name.lower() not in WEIGHT_KEYS})
+        rec[f"top{args.topn}_overlap"] = overlap[k]
+        rec["spearman"] = rho[k]
+        rows.append(rec)
+    report = pd.DataFrame(rows)
+    metrics = [f"top{args.topn}_overlap", "spearman"]
+    report = report[[c for c in report.columns if c not in metrics] + metrics]
+    print(f"[OK] Swept {len(configs) - 1} configurations in {time.perf_counter() - t0:.2f}s")
+    return report
+
+
+# ---------- CLI ----------
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--excel-in", type=Path, required=True, help="Excel file with the baseline 'config' sheet")
+    ap.add_argument("--sanitized-in", type=Path, help="CSV of sanitized keywords")
+    ap.add_argument("--expanded-in", type=Path, help="CSV of expanded keywords (preferred)")
+    ap.add_argument("--competition-in", type=Path, help="CSV of competition counts (optional)")
+    ap.add_argument("--rescore-cache", type=Path, help="Use a compute_scores --rescore-cache sidecar instead of the CSVs")
+    ap.add_argument("--grid", action="append", default=[],
+                    help="NAME=v1,v2,... or NAME=start:stop:step (repeatable; Cartesian product)")
+    ap.add_argument("--configs", type=Path, help="CSV of configurations, one per row (columns = names)")
+    ap.add_argument("--topn", type=int, default=50, help="Top-N used for the overlap metric")
+    ap.add_argument("--chunk", type=int, default=128, help="Configurations scored per batch (memory ≈ rows × chunk × 8 bytes)")
+    ap.add_argument("--out", type=Path, default=Path("output/weight_sweep.csv"), help="Report CSV path")
+    args = ap.parse_args()
+
+    report = run(args)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(args.out, index=False, encoding="utf-8-sig")
+    print("[OK] Saved CSV:", args.out)
+    cols = ["config", "W_intent", "W_competition", f"top{args.topn}_overlap", "spearman"]
+    print(report.sort_values("spearman", ascending=False)[cols].head(10).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
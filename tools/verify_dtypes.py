@@ -5,6 +5,7 @@ C3: Simple dtype/column validator for Free Edition outputs.
 
 - Checks that required columns exist with expected types/domains
 - Ensures 'seed' is canonicalized to string-like (e.g., 1.0 -> "1")
+- Parquet scores (--format parquet): numeric columns must be stored as numbers
 - Emits a short markdown report: output/_dtype_report.md
 - Exit 0 if OK, 1 if any violations
 """
@@ -14,6 +15,13 @@ from pathlib import Path
 from typing import List
 import pandas as pd
 import re
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, is_parquet, read_table, with_format  # noqa: E402
 
 REQ_COLS = ["seed","keyword","keyword_sanitized","comp_combined","intent_norm","competition_norm","score"]
 
@@ -33,17 +41,21 @@ def _canon_seed_str(x: object) -> str:
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--scores", type=Path, default=Path("output/keyword_scores_free.csv"))
+    ap.add_argument("--format", choices=FORMATS, default="csv", help="parquet: read --scores with a .parquet suffix")
     args = ap.parse_args()
 
-    p = args.scores
+    p = with_format(args.scores, args.format)
     if not p.exists():
         print(f"❌ missing file: {p}")
         return 1
 
-    try:
-        df = pd.read_csv(p, encoding="utf-8-sig")
-    except UnicodeError:
-        df = pd.read_csv(p, encoding="utf-8")
+    if is_parquet(p):
+        df = read_table(p)
+    else:
+        try:
+            df = pd.read_csv(p, encoding="utf-8-sig")
+        except UnicodeError:
+            df = pd.read_csv(p, encoding="utf-8")
 
     issues: List[str] = []
     # 1) required columns
@@ -64,6 +76,8 @@ def main() -> int:
     # 3) numeric columns coercible
     for col in ["comp_combined","intent_norm","competition_norm","score"]:
         if col in df.columns:
+            if is_parquet(p) and not pd.api.types.is_numeric_dtype(df[col]):
+                issues.append(f"non-numeric dtype in column: {col} ({df[col].dtype})")
             s = pd.to_numeric(df[col], errors="coerce")
             if s.isna().any():
                 issues.append(f"NaN values in numeric column: {col}")
@@ -18,15 +18,24 @@ Exit codes:
 """
 from __future__ import annotations
 import argparse
+import sys
 from pathlib import Path
 from typing import List, Tuple, Optional
 
 import pandas as pd
 
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from tools.common.artifacts import FORMATS, is_parquet, read_table, with_format  # noqa: E402
+
 REQ_COLS = ["keyword","keyword_sanitized","comp_combined","intent_norm","competition_norm","score"]
 NUM_COLS = ["comp_combined","intent_norm","competition_norm","score"]
 
 def _read_csv(p: Path) -> pd.DataFrame:
+    if is_parquet(p):
+        return read_table(p)
     try:
         return pd.read_csv(p, encoding="utf-8-sig")
     except UnicodeError:
@@ -89,7 +98,7 @@ def verify(
         f"- sanitized:  {sanitized}  rows={_safe_len(sanitized)}",
         f"- expanded:   {expanded}   rows={_safe_len(expanded)}",
         f"- competition:{competition} rows={_safe_len(competition)}",
-        f"- scores(csv):{scores_csv} rows={len(df)}",
+        f"- scores({'parquet' if is_parquet(scores_csv) else 'csv'}):{scores_csv} rows={len(df)}",
     ]
     if scores_xlsx:
         meta.append(f"- scores(xlsx):{scores_xlsx}  exists={scores_xlsx.exists()}")
@@ -123,9 +132,11 @@ def main() -> int:
     ap.add_argument("--scores-csv", type=Path, default=Path("output/keyword_scores_free.csv"))
     ap.add_argument("--scores-xlsx", type=Path, default=Path("output/keyword_scores_free.xlsx"))
     ap.add_argument("--html", type=Path, default=Path("output/report.html"))
+    ap.add_argument("--format", choices=FORMATS, default="csv", help="Artifact format (parquet: .csv paths read as .parquet)")
     args = ap.parse_args()
 
-    ok, _, _ = verify(args.sanitized, args.expanded, args.competition, args.scores_csv, args.scores_xlsx, args.html)
+    arts = [with_format(p, args.format) for p in (args.sanitized, args.expanded, args.competition, args.scores_csv)]
+    ok, _, _ = verify(*arts, args.scores_xlsx, args.html)
     return 0 if ok else 1
 
 if __name__ == "__main__":